@@ -23,6 +23,18 @@ from app.models.ingredient import Ingredient  # <--- Add
 from app.models.recipe import Recipe, RecipeIngredient # <--- Add
 from app.models.inventory import Inventory  # <--- Add
 from app.models.friendship import Friendship  # <--- Add
+from app.models.meal_plan import MealPlanEntry
+from app.models.household import Household, HouseholdMember
+from app.models.change_log import ChangeLog
+from app.models.job import Job
+from app.models.idempotency_key import IdempotencyKey
+from app.models.rate_limit_bucket import RateLimitBucket
+from app.models.ingredient_price import IngredientPrice
+from app.models.ingredient_nutrition import IngredientNutrition
+from app.models.grocery_snapshot import GrocerySnapshot
+from app.models.ingredient_alias import IngredientAlias
+from app.models.catalog_version import CatalogVersion
+from app.db.types import UUID
 # ------------------------------------------------------------------------
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -39,6 +51,18 @@ if config.config_file_name is not None:
 # 4. Set the target metadata so Alembic can see your models for autogeneration
 target_metadata = Base.metadata
 
+def render_item(type_, obj, autogen_context):
+    """Write the models' portable UUID as sa.UUID() in generated migrations, like the existing ones."""
+    if type_ == "type" and isinstance(obj, UUID):
+        return "sa.UUID()"
+    return False
+
+def compare_type(context, inspected_column, metadata_column, inspected_type, metadata_type):
+    """SQLite has no UUID type and reads UUID columns back as NUMERIC: not a change."""
+    if context.dialect.name == "sqlite" and isinstance(metadata_type, UUID):
+        return False
+    return None
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -61,6 +85,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        render_item=render_item,
+        compare_type=compare_type,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -84,7 +110,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            # SQLite can't ALTER constraints; autogenerate batch (copy-and-move) operations for it
+            render_as_batch=connection.dialect.name == "sqlite",
+            render_item=render_item, compare_type=compare_type
         )
 
         with context.begin_transaction():
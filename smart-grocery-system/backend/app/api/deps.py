@@ -1,26 +1,29 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import SessionLocal, engine, get_db, read_session, stick_to_primary
 from app.core.config import settings
 from app.core import security
+from app.core.read_after import READ_AFTER_HEADER, required_version
 from app.models.user import User
 from app.schemas.token import TokenData
 
 # This tells FastAPI that the token comes from the "Authorization: Bearer <token>" header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def user_from_token(db: Session, token: Optional[str]) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
@@ -33,4 +36,57 @@ def get_current_user(
     user = db.query(User).filter(User.id == token_data.id).first()
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    user = user_from_token(db, token)
+    if request.method not in READ_METHODS:
+        stick_to_primary(user.id)
+    return user
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not security.is_admin(current_user.email):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    return current_user
+
+# --- Read-only endpoints: may be served by a read replica ---
+def get_read_db(request: Request, token: Optional[str] = Depends(optional_oauth2_scheme)) -> Generator:
+    """
+    Like get_db, but on a replica when one is configured (and has caught up with the
+    client's X-Read-After marker, if it sent one). Never write through it.
+    """
+    user_id = security.token_subject(token) if token else None
+    db = read_session(user_id, required_version(request.headers.get(READ_AFTER_HEADER), user_id))
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_current_reader(
+    db: Session = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    get_current_user for endpoints on get_read_db (same session, so one connection per request).
+    An account the replica doesn't have yet (just registered) is looked up on the primary; the
+    endpoint's own queries still go to the replica.
+    """
+    try:
+        return user_from_token(db, token)
+    except HTTPException:
+        if db.get_bind() is engine:
+            raise
+    with SessionLocal() as primary:
+        return user_from_token(primary, token)
+
+def get_current_user_for_stream(
+    access_token: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> User:
+    """Browsers' EventSource can't send headers, so streams also accept ?access_token=."""
+    return user_from_token(db, token or access_token)
\ No newline at end of file
@@ -1,26 +1,32 @@
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from app.core.profiling import ProfiledRoute
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, stick_to_primary
 from app.core import security
 from app.core.config import settings
+from app.core.rate_limit import enforce_rate_limit
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.token import Token
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("/register", response_model=UserResponse)
 def register(
+    request: Request,
     user_in: UserCreate,
     db: Session = Depends(get_db)
 ) -> Any:
     """
     Create new user.
     """
+    # 0. Throttle before any hashing
+    enforce_rate_limit(request, "register", user_in.email)
+
     # 1. Check if user already exists
     user = db.query(User).filter(User.email == user_in.email).first()
     if user:
@@ -37,16 +43,22 @@ def register(
     db.add(user)
     db.commit()
     db.refresh(user)
+    # The replicas may not have the account yet
+    stick_to_primary(user.id)
     return user
 
 @router.post("/login", response_model=Token)
 def login_access_token(
+    request: Request,
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
+    # 0. Throttle before any hashing (per IP, and per account against credential stuffing)
+    enforce_rate_limit(request, "login", form_data.username)
+
     # 1. Authenticate
     user = db.query(User).filter(User.email == form_data.username).first()
     if not user or not security.verify_password(form_data.password, user.password_hash):
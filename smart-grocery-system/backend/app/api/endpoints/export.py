@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.core.profiling import ProfiledRoute
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.db.session import get_db
+from app.api import deps
+from app.core.events import publish_change
+from app.core.read_after import READ_AFTER_HEADER, required_version
+from app.models.user import User
+from app.schemas.export import ImportSummary
+from app.utils.export_logic import AccountImporter, ImportFormatError, ImportTooLargeError, NdjsonDecoder, export_stream
+
+router = APIRouter(route_class=ProfiledRoute)
+
+@router.get("/export")
+def export_account(
+    request: Request,
+    gzip: bool = False,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Everything in your account (recipes with their ingredients and selection, and inventory)
+    as NDJSON, streamed as it is read. ?gzip=true compresses it. POST the file to /import to restore it.
+    """
+    user_id = current_user.id
+    # The stream opens its own session; don't hold this one while the download runs
+    db.close()
+
+    filename = "grocery-export.ndjson.gz" if gzip else "grocery-export.ndjson"
+    return StreamingResponse(
+        export_stream(user_id, compress=gzip, min_version=required_version(
+            request.headers.get(READ_AFTER_HEADER), str(user_id)
+        )),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
+
+@router.post("/import", response_model=ImportSummary)
+async def import_account(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Restores a file from GET /export (plain or gzip-compressed) into your account, in one
+    transaction: a broken or cut-off file changes nothing. The body is read and written in
+    batches as it arrives. Recipes you already have (same id) are skipped; inventory items
+    overwrite yours for the same ingredient. A file larger than IMPORT_MAX_BYTES once
+    decompressed is refused with 413.
+    """
+    decoder = NdjsonDecoder()
+    try:
+        importer = await run_in_threadpool(AccountImporter, db, current_user.id)
+        async for chunk in request.stream():
+            records = decoder.feed(chunk)
+            if records:
+                await run_in_threadpool(importer.add, records)
+        await run_in_threadpool(importer.add, decoder.close())
+        summary = await run_in_threadpool(importer.finish)
+    except ImportFormatError as e:
+        await run_in_threadpool(db.rollback)
+        status_code = 413 if isinstance(e, ImportTooLargeError) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+    await run_in_threadpool(db.commit)
+    publish_change(current_user.id)
+    return summary
@@ -0,0 +1,191 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.profiling import ProfiledRoute
+from sqlalchemy import or_, tuple_
+from sqlalchemy.orm import Session, selectinload
+from app.db.session import get_db
+from app.api import deps
+from app.models.friendship import Friendship, FriendshipStatus
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.user import User
+from app.schemas.friendship import FriendshipCreate, FriendshipUpdate, FriendshipResponse, FriendResponse
+from app.schemas.recipe import SharedRecipeFeed
+from app.utils.friend_logic import find_friendship, is_friend_of
+from app.utils.pagination import decode_cursor, encode_cursor
+
+router = APIRouter(route_class=ProfiledRoute)
+
+@router.get("/", response_model=List[FriendResponse])
+def read_friends(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    List accepted friends.
+    """
+    friendships = db.query(Friendship).filter(
+        or_(Friendship.requester_id == current_user.id, Friendship.addressee_id == current_user.id),
+        Friendship.status == FriendshipStatus.ACCEPTED.value
+    ).options(selectinload(Friendship.requester), selectinload(Friendship.addressee)).all()
+
+    results = []
+    for f in friendships:
+        friend = f.addressee if f.requester_id == current_user.id else f.requester
+        results.append(FriendResponse(
+            friendship_id=f.id,
+            user_id=friend.id,
+            email=friend.email,
+            since=f.created_at
+        ))
+    return results
+
+@router.get("/requests", response_model=List[FriendshipResponse])
+def read_friend_requests(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    List pending requests sent to the current user.
+    """
+    return db.query(Friendship).filter(
+        Friendship.addressee_id == current_user.id,
+        Friendship.status == FriendshipStatus.PENDING.value
+    ).order_by(Friendship.created_at.desc()).all()
+
+@router.post("/requests", response_model=FriendshipResponse)
+def send_friend_request(
+    request_in: FriendshipCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    if request_in.addressee_id == current_user.id:
+        raise HTTPException(status_code=400, detail="You cannot send a friend request to yourself")
+
+    addressee = db.query(User).filter(User.id == request_in.addressee_id).first()
+    if not addressee:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    existing = find_friendship(db, current_user.id, addressee.id)
+    if existing:
+        # They already asked us: sending a request back accepts it
+        if existing.addressee_id == current_user.id and existing.status == FriendshipStatus.PENDING.value:
+            existing.status = FriendshipStatus.ACCEPTED.value
+            db.commit()
+            db.refresh(existing)
+            return existing
+        raise HTTPException(status_code=400, detail="A friendship or request with this user already exists")
+
+    friendship = Friendship(
+        requester_id=current_user.id,
+        addressee_id=addressee.id,
+        status=FriendshipStatus.PENDING.value
+    )
+    db.add(friendship)
+    db.commit()
+    db.refresh(friendship)
+    return friendship
+
+@router.patch("/requests/{friendship_id}", response_model=FriendshipResponse)
+def respond_to_friend_request(
+    friendship_id: int,
+    update_in: FriendshipUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Accept a pending request. (Decline with DELETE /friends/{friendship_id}.)
+    """
+    friendship = db.query(Friendship).filter(
+        Friendship.id == friendship_id,
+        Friendship.addressee_id == current_user.id
+    ).first()
+
+    if not friendship:
+        raise HTTPException(status_code=404, detail="Friend request not found")
+
+    if update_in.status != FriendshipStatus.ACCEPTED.value:
+        raise HTTPException(status_code=400, detail="Status can only be changed to ACCEPTED")
+
+    friendship.status = FriendshipStatus.ACCEPTED.value
+    db.commit()
+    db.refresh(friendship)
+    return friendship
+
+@router.delete("/{friendship_id}", status_code=204)
+def delete_friendship(
+    friendship_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Unfriend, decline a request, or cancel one you sent.
+    """
+    friendship = db.query(Friendship).filter(
+        Friendship.id == friendship_id,
+        or_(Friendship.requester_id == current_user.id, Friendship.addressee_id == current_user.id)
+    ).first()
+
+    if not friendship:
+        raise HTTPException(status_code=404, detail="Friendship not found")
+
+    db.delete(friendship)
+    db.commit()
+    return None
+
+@router.get("/feed", response_model=SharedRecipeFeed)
+def read_friends_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Recipes friends have shared, newest first.
+    Keyset pagination: each page walks the partial index of shared recipes
+    (ix_recipes_shared_created_at_id) from the cursor, keeps the rows whose owner is in
+    the friend ids (hashed once per query) and stops after limit + 1 of them; no sort.
+    The rows read depend on how much of everything shared is your friends', not on how
+    many friends you have. Plus one query for the page's ingredients.
+    """
+    query = db.query(Recipe).filter(
+        Recipe.is_shared_to_friends == True,
+        is_friend_of(current_user.id, Recipe.user_id)
+    )
+
+    if cursor:
+        created_at, recipe_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Recipe.created_at, Recipe.id) < tuple_(created_at, recipe_id))
+
+    recipes = query.options(
+        selectinload(Recipe.user),
+        selectinload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient)
+    ).order_by(Recipe.created_at.desc(), Recipe.id.desc()).limit(limit + 1).all()
+
+    has_more = len(recipes) > limit
+    recipes = recipes[:limit]
+
+    items = [
+        {
+            "id": r.id,
+            "owner_id": r.user_id,
+            "owner_email": r.user.email,
+            "title": r.title,
+            "instructions": r.instructions,
+            "servings": r.servings,
+            "created_at": r.created_at,
+            "ingredients": [
+                {
+                    "id": ri.id,
+                    "ingredient_id": ri.ingredient_id,
+                    "name": ri.ingredient.name,
+                    "quantity": ri.quantity,
+                    "unit": ri.unit
+                }
+                for ri in r.ingredients
+            ]
+        }
+        for r in recipes
+    ]
+
+    next_cursor = encode_cursor(recipes[-1].created_at, recipes[-1].id) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
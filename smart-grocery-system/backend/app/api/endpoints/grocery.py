@@ -1,22 +1,254 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.core.profiling import ProfiledRoute
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.api import deps
 from app.models.user import User
-from app.utils.grocery_logic import generate_grocery_list
-from typing import Dict, List
+from app.utils.grocery_logic import generate_grocery_list, generate_meal_plan_grocery_list, generate_household_grocery_list
+from app.models.household import HouseholdMember
+from app.schemas.meal_plan import GroceryTrip
+from app.utils.grocery_stream import grocery_event_stream
+from app.core.events import household_event_key
+from app.utils.data_version import data_etag, not_modified
+from app.utils.price_index import cost_summary, get_price_index
+from app.schemas.price import PricedGroceryList
+from app.schemas.nutrition import GroceryListWithNutrition
+from app.utils.nutrition_logic import nutrition_version, selection_nutrition
+from app.models.grocery_snapshot import GrocerySnapshot
+from app.schemas.grocery_snapshot import GrocerySnapshotCreate, GrocerySnapshotDiff, GrocerySnapshotPage, GrocerySnapshotResponse, GrocerySnapshotSummary
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.grocery_diff import diff_grocery_lists, flatten_grocery_list, grocery_list_version
+from app.utils.grocery_snapshot import pack_grocery_list, unpack_grocery_list
+from datetime import date
+from uuid import UUID
+from typing import Dict, List, Optional, Union
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # Schema for the response (A dictionary where Key=Aisle, Value=List of Items)
 GroceryListResponse = Dict[str, List[dict]]
 
-@router.get("/", response_model=GroceryListResponse)
+@router.get("/", response_model=Union[GroceryListWithNutrition, GroceryListResponse])
 def get_grocery_list(
+    request: Request,
+    response: Response,
+    servings_multiplier: float = Query(1.0, gt=0, description="Scales every selected recipe, e.g. 2 to double"),
+    nutrition: bool = Query(False, description="Also return calories and macros of the selected recipes"),
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Calculate the shopping list based on selected recipes and current inventory.
+    With nutrition=true: {"items": <the list>, "nutrition": <totals for the selection>}.
+    """
+    parts = [servings_multiplier] + ([f"n{nutrition_version(db)}"] if nutrition else [])
+    cached = not_modified(request, response, data_etag(current_user, "grocery", *parts))
+    if cached:
+        return cached
+
+    grocery = generate_grocery_list(db, current_user.id, servings_multiplier)
+    if not nutrition:
+        return grocery
+    return {"items": grocery, "nutrition": selection_nutrition(db, current_user.id, servings_multiplier)}
+
+@router.get("/priced", response_model=PricedGroceryList)
+def get_priced_grocery_list(
+    request: Request,
+    response: Response,
+    servings_multiplier: float = Query(1.0, gt=0, description="Scales every selected recipe, e.g. 2 to double"),
+    cheapest_store: bool = Query(False, description="Buy each line at the store where it costs least"),
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    The grocery list with an estimated cost per line, per aisle and in total.
+    """
+    prices = get_price_index(db)
+    cached = not_modified(request, response, data_etag(current_user, "priced", servings_multiplier, cheapest_store, prices.tag))
+    if cached:
+        return cached
+
+    grocery = generate_grocery_list(db, current_user.id, servings_multiplier, prices, cheapest_store)
+    return cost_summary(grocery)
+
+# --- Snapshots: lists frozen at a point in time (e.g. each trip), to compare later ---
+
+def snapshot_response(snapshot: GrocerySnapshot) -> dict:
+    return {**GrocerySnapshotSummary.model_validate(snapshot).model_dump(), "items": unpack_grocery_list(snapshot.payload)}
+
+def get_snapshot(db: Session, snapshot_id: UUID, user_id) -> GrocerySnapshot:
+    snapshot = db.query(GrocerySnapshot).filter(
+        GrocerySnapshot.id == snapshot_id,
+        GrocerySnapshot.user_id == user_id
+    ).first()
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return snapshot
+
+@router.post("/snapshots", response_model=GrocerySnapshotResponse)
+def create_grocery_snapshot(
+    snapshot_in: GrocerySnapshotCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
-    Calculate the shopping list based on selected recipes and current inventory.
+    Save the current grocery list, e.g. before a shopping trip.
+    """
+    grocery = generate_grocery_list(db, current_user.id, snapshot_in.servings_multiplier)
+    snapshot = GrocerySnapshot(
+        user_id=current_user.id,
+        label=snapshot_in.label,
+        version=grocery_list_version(grocery),
+        item_count=sum(len(items) for items in grocery.values()),
+        servings_multiplier=snapshot_in.servings_multiplier,
+        payload=pack_grocery_list(grocery)
+    )
+    db.add(snapshot)
+    db.commit()
+    db.refresh(snapshot)
+    return snapshot_response(snapshot)
+
+@router.get("/snapshots", response_model=GrocerySnapshotPage)
+def read_grocery_snapshots(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Your saved lists, newest first (without their items).
+    Keyset pagination on (created_at, id), so snapshots saved in the same instant are neither skipped nor repeated.
+    """
+    query = db.query(GrocerySnapshot).filter(GrocerySnapshot.user_id == current_user.id)
+    if cursor:
+        created_at, snapshot_id = decode_cursor(cursor)
+        query = query.filter(tuple_(GrocerySnapshot.created_at, GrocerySnapshot.id) < tuple_(created_at, snapshot_id))
+
+    snapshots = query.order_by(GrocerySnapshot.created_at.desc(), GrocerySnapshot.id.desc()).limit(limit + 1).all()
+    has_more = len(snapshots) > limit
+    snapshots = snapshots[:limit]
+    next_cursor = encode_cursor(snapshots[-1].created_at, snapshots[-1].id) if has_more else None
+    return {"items": snapshots, "next_cursor": next_cursor}
+
+@router.get("/snapshots/{snapshot_id}", response_model=GrocerySnapshotResponse)
+def read_grocery_snapshot(
+    snapshot_id: UUID,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    return snapshot_response(get_snapshot(db, snapshot_id, current_user.id))
+
+@router.get("/snapshots/{base_id}/diff/{target_id}", response_model=GrocerySnapshotDiff)
+def diff_grocery_snapshots(
+    base_id: UUID,
+    target_id: str,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
     """
-    return generate_grocery_list(db, current_user.id)
\ No newline at end of file
+    What was added, removed or changed quantity from one snapshot to another.
+    Use "current" as the second id to compare against the list as it is now
+    (made for the same servings multiplier as the first snapshot).
+    """
+    base_snapshot = get_snapshot(db, base_id, current_user.id)
+    base = unpack_grocery_list(base_snapshot.payload)
+    if target_id == "current":
+        target = generate_grocery_list(db, current_user.id, base_snapshot.servings_multiplier)
+    else:
+        try:
+            target_uuid = UUID(target_id)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Snapshot not found")
+        target = unpack_grocery_list(get_snapshot(db, target_uuid, current_user.id).payload)
+
+    changes = diff_grocery_lists(flatten_grocery_list(base), flatten_grocery_list(target))
+    return {"base": str(base_id), "target": target_id, **changes}
+
+@router.delete("/snapshots/{snapshot_id}", status_code=204)
+def delete_grocery_snapshot(
+    snapshot_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    db.delete(get_snapshot(db, snapshot_id, current_user.id))
+    db.commit()
+    return None
+
+@router.get("/meal-plan", response_model=List[GroceryTrip])
+def get_meal_plan_grocery_list(
+    start: date = Query(...),
+    end: date = Query(...),
+    shopping_days: Optional[List[int]] = Query(None, description="Weekdays you shop on (0=Mon ... 6=Sun)"),
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Shopping list for every meal planned in [start, end], optionally split into one list per shopping trip.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if shopping_days and any(day < 0 or day > 6 for day in shopping_days):
+        raise HTTPException(status_code=400, detail="shopping_days must be between 0 (Mon) and 6 (Sun)")
+
+    return generate_meal_plan_grocery_list(db, current_user.id, start, end, shopping_days)
+
+@router.get("/household", response_model=GroceryListResponse)
+def get_household_grocery_list(
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    One shopping list for the whole household: every member's selected recipes minus everyone's inventory.
+    """
+    membership = db.query(HouseholdMember).filter(HouseholdMember.user_id == current_user.id).first()
+    if not membership:
+        raise HTTPException(status_code=404, detail="You are not in a household")
+
+    return generate_household_grocery_list(db, membership.household_id)
+
+@router.get("/stream")
+def stream_grocery_list(
+    request: Request,
+    household: bool = False,
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user_for_stream)
+):
+    """
+    Live grocery list over Server-Sent Events: a snapshot, then diffs (added / changed / removed)
+    whenever a selection, recipe or inventory write changes it.
+    Use ?household=true for the household list, and ?access_token= from EventSource.
+    """
+    user_id = current_user.id
+    if household:
+        membership = db.query(HouseholdMember).filter(HouseholdMember.user_id == user_id).first()
+        if not membership:
+            raise HTTPException(status_code=404, detail="You are not in a household")
+        household_id = membership.household_id
+        stream_key = household_event_key(household_id)
+
+        def rewatch(session):
+            # Every member, plus the household's own key so joins and leaves wake the stream.
+            # Once you are no longer a member the stream ends.
+            members = [m for (m,) in session.query(HouseholdMember.user_id)
+                       .filter(HouseholdMember.household_id == household_id).all()]
+            return members + [stream_key] if user_id in members else None
+
+        watch_keys = rewatch(db)
+        compute = lambda session: generate_household_grocery_list(session, household_id)
+    else:
+        watch_keys = [user_id]
+        rewatch = None
+        stream_key = f"user:{user_id}"
+        compute = lambda session: generate_grocery_list(session, user_id)
+
+    # The stream opens its own short sessions; don't hold this one for the connection's lifetime
+    db.close()
+
+    return StreamingResponse(
+        grocery_event_stream(request, stream_key, watch_keys, compute, last_event_id, rewatch),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
\ No newline at end of file
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.profiling import ProfiledRoute
+from sqlalchemy.orm import Session, selectinload
+from app.db.session import get_db
+from app.api import deps
+from app.core.events import publish_household_change
+from app.models.friendship import FriendshipStatus
+from app.models.household import Household, HouseholdMember
+from app.models.user import User
+from app.schemas.household import HouseholdCreate, HouseholdMemberAdd, HouseholdResponse
+from app.utils.friend_logic import find_friendship
+
+router = APIRouter(route_class=ProfiledRoute)
+
+def get_membership(db: Session, user: User) -> HouseholdMember:
+    membership = db.query(HouseholdMember).filter(HouseholdMember.user_id == user.id).first()
+    if not membership:
+        raise HTTPException(status_code=404, detail="You are not in a household")
+    return membership
+
+def household_response(db: Session, household_id) -> HouseholdResponse:
+    household = db.query(Household).filter(Household.id == household_id).options(
+        selectinload(Household.members).selectinload(HouseholdMember.user)
+    ).first()
+    return HouseholdResponse(
+        id=household.id,
+        name=household.name,
+        members=[
+            {"user_id": m.user_id, "email": m.user.email, "joined_at": m.joined_at}
+            for m in household.members
+        ]
+    )
+
+@router.get("/me", response_model=HouseholdResponse)
+def read_my_household(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    membership = get_membership(db, current_user)
+    return household_response(db, membership.household_id)
+
+@router.post("/", response_model=HouseholdResponse)
+def create_household(
+    household_in: HouseholdCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Start a household with yourself as the first member.
+    """
+    if db.query(HouseholdMember).filter(HouseholdMember.user_id == current_user.id).first():
+        raise HTTPException(status_code=400, detail="You are already in a household")
+
+    household = Household(name=household_in.name)
+    db.add(household)
+    db.flush()
+    db.add(HouseholdMember(household_id=household.id, user_id=current_user.id))
+    db.commit()
+    return household_response(db, household.id)
+
+@router.post("/me/members", response_model=HouseholdResponse)
+def add_household_member(
+    member_in: HouseholdMemberAdd,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Add a friend to your household.
+    """
+    membership = get_membership(db, current_user)
+
+    friendship = find_friendship(db, current_user.id, member_in.user_id)
+    if not friendship or friendship.status != FriendshipStatus.ACCEPTED.value:
+        raise HTTPException(status_code=400, detail="Only friends can be added to your household")
+
+    if db.query(HouseholdMember).filter(HouseholdMember.user_id == member_in.user_id).first():
+        raise HTTPException(status_code=400, detail="This user is already in a household")
+
+    db.add(HouseholdMember(household_id=membership.household_id, user_id=member_in.user_id))
+    db.commit()
+    # Household streams re-read their members: the new member's recipes and inventory count from now on
+    publish_household_change(membership.household_id)
+    return household_response(db, membership.household_id)
+
+@router.delete("/me/members/{user_id}", status_code=204)
+def remove_household_member(
+    user_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Remove a member (or yourself) from your household. The last one out deletes it.
+    """
+    membership = get_membership(db, current_user)
+
+    member = db.query(HouseholdMember).filter(
+        HouseholdMember.household_id == membership.household_id,
+        HouseholdMember.user_id == user_id
+    ).first()
+
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+
+    household_id = membership.household_id
+    db.delete(member)
+    db.flush()
+
+    if not db.query(HouseholdMember).filter(HouseholdMember.household_id == household_id).first():
+        db.query(Household).filter(Household.id == household_id).delete()
+
+    db.commit()
+    publish_household_change(household_id)
+    return None
@@ -1,8 +1,24 @@
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.profiling import ProfiledRoute
 from sqlalchemy.orm import Session
+from app.api import deps
 from app.db.session import get_db
+from app.core.jobs import enqueue_job
 from app.models.ingredient import Ingredient
+from app.models.ingredient_alias import IngredientAlias
+from app.models.ingredient_nutrition import IngredientNutrition
+from app.models.ingredient_price import IngredientPrice
+from app.models.user import User
+from app.schemas.ingredient_alias import IngredientAliasCreate, IngredientAliasResponse, IngredientMergeRequest
+from app.schemas.job import JobResponse
+from app.schemas.ingredient_parse import IngredientParseRequest, ParsedIngredientLine
+from app.schemas.nutrition import IngredientNutritionResponse, IngredientNutritionSet
+from app.schemas.price import IngredientPriceResponse, IngredientPriceSet
+from app.utils import job_handlers  # noqa: F401 (registers the job kinds)
+from app.utils.data_version import bump_catalog_version
+from app.utils.ingredient_matching import get_ingredient_index, normalize_name
+from app.utils.ingredient_parser import load_catalog, parse_lines
 from pydantic import BaseModel
 from uuid import UUID
 
@@ -15,8 +31,199 @@ class IngredientResponse(BaseModel):
     class Config:
         from_attributes = True
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.get("/", response_model=List[IngredientResponse])
-def read_ingredients(db: Session = Depends(get_db)):
-    return db.query(Ingredient).order_by(Ingredient.name).all()
\ No newline at end of file
+def read_ingredients(db: Session = Depends(deps.get_read_db)):
+    return db.query(Ingredient).order_by(Ingredient.name).all()
+
+@router.get("/resolve", response_model=IngredientResponse)
+def resolve_ingredient(name: str = Query(..., min_length=1), db: Session = Depends(deps.get_read_db)):
+    """
+    The catalog entry a name would be saved as: plurals, descriptors ("fresh"), aliases and
+    small typos are folded. 404 means a recipe using this name would add a new ingredient.
+    """
+    found = get_ingredient_index(db).resolve(name)
+    ingredient = db.get(Ingredient, found[0]) if found else None
+    if not ingredient:
+        raise HTTPException(status_code=404, detail="No matching ingredient")
+    return ingredient
+
+# --- Free-text parsing ---
+
+@router.post("/parse", response_model=List[ParsedIngredientLine])
+def parse_ingredient_lines(
+    parse_in: IngredientParseRequest,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Splits pasted recipe lines ("2 1/2 cups all-purpose flour, sifted") into quantity, unit,
+    name and note, and matches each name against the ingredient catalog. Nothing is saved.
+    """
+    return parse_lines(parse_in.lines, load_catalog(db))
+
+# --- Prices (used to estimate grocery list costs) ---
+
+def price_response(price: IngredientPrice) -> IngredientPriceResponse:
+    response = IngredientPriceResponse.model_validate(price)
+    response.store = price.store or None
+    return response
+
+@router.get("/{ingredient_id}/prices", response_model=List[IngredientPriceResponse])
+def read_ingredient_prices(ingredient_id: UUID, db: Session = Depends(deps.get_read_db)):
+    prices = db.query(IngredientPrice).filter(IngredientPrice.ingredient_id == ingredient_id)\
+        .order_by(IngredientPrice.store).all()
+    return [price_response(p) for p in prices]
+
+@router.put("/{ingredient_id}/prices", response_model=IngredientPriceResponse)
+def set_ingredient_price(
+    ingredient_id: UUID,
+    price_in: IngredientPriceSet,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin)
+):
+    """
+    Set what the ingredient costs per unit, at one store (or, without a store, typically).
+    Prices are shared by every user's estimates, so only admins (ADMIN_EMAILS) change them.
+    """
+    if not db.get(Ingredient, ingredient_id):
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+
+    store = (price_in.store or "").strip()
+    price = db.query(IngredientPrice).filter(
+        IngredientPrice.ingredient_id == ingredient_id,
+        IngredientPrice.store == store
+    ).first()
+    if price is None:
+        price = IngredientPrice(ingredient_id=ingredient_id, store=store)
+        db.add(price)
+    price.unit = price_in.unit
+    price.price = price_in.price
+    db.commit()
+    db.refresh(price)
+    return price_response(price)
+
+@router.delete("/{ingredient_id}/prices", status_code=204)
+def delete_ingredient_price(
+    ingredient_id: UUID,
+    store: Optional[str] = Query(None, description="The store's price to remove (omit for the typical price)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin)
+):
+    deleted = db.query(IngredientPrice).filter(
+        IngredientPrice.ingredient_id == ingredient_id,
+        IngredientPrice.store == (store or "").strip()
+    ).delete(synchronize_session=False)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Price not found")
+    db.commit()
+    return None
+
+# --- Nutrition facts ---
+
+@router.get("/{ingredient_id}/nutrition", response_model=IngredientNutritionResponse)
+def read_ingredient_nutrition(ingredient_id: UUID, db: Session = Depends(deps.get_read_db)):
+    facts = db.get(IngredientNutrition, ingredient_id)
+    if not facts:
+        raise HTTPException(status_code=404, detail="No nutrition data for this ingredient")
+    return facts
+
+@router.put("/{ingredient_id}/nutrition", response_model=IngredientNutritionResponse)
+def set_ingredient_nutrition(
+    ingredient_id: UUID,
+    facts_in: IngredientNutritionSet,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin)
+):
+    """
+    Set the nutrients in `per_quantity` `unit` of the ingredient, e.g. per 100 g.
+    Nutrition facts are shared by every user, so only admins (ADMIN_EMAILS) change them.
+    """
+    if not db.get(Ingredient, ingredient_id):
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+
+    facts = db.get(IngredientNutrition, ingredient_id)
+    if facts is None:
+        facts = IngredientNutrition(ingredient_id=ingredient_id)
+        db.add(facts)
+    for field, value in facts_in.model_dump().items():
+        setattr(facts, field, value)
+    db.commit()
+    db.refresh(facts)
+    return facts
+
+# --- Aliases and merging duplicates (admins) ---
+
+@router.get("/{ingredient_id}/aliases", response_model=List[IngredientAliasResponse])
+def read_ingredient_aliases(ingredient_id: UUID, db: Session = Depends(deps.get_read_db)):
+    return db.query(IngredientAlias).filter(IngredientAlias.ingredient_id == ingredient_id)\
+        .order_by(IngredientAlias.name).all()
+
+@router.post("/{ingredient_id}/aliases", response_model=IngredientAliasResponse, status_code=201)
+def add_ingredient_alias(
+    ingredient_id: UUID,
+    alias_in: IngredientAliasCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin)
+):
+    """
+    Another name for the ingredient: recipes, imports and parsed lines using it are saved
+    as this ingredient instead of creating a new one.
+    """
+    if not db.get(Ingredient, ingredient_id):
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    key = normalize_name(alias_in.name)
+    if not key:
+        raise HTTPException(status_code=400, detail="Alias has no name left after normalizing")
+
+    taken = get_ingredient_index(db).lookup(alias_in.name)
+    if taken and taken[0] != ingredient_id:
+        raise HTTPException(status_code=409, detail=f"Already means {taken[1]}; merge the two instead")
+    if db.query(IngredientAlias.id).filter(IngredientAlias.key == key).first():
+        raise HTTPException(status_code=409, detail="Alias already exists")
+
+    alias = IngredientAlias(ingredient_id=ingredient_id, name=alias_in.name.strip(), key=key)
+    db.add(alias)
+    bump_catalog_version(db)
+    db.commit()
+    db.refresh(alias)
+    return alias
+
+@router.delete("/{ingredient_id}/aliases/{alias_id}", status_code=204)
+def delete_ingredient_alias(
+    ingredient_id: UUID,
+    alias_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin)
+):
+    deleted = db.query(IngredientAlias).filter(
+        IngredientAlias.id == alias_id,
+        IngredientAlias.ingredient_id == ingredient_id
+    ).delete(synchronize_session=False)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Alias not found")
+    bump_catalog_version(db)
+    db.commit()
+    return None
+
+@router.post("/merge", response_model=JobResponse, status_code=202)
+def merge_ingredients_job(
+    merge_in: IngredientMergeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin)
+):
+    """
+    Folds duplicate ingredients into target_id in the background: every recipe line, inventory
+    item, price and alias moves over, and the duplicates' names become aliases. Poll GET /jobs/{id}.
+    """
+    ids = [merge_in.target_id] + merge_in.source_ids
+    found = {i for (i,) in db.query(Ingredient.id).filter(Ingredient.id.in_(ids))}
+    if set(ids) - found:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+    if merge_in.target_id in merge_in.source_ids:
+        raise HTTPException(status_code=400, detail="The target can't also be a source")
+    return enqueue_job(db, current_user.id, "ingredient_merge", {
+        "target_id": str(merge_in.target_id),
+        "source_ids": sorted(str(i) for i in merge_in.source_ids)
+    })
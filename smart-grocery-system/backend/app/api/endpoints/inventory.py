@@ -1,32 +1,46 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.core.profiling import ProfiledRoute
 from sqlalchemy.orm import Session, joinedload
 from app.db.session import get_db
 from app.api import deps
+from app.core.events import publish_change
+from app.utils.data_version import bump_data_version, data_etag, not_modified
+from app.utils.sync_logic import log_changes, INVENTORY
 from app.models.inventory import Inventory
 from app.models.ingredient import Ingredient
 from app.schemas.inventory import InventoryResponse, InventoryUpdate, InventoryCreate
 from app.models.user import User
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+def to_response(item: Inventory) -> InventoryResponse:
+    return InventoryResponse(
+        id=item.id,
+        ingredient_id=item.ingredient_id,
+        ingredient_name=item.ingredient.name,
+        quantity=item.quantity,
+        unit=item.unit,
+        version=item.version
+    )
 
 @router.get("/", response_model=List[InventoryResponse])
 def read_inventory(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
 ):
+    cached = not_modified(request, response, data_etag(current_user, "inventory"))
+    if cached:
+        return cached
+
     items = db.query(Inventory).filter(Inventory.user_id == current_user.id)\
         .options(joinedload(Inventory.ingredient)).all()
     
-    return [
-        InventoryResponse(
-            id=item.id,
-            ingredient_id=item.ingredient_id,
-            ingredient_name=item.ingredient.name,
-            quantity=item.quantity,
-            unit=item.unit
-        ) for item in items
-    ]
+    return [to_response(item) for item in items]
 
 @router.post("/", response_model=InventoryResponse)
 def add_inventory_item(
@@ -43,15 +57,13 @@ def add_inventory_item(
     if existing:
         existing.quantity = item_in.quantity
         existing.unit = item_in.unit
+        existing.version = Inventory.version + 1
+        version = bump_data_version(db, current_user.id)
+        log_changes(db, current_user.id, version, INVENTORY, [existing.id])
         db.commit()
+        publish_change(current_user.id)
         db.refresh(existing)
-        return InventoryResponse(
-            id=existing.id,
-            ingredient_id=existing.ingredient_id,
-            ingredient_name=existing.ingredient.name,
-            quantity=existing.quantity,
-            unit=existing.unit
-        )
+        return to_response(existing)
 
     # Create new
     new_item = Inventory(
@@ -61,19 +73,17 @@ def add_inventory_item(
         unit=item_in.unit
     )
     db.add(new_item)
+    db.flush()
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, INVENTORY, [new_item.id])
     db.commit()
+    publish_change(current_user.id)
     db.refresh(new_item)
     
     # Reload to get ingredient name
     db.refresh(new_item, attribute_names=['ingredient'])
     
-    return InventoryResponse(
-        id=new_item.id,
-        ingredient_id=new_item.ingredient_id,
-        ingredient_name=new_item.ingredient.name,
-        quantity=new_item.quantity,
-        unit=new_item.unit
-    )
+    return to_response(new_item)
 
 @router.put("/{inventory_id}", response_model=InventoryResponse)
 def update_inventory_item(
@@ -82,26 +92,43 @@ def update_inventory_item(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    item = db.query(Inventory).filter(
+    """
+    Conditional write: with item_in.version set, the UPDATE only matches if nobody changed
+    the item since the client read it; otherwise 409 with the current item to merge against.
+    """
+    query = db.query(Inventory).filter(
         Inventory.id == inventory_id,
         Inventory.user_id == current_user.id
-    ).options(joinedload(Inventory.ingredient)).first()
+    )
+    if item_in.version is not None:
+        query = query.filter(Inventory.version == item_in.version)
 
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
+    updated = query.update({
+        Inventory.quantity: item_in.quantity,
+        Inventory.unit: item_in.unit,
+        Inventory.version: Inventory.version + 1
+    }, synchronize_session=False)
+
+    if not updated:
+        current = db.query(Inventory).filter(
+            Inventory.id == inventory_id,
+            Inventory.user_id == current_user.id
+        ).options(joinedload(Inventory.ingredient)).first()
+        if not current:
+            raise HTTPException(status_code=404, detail="Item not found")
+        raise HTTPException(status_code=409, detail={
+            "message": "Item was changed by another device",
+            "current": jsonable_encoder(to_response(current))
+        })
 
-    item.quantity = item_in.quantity
-    item.unit = item_in.unit
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, INVENTORY, [UUID(inventory_id)])
     db.commit()
-    db.refresh(item)
-    
-    return InventoryResponse(
-        id=item.id,
-        ingredient_id=item.ingredient_id,
-        ingredient_name=item.ingredient.name,
-        quantity=item.quantity,
-        unit=item.unit
-    )
+    publish_change(current_user.id)
+
+    item = db.query(Inventory).filter(Inventory.id == inventory_id)\
+        .options(joinedload(Inventory.ingredient)).first()
+    return to_response(item)
 # ... (existing code)
 
 @router.delete("/{inventory_id}", status_code=204)
@@ -122,7 +149,10 @@ def delete_inventory_item(
         raise HTTPException(status_code=404, detail="Item not found")
 
     db.delete(item)
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, INVENTORY, [item.id], deleted=True)
     db.commit()
+    publish_change(current_user.id)
     return None# ... (existing code)
 
 @router.delete("/{inventory_id}", status_code=204)
@@ -143,5 +173,8 @@ def delete_inventory_item(
         raise HTTPException(status_code=404, detail="Item not found")
 
     db.delete(item)
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, INVENTORY, [item.id], deleted=True)
     db.commit()
+    publish_change(current_user.id)
     return None
\ No newline at end of file
@@ -0,0 +1,57 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.profiling import ProfiledRoute
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.api import deps
+from app.core.jobs import enqueue_job, job_kinds, requires_admin
+from app.core.security import is_admin
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.job import JobCreate, JobResponse
+from app.utils import job_handlers  # noqa: F401 (registers the job kinds)
+
+router = APIRouter(route_class=ProfiledRoute)
+
+@router.post("/", response_model=JobResponse, status_code=202)
+def create_job(
+    job_in: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Queue a recomputation to run in the background; poll GET /jobs/{id} for the result.
+    An identical job that is still waiting is returned instead of queueing a second one.
+    """
+    if job_in.kind not in job_kinds():
+        raise HTTPException(status_code=400, detail=f"Unknown job kind. Choose from: {', '.join(job_kinds())}")
+    if requires_admin(job_in.kind) and not is_admin(current_user.email):
+        raise HTTPException(status_code=403, detail="Admins only")
+    return enqueue_job(db, current_user.id, job_in.kind, job_in.params)
+
+@router.get("/", response_model=List[JobResponse])
+def read_jobs(
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Your most recent jobs, newest first.
+    """
+    query = db.query(Job).filter(Job.user_id == current_user.id)
+    if status:
+        query = query.filter(Job.status == status.upper())
+    return query.order_by(Job.created_at.desc()).limit(limit).all()
+
+@router.get("/{job_id}", response_model=JobResponse)
+def read_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    job = db.query(Job).filter(Job.id == job_id, Job.user_id == current_user.id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,87 @@
+from datetime import date
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.profiling import ProfiledRoute
+from sqlalchemy.orm import Session, joinedload
+from app.db.session import get_db
+from app.api import deps
+from app.models.meal_plan import MealPlanEntry
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.schemas.meal_plan import MealPlanEntryCreate, MealPlanEntryResponse
+
+router = APIRouter(route_class=ProfiledRoute)
+
+def to_response(entry: MealPlanEntry) -> MealPlanEntryResponse:
+    return MealPlanEntryResponse(
+        id=entry.id,
+        recipe_id=entry.recipe_id,
+        recipe_title=entry.recipe.title,
+        planned_date=entry.planned_date,
+        servings=entry.servings
+    )
+
+@router.get("/", response_model=List[MealPlanEntryResponse])
+def read_meal_plan(
+    start: date = Query(...),
+    end: date = Query(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    List planned meals between start and end (inclusive), in date order.
+    """
+    entries = db.query(MealPlanEntry).filter(
+        MealPlanEntry.user_id == current_user.id,
+        MealPlanEntry.planned_date >= start,
+        MealPlanEntry.planned_date <= end
+    ).options(joinedload(MealPlanEntry.recipe))\
+     .order_by(MealPlanEntry.planned_date).all()
+
+    return [to_response(entry) for entry in entries]
+
+@router.post("/", response_model=MealPlanEntryResponse)
+def add_meal_plan_entry(
+    entry_in: MealPlanEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    recipe = db.query(Recipe).filter(
+        Recipe.id == entry_in.recipe_id,
+        Recipe.user_id == current_user.id
+    ).first()
+
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    entry = MealPlanEntry(
+        user_id=current_user.id,
+        recipe_id=recipe.id,
+        planned_date=entry_in.planned_date,
+        servings=entry_in.servings
+    )
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return to_response(entry)
+
+@router.delete("/{entry_id}", status_code=204)
+def delete_meal_plan_entry(
+    entry_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Remove a meal from the plan.
+    """
+    entry = db.query(MealPlanEntry).filter(
+        MealPlanEntry.id == entry_id,
+        MealPlanEntry.user_id == current_user.id
+    ).first()
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Meal plan entry not found")
+
+    db.delete(entry)
+    db.commit()
+    return None
@@ -1,21 +1,37 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from app.core.profiling import ProfiledRoute
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
-from sqlalchemy import func
-from pydantic import BaseModel # <--- Ensure BaseModel is imported
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import or_
+from pydantic import BaseModel, Field # <--- Ensure BaseModel is imported
 from app.utils.suggestion_logic import suggest_recipes # <--- Import this
 from app.schemas.recipe import RecipeSuggestion # <--- Import this
 
 from app.db.session import get_db
 from app.api import deps
+from app.core.events import publish_change
+from app.utils.data_version import bump_catalog_version, bump_data_version, data_etag, not_modified
 from app.models.recipe import Recipe, RecipeIngredient
 from app.models.ingredient import Ingredient
 from app.models.user import User
-from app.schemas.recipe import RecipeCreate, RecipeResponse, RecipeUpdate
+from app.schemas.nutrition import RecipeNutrition
+from app.schemas.recipe import CookResponse, RecipeCreate, RecipeIngredientCreate, RecipeResponse, RecipeUpdate, RecipeCopyRequest
+from app.schemas.recipe import MAX_BATCH_RECIPES, RecipeBatchRequest, RecipeBatchResponse
+from app.api.endpoints.inventory import to_response as inventory_response
+from app.models.inventory import Inventory
+from app.utils.cook_logic import InventoryChanged, deduct_recipe
+from app.utils.copy_logic import copy_shared_recipes
+from app.utils.grocery_logic import generate_grocery_list
+from app.utils.ingredient_matching import get_ingredient_index
+from app.utils.ingredient_parser import load_catalog, parse_lines
+from app.utils.nutrition_logic import recipe_nutrition_summary
+from app.utils.search_logic import refresh_search_index, search_recipes
+from app.utils.sync_logic import log_changes, INVENTORY, RECIPE, RECIPE_INGREDIENT
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # --- Helper Function to Handle Custom Ingredients ---
 def get_or_create_ingredient(db: Session, item) -> UUID:
@@ -23,12 +39,11 @@ def get_or_create_ingredient(db: Session, item) -> UUID:
         return item.ingredient_id
 
     if item.name:
-        existing = db.query(Ingredient).filter(
-            func.lower(Ingredient.name) == item.name.lower()
-        ).first()
+        # Plurals, aliases and small typos resolve to the catalog entry instead of a new one
+        existing = get_ingredient_index(db).resolve(item.name)
         
         if existing:
-            return existing.id
+            return existing[0]
         
         new_ing = Ingredient(
             name=item.name,
@@ -37,51 +52,82 @@ def get_or_create_ingredient(db: Session, item) -> UUID:
         )
         db.add(new_ing)
         db.flush()
+        bump_catalog_version(db)
         return new_ing.id
     
     raise HTTPException(status_code=400, detail="Ingredient must have either an ID or a Name")
 
+# --- Helper Function to Expand Free-Text Ingredient Lines ---
+def recipe_lines(db: Session, recipe_in) -> List[RecipeIngredientCreate]:
+    """recipe_in.ingredients, plus its ingredients_text parsed (names matched against the catalog)."""
+    if not recipe_in.ingredients_text:
+        return recipe_in.ingredients
+    parsed = parse_lines(recipe_in.ingredients_text, load_catalog(db))
+    return recipe_in.ingredients + [
+        RecipeIngredientCreate(
+            quantity=line["quantity"],
+            unit=line["unit"],
+            ingredient_id=line["ingredient_id"],
+            name=line["name"]
+        )
+        for line in parsed if line["name"]
+    ]
+
+# --- Helper Function to Serialize a Recipe (ingredients must be loaded) ---
+def recipe_to_dict(r: Recipe) -> dict:
+    r_dict = r.__dict__
+    
+    # --- FIX: Handle None values for existing recipes ---
+    if r.is_selected is None:
+        r_dict['is_selected'] = False
+    if r.is_shared_to_friends is None:
+        r_dict['is_shared_to_friends'] = False
+    # ---------------------------------------------------
+
+    r_dict['ingredients'] = [
+        {
+            "id": ri.id,
+            "ingredient_id": ri.ingredient_id,
+            "name": ri.ingredient.name,
+            "quantity": ri.quantity,
+            "unit": ri.unit
+        }
+        for ri in r.ingredients
+    ]
+    return r_dict
+
 # --- Helper Schema for Selection Toggle ---
 class RecipeSelect(BaseModel):
     is_selected: bool
+    target_servings: Optional[int] = Field(default=None, gt=0)  # Shop for this many servings instead of recipe.servings
+
+# --- Helper Schema for Sharing Toggle ---
+class RecipeShare(BaseModel):
+    is_shared_to_friends: bool
 
 @router.get("/", response_model=List[RecipeResponse])
 def read_recipes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
 ):
+    # Unchanged since the client's copy? Skip the joined load entirely
+    cached = not_modified(request, response, data_etag(current_user, "recipes"))
+    if cached:
+        return cached
+
     recipes = db.query(Recipe).filter(Recipe.user_id == current_user.id).options(
         joinedload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient)
     ).all()
     
-    results = []
-    for r in recipes:
-        r_dict = r.__dict__
-        
-        # --- FIX: Handle None values for existing recipes ---
-        if r.is_selected is None:
-            r_dict['is_selected'] = False
-        # ---------------------------------------------------
-
-        r_dict['ingredients'] = [
-            {
-                "id": ri.id,
-                "ingredient_id": ri.ingredient_id,
-                "name": ri.ingredient.name,
-                "quantity": ri.quantity,
-                "unit": ri.unit
-            }
-            for ri in r.ingredients
-        ]
-        results.append(r_dict)
-    
-    return results
+    return [recipe_to_dict(r) for r in recipes]
 
 
 @router.get("/suggestions", response_model=List[RecipeSuggestion])
 def get_recipe_suggestions(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
 ):
     """
     Compare inventory against recipes and return sorted matches.
@@ -89,11 +135,73 @@ def get_recipe_suggestions(
     return suggest_recipes(db, current_user.id)
 
 
+@router.get("/search", response_model=List[RecipeResponse])
+def search_my_recipes(
+    q: Optional[str] = Query(None, description="Words to find in titles, ingredients and instructions"),
+    has: List[str] = Query([], description="Must contain these ingredients (name or aisle)"),
+    exclude: List[str] = Query([], description="Must not contain these ingredients (name or aisle)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Full-text search over your recipes, best matches first.
+    e.g. ?q=curry&has=chicken&exclude=dairy
+    """
+    if not (q and q.strip()) and not has and not exclude:
+        raise HTTPException(status_code=400, detail="Provide a search query or an ingredient filter")
+
+    recipes = search_recipes(db, current_user.id, q, has, exclude, limit)
+    return [recipe_to_dict(r) for r in recipes]
+
+
+def load_recipe_batch(db: Session, user_id: UUID, ids: List[UUID]) -> dict:
+    """
+    The user's recipes among ids in two queries (recipes, then all their ingredient lines
+    with names), keyed by id in the order asked for; the rest are listed as missing.
+    """
+    ids = list(dict.fromkeys(ids))
+    recipes = db.query(Recipe).filter(Recipe.id.in_(ids), Recipe.user_id == user_id).options(
+        selectinload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient)
+    ).all()
+    by_id = {r.id: r for r in recipes}
+    return {
+        "recipes": {recipe_id: recipe_to_dict(by_id[recipe_id]) for recipe_id in ids if recipe_id in by_id},
+        "missing": [recipe_id for recipe_id in ids if recipe_id not in by_id],
+    }
+
+@router.get("/batch", response_model=RecipeBatchResponse)
+def read_recipe_batch(
+    ids: List[str] = Query(..., description="Recipe ids, comma separated or repeated"),
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Several recipes in one request: ?ids=<id>,<id>,... (up to MAX_BATCH_RECIPES).
+    For lists too long for a URL, POST the same ids to /recipes/batch.
+    """
+    try:
+        recipe_ids = [UUID(part.strip()) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be recipe ids (UUIDs)")
+    if not recipe_ids or len(recipe_ids) > MAX_BATCH_RECIPES:
+        raise HTTPException(status_code=422, detail=f"Ask for 1 to {MAX_BATCH_RECIPES} recipes")
+    return load_recipe_batch(db, current_user.id, recipe_ids)
+
+@router.post("/batch", response_model=RecipeBatchResponse)
+def read_recipe_batch_post(
+    batch_in: RecipeBatchRequest,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """Same as GET /recipes/batch, with the ids in the body. Reads only."""
+    return load_recipe_batch(db, current_user.id, batch_in.ids)
+
 @router.get("/{recipe_id}", response_model=RecipeResponse)
 def read_recipe(
     recipe_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
 ):
     recipe = db.query(Recipe).filter(
         Recipe.id == recipe_id, 
@@ -105,24 +213,26 @@ def read_recipe(
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
-    r_dict = recipe.__dict__
-    
-    # --- FIX: Handle None values for existing recipes ---
-    if recipe.is_selected is None:
-        r_dict['is_selected'] = False
-    # ---------------------------------------------------
+    return recipe_to_dict(recipe)
 
-    r_dict['ingredients'] = [
-        {
-            "id": ri.id,
-            "ingredient_id": ri.ingredient_id,
-            "name": ri.ingredient.name,
-            "quantity": ri.quantity,
-            "unit": ri.unit
-        }
-        for ri in recipe.ingredients
-    ]
-    return r_dict
+@router.get("/{recipe_id}/nutrition", response_model=RecipeNutrition)
+def read_recipe_nutrition(
+    recipe_id: str,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_reader)
+):
+    """
+    Calories and macros for the whole recipe and per serving.
+    """
+    recipe = db.query(Recipe).filter(
+        Recipe.id == recipe_id,
+        Recipe.user_id == current_user.id
+    ).first()
+
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    return recipe_nutrition_summary(db, recipe)
 
 @router.post("/", response_model=RecipeResponse)
 def create_recipe(
@@ -140,7 +250,7 @@ def create_recipe(
     db.add(new_recipe)
     db.flush() 
 
-    for item in recipe_in.ingredients:
+    for item in recipe_lines(db, recipe_in):
         ing_id = get_or_create_ingredient(db, item)
         recipe_ing = RecipeIngredient(
             recipe_id=new_recipe.id,
@@ -150,10 +260,38 @@ def create_recipe(
         )
         db.add(recipe_ing)
     
+    refresh_search_index(db, [new_recipe.id])
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, RECIPE, [new_recipe.id])
     db.commit()
+    publish_change(current_user.id)
     db.refresh(new_recipe)
     return read_recipe(str(new_recipe.id), db, current_user)
 
+@router.post("/copy", response_model=List[RecipeResponse])
+def copy_recipes(
+    copy_in: RecipeCopyRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Copy recipes friends have shared into your own collection.
+    Recipes that aren't shared with you are skipped.
+    """
+    id_map = copy_shared_recipes(db, current_user.id, copy_in.recipe_ids)
+    if not id_map:
+        raise HTTPException(status_code=404, detail="No shared recipes found")
+    refresh_search_index(db, id_map.values())
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, RECIPE, id_map.values())
+    db.commit()
+    publish_change(current_user.id)
+
+    recipes = db.query(Recipe).filter(Recipe.id.in_(list(id_map.values()))).options(
+        joinedload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient)
+    ).all()
+    return [recipe_to_dict(r) for r in recipes]
+
 @router.put("/{recipe_id}", response_model=RecipeResponse)
 def update_recipe(
     recipe_id: str,
@@ -161,21 +299,38 @@ def update_recipe(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    recipe = db.query(Recipe).filter(
-        Recipe.id == recipe_id, 
+    """
+    Conditional write: with recipe_in.version set, the UPDATE only matches if nobody edited
+    the recipe since the client read it; otherwise 409 with the current recipe to merge against.
+    The updated row stays locked until commit, so concurrent edits can't interleave their lines.
+    """
+    query = db.query(Recipe).filter(
+        Recipe.id == recipe_id,
         Recipe.user_id == current_user.id
-    ).first()
+    )
+    if recipe_in.version is not None:
+        query = query.filter(Recipe.version == recipe_in.version)
 
-    if not recipe:
-        raise HTTPException(status_code=404, detail="Recipe not found")
+    updated = query.update({
+        Recipe.title: recipe_in.title,
+        Recipe.instructions: recipe_in.instructions,
+        Recipe.servings: recipe_in.servings,
+        Recipe.version: Recipe.version + 1
+    }, synchronize_session=False)
+
+    if not updated:
+        current = read_recipe(recipe_id, db, current_user)  # 404 if it doesn't exist
+        raise HTTPException(status_code=409, detail={
+            "message": "Recipe was changed by another device",
+            "current": jsonable_encoder(RecipeResponse.model_validate(current))
+        })
 
-    recipe.title = recipe_in.title
-    recipe.instructions = recipe_in.instructions
-    recipe.servings = recipe_in.servings
+    recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
 
+    old_line_ids = [line_id for (line_id,) in db.query(RecipeIngredient.id).filter(RecipeIngredient.recipe_id == recipe.id)]
     db.query(RecipeIngredient).filter(RecipeIngredient.recipe_id == recipe.id).delete()
     
-    for item in recipe_in.ingredients:
+    for item in recipe_lines(db, recipe_in):
         ing_id = get_or_create_ingredient(db, item)
         new_ing = RecipeIngredient(
             recipe_id=recipe.id,
@@ -185,7 +340,12 @@ def update_recipe(
         )
         db.add(new_ing)
     
+    refresh_search_index(db, [recipe.id])
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, RECIPE_INGREDIENT, old_line_ids, deleted=True)
+    log_changes(db, current_user.id, version, RECIPE, [recipe.id])
     db.commit()
+    publish_change(current_user.id)
     db.refresh(recipe)
     return read_recipe(str(recipe.id), db, current_user)
 
@@ -208,11 +368,81 @@ def toggle_recipe_selection(
         raise HTTPException(status_code=404, detail="Recipe not found")
     
     recipe.is_selected = selection.is_selected
+    if selection.target_servings is not None:
+        recipe.target_servings = selection.target_servings
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, RECIPE, [recipe.id])
+    db.commit()
+    publish_change(current_user.id)
+    db.refresh(recipe)
+    
+    return read_recipe(str(recipe.id), db, current_user)
+
+@router.patch("/{recipe_id}/share", response_model=RecipeResponse)
+def toggle_recipe_sharing(
+    recipe_id: str,
+    share: RecipeShare,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Show or hide a recipe in your friends' feed.
+    """
+    recipe = db.query(Recipe).filter(
+        Recipe.id == recipe_id, 
+        Recipe.user_id == current_user.id
+    ).first()
+
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    
+    recipe.is_shared_to_friends = share.is_shared_to_friends
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, RECIPE, [recipe.id])
     db.commit()
     db.refresh(recipe)
     
     return read_recipe(str(recipe.id), db, current_user)
 
+@router.post("/{recipe_id}/cook", response_model=CookResponse)
+def cook_recipe(
+    recipe_id: str,
+    servings: Optional[int] = Query(None, gt=0, description="Servings cooked (defaults to the recipe's)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Take what the recipe uses out of the inventory in one transaction; items that run out
+    are removed. Returns the pantry, the refreshed shopping list, and anything you were short of.
+    """
+    recipe = db.query(Recipe).filter(
+        Recipe.id == recipe_id,
+        Recipe.user_id == current_user.id
+    ).first()
+
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    try:
+        updated_ids, used_up_ids, missing = deduct_recipe(db, current_user.id, recipe, servings)
+    except InventoryChanged:
+        raise HTTPException(status_code=409, detail="Inventory was changed by another device, try again")
+
+    if updated_ids or used_up_ids:
+        version = bump_data_version(db, current_user.id)
+        log_changes(db, current_user.id, version, INVENTORY, updated_ids)
+        log_changes(db, current_user.id, version, INVENTORY, used_up_ids, deleted=True)
+    db.commit()
+    publish_change(current_user.id)
+
+    items = db.query(Inventory).filter(Inventory.user_id == current_user.id)\
+        .options(joinedload(Inventory.ingredient)).all()
+    return {
+        "inventory": [inventory_response(item) for item in items],
+        "grocery": generate_grocery_list(db, current_user.id),
+        "missing_ingredients": missing
+    }
+
 @router.post("/clear-selection", status_code=200)
 def clear_all_selections(
     db: Session = Depends(get_db),
@@ -221,9 +451,15 @@ def clear_all_selections(
     """
     Unselect ALL recipes for the current user.
     """
-    # efficient bulk update
-    db.query(Recipe).filter(Recipe.user_id == current_user.id).update(
-        {Recipe.is_selected: False}, synchronize_session=False
+    # efficient bulk update, of just the recipes that change (so sync only sends those)
+    cleared = db.query(Recipe).filter(
+        Recipe.user_id == current_user.id,
+        or_(Recipe.is_selected == True, Recipe.target_servings.isnot(None))
     )
+    cleared_ids = [recipe_id for (recipe_id,) in cleared.with_entities(Recipe.id)]
+    cleared.update({Recipe.is_selected: False, Recipe.target_servings: None}, synchronize_session=False)
+    version = bump_data_version(db, current_user.id)
+    log_changes(db, current_user.id, version, RECIPE, cleared_ids)
     db.commit()
+    publish_change(current_user.id)
     return {"message": "Selection cleared"}
\ No newline at end of file
@@ -0,0 +1,171 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from app.core.profiling import ProfiledRoute
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.api import deps
+from app.api.endpoints.recipes import get_or_create_ingredient, recipe_lines
+from app.core.events import publish_change
+from app.models.inventory import Inventory
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.user import User
+from app.schemas.sync import SyncResponse, SyncUpload
+from app.utils.data_version import bump_data_version
+from app.utils.search_logic import refresh_search_index
+from app.utils.sync_logic import changes_since, load_state, log_changes, RECIPE, RECIPE_INGREDIENT, INVENTORY
+
+router = APIRouter(route_class=ProfiledRoute)
+
+@router.get("/", response_model=SyncResponse)
+def pull_changes(
+    since: int = Query(0, ge=0, description="The cursor from the previous sync (0 = everything)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    What changed since the client's last sync: recipes (including selections), their
+    ingredient lines and inventory, plus tombstones for deleted rows.
+    """
+    return changes_since(db, current_user, since)
+
+@router.post("/", response_model=SyncResponse)
+def push_changes(
+    upload: SyncUpload,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Apply a batch of offline edits in one transaction (all or nothing), then return
+    everything since upload.since - including the server ids of rows created offline.
+    Edits that carry the version they were based on are conditional: if any of those
+    recipes / inventory items changed on the server since, nothing is applied and the
+    409 carries their current state to merge against. Edits without a version overwrite.
+    """
+    if not (upload.recipes or upload.selections or upload.inventory):
+        return changes_since(db, current_user, upload.since)
+
+    # --- Recipes: update by id, or create (with the offline id, if one was given) ---
+    recipe_ids = [c.id for c in upload.recipes if c.id] + [s.recipe_id for s in upload.selections]
+    existing = {r.id: r for r in db.query(Recipe).filter(Recipe.id.in_(recipe_ids)).all()} if recipe_ids else {}
+    for recipe in existing.values():
+        if recipe.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail=f"Recipe {recipe.id} not found")
+
+    version = bump_data_version(db, current_user.id)
+    edited_recipe_ids, changed_recipe_ids = set(), set()
+    conflicts = {"recipes": [], "inventory": []}
+
+    replaced_ids = [c.id for c in upload.recipes if c.id in existing]
+    if replaced_ids:
+        old_lines = db.query(RecipeIngredient.id).filter(RecipeIngredient.recipe_id.in_(replaced_ids)).all()
+        log_changes(db, current_user.id, version, RECIPE_INGREDIENT, [line_id for (line_id,) in old_lines], deleted=True)
+        db.query(RecipeIngredient).filter(RecipeIngredient.recipe_id.in_(replaced_ids)).delete(synchronize_session=False)
+
+    for change in upload.recipes:
+        recipe = existing.get(change.id)
+        if recipe is None or recipe in db.new:
+            if recipe is None:
+                recipe = Recipe(user_id=current_user.id)
+                if change.id:
+                    recipe.id = change.id
+                db.add(recipe)
+            recipe.title = change.title
+            recipe.instructions = change.instructions
+            recipe.servings = change.servings
+            db.flush()
+            existing[recipe.id] = recipe
+        else:
+            query = db.query(Recipe).filter(Recipe.id == recipe.id)
+            if change.version is not None:
+                query = query.filter(Recipe.version == change.version)
+            updated = query.update({
+                Recipe.title: change.title,
+                Recipe.instructions: change.instructions,
+                Recipe.servings: change.servings,
+                Recipe.version: Recipe.version + 1
+            }, synchronize_session=False)
+            if not updated:
+                conflicts["recipes"].append(recipe.id)
+                continue
+
+        for item in recipe_lines(db, change):
+            db.add(RecipeIngredient(
+                recipe_id=recipe.id,
+                ingredient_id=get_or_create_ingredient(db, item),
+                quantity=item.quantity,
+                unit=item.unit
+            ))
+        edited_recipe_ids.add(recipe.id)
+
+    # --- Selections ---
+    for selection in upload.selections:
+        recipe = existing.get(selection.recipe_id)
+        if recipe is None:
+            raise HTTPException(status_code=404, detail=f"Recipe {selection.recipe_id} not found")
+        recipe.is_selected = selection.is_selected
+        if selection.target_servings is not None:
+            recipe.target_servings = selection.target_servings
+        changed_recipe_ids.add(recipe.id)
+
+    # --- Inventory: one row per ingredient ---
+    ingredient_ids = [c.ingredient_id for c in upload.inventory]
+    on_hand = {}
+    if ingredient_ids:
+        on_hand = {
+            i.ingredient_id: i for i in db.query(Inventory).filter(
+                Inventory.user_id == current_user.id,
+                Inventory.ingredient_id.in_(ingredient_ids)
+            ).all()
+        }
+    for change in upload.inventory:
+        item = on_hand.get(change.ingredient_id)
+        if item is None or item in db.new:
+            if change.deleted:
+                if item is not None:
+                    db.expunge(item)
+                    del on_hand[change.ingredient_id]
+                continue
+            if item is None:
+                item = Inventory(user_id=current_user.id, ingredient_id=change.ingredient_id)
+                db.add(item)
+                on_hand[change.ingredient_id] = item
+            item.quantity = change.quantity
+            item.unit = change.unit
+            continue
+
+        query = db.query(Inventory).filter(Inventory.id == item.id)
+        if change.version is not None:
+            query = query.filter(Inventory.version == change.version)
+        if change.deleted:
+            written = query.delete(synchronize_session=False)
+        else:
+            written = query.update({
+                Inventory.quantity: change.quantity,
+                Inventory.unit: change.unit,
+                Inventory.version: Inventory.version + 1
+            }, synchronize_session=False)
+        if not written:
+            conflicts["inventory"].append(item.id)
+        elif change.deleted:
+            log_changes(db, current_user.id, version, INVENTORY, [item.id], deleted=True)
+            db.expunge(item)
+            del on_hand[change.ingredient_id]
+
+    if conflicts["recipes"] or conflicts["inventory"]:
+        # Undo the rest of the batch, then show what the client is out of date on
+        db.rollback()
+        current = load_state(db, current_user.id, conflicts["recipes"], (), conflicts["inventory"])
+        raise HTTPException(status_code=409, detail={
+            "message": "Some items were changed by another device",
+            "current": jsonable_encoder(current)
+        })
+
+    db.flush()
+    log_changes(db, current_user.id, version, RECIPE, edited_recipe_ids | changed_recipe_ids)
+    log_changes(db, current_user.id, version, INVENTORY, [i.id for i in on_hand.values()])
+    refresh_search_index(db, edited_recipe_ids)
+    db.commit()
+    publish_change(current_user.id)
+
+    db.refresh(current_user)
+    return changes_since(db, current_user, upload.since)
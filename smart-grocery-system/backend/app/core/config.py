@@ -3,13 +3,57 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Smart Grocery System"
     DATABASE_URL: str
+    # Optional read replicas (comma separated URLs) for read-only endpoints
+    DATABASE_REPLICA_URLS: str = ""
+    # After a write, that user reads from the primary until the replica has caught up, at most this long
+    REPLICA_STICKY_SECONDS: float = 60.0
     
     # New Auth Config
     SECRET_KEY: str = "CHANGE_THIS_TO_A_SUPER_SECRET_KEY_IN_PROD" # Generates tokens
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # 30 mins for dev (Spec says 15, but 30 is easier for dev)
+    # Accounts that may edit the shared ingredient catalog (aliases, merges); comma separated
+    ADMIN_EMAILS: str = ""
+
+    # Request Profiling (off by default, the middleware is not even installed)
+    PROFILING_ENABLED: bool = False
+    PROFILING_ADMIN_TOKEN: str = ""  # Send as "X-Profile: <token>" to force a profile
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests to profile (0.0 - 1.0)
+    PROFILING_MAX_CONCURRENT: int = 1  # Python 3.12+ allows only one active cProfile per process
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+    # Live grocery updates: "memory" (single process) or "postgres" (LISTEN/NOTIFY, multi-worker)
+    EVENTS_BACKEND: str = "memory"
+
+    # Background jobs (persisted in the jobs table, run by an in-process worker pool)
+    JOBS_ENABLED: bool = True  # False = this process only enqueues, another one runs them
+    JOB_WORKERS: int = 2
+    JOB_POLL_SECONDS: float = 2.0  # How often to look for jobs enqueued by other processes
+    JOB_LEASE_SECONDS: int = 300  # A job running longer than this is assumed dead and retried
+    JOB_MAX_ATTEMPTS: int = 3
+
+    # Offline sync: the change log keeps each user's last this many writes; older cursors get the full state
+    CHANGE_LOG_KEEP_VERSIONS: int = 10_000
+
+    # Account import: largest body accepted, counted after gzip decompression (a tiny gzip can inflate to gigabytes)
+    IMPORT_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Idempotency-Key support on writes
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600  # How long a stored response can be replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # A first request that stops renewing its lock this long is assumed dead
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # How long a duplicate waits for the first to finish
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = 256 * 1024  # Larger responses are not stored
+
+    # Token-bucket rate limits on login / register (bcrypt makes them the most expensive endpoints)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "database" (shared by all workers)
+    RATE_LIMIT_IP_BURST: int = 20  # Per client IP and route
+    RATE_LIMIT_IP_PER_MINUTE: float = 20.0
+    RATE_LIMIT_USER_BURST: int = 5  # Per account (the email being logged into / registered) and route
+    RATE_LIMIT_USER_PER_MINUTE: float = 5.0
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # In-memory backend: least recently used buckets beyond this are dropped
 
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
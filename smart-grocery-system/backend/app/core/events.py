@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import select
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+POSTGRES_CHANNEL = "grocery_changes"
+
+
+class Subscription:
+    """
+    A listener for changes to one or more users' data (bound to the event loop it was created on).
+    Notifications are coalesced: a burst of writes wakes the listener once.
+    """
+    def __init__(self, keys: Iterable[str]):
+        self.keys = set(keys)
+        self.loop = asyncio.get_running_loop()
+        self.changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        await self.changed.wait()
+        self.changed.clear()
+
+
+class InProcessBroker:
+    """
+    Pub/sub for "this user's data changed" notifications inside one process.
+    publish() is safe to call from the threadpool (sync endpoints).
+    """
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, keys: Iterable[str]) -> Subscription:
+        sub = Subscription(str(k) for k in keys)
+        with self._lock:
+            for key in sub.keys:
+                self._subscribers.setdefault(key, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            for key in sub.keys:
+                subs = self._subscribers.get(key)
+                if subs:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subscribers[key]
+
+    def publish(self, key) -> None:
+        self._deliver(str(key))
+
+    def _deliver(self, key: str) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(key, ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.changed.set)
+            except RuntimeError:
+                # The subscriber's loop is gone (server shutting down)
+                pass
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Fans notifications out to every worker process through Postgres LISTEN/NOTIFY,
+    so it needs nothing beyond the database the app already uses.
+    """
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+        self._listener: Optional[threading.Thread] = None
+
+    def subscribe(self, keys: Iterable[str]) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe(keys)
+
+    def publish(self, key) -> None:
+        # Local subscribers are woken by our own NOTIFY coming back through the listener
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("SELECT pg_notify(%(channel)s, %(key)s)", {"channel": POSTGRES_CHANNEL, "key": str(key)})
+            conn.commit()
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="grocery-events", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            raw = None
+            try:
+                raw = self.engine.raw_connection()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {POSTGRES_CHANNEL}")
+                while True:
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._deliver(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.error(f"Event listener lost its connection, reconnecting: {e}")
+                threading.Event().wait(1)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.invalidate()
+                    except Exception:
+                        pass
+
+
+_broker = None
+
+def get_broker() -> InProcessBroker:
+    global _broker
+    if _broker is None:
+        if settings.EVENTS_BACKEND == "postgres":
+            from app.db.session import engine
+            _broker = PostgresBroker(engine)
+        else:
+            _broker = InProcessBroker()
+    return _broker
+
+def set_broker(broker: InProcessBroker) -> None:
+    """Plug in another backend (anything with subscribe / unsubscribe / publish)."""
+    global _broker
+    _broker = broker
+
+def publish_change(user_id) -> None:
+    """Tell live streams that this user's recipes, selections or inventory changed."""
+    try:
+        get_broker().publish(user_id)
+    except Exception as e:
+        # A missed notification only delays a live update; never fail the write for it
+        logger.error(f"Could not publish change for {user_id}: {e}")
+
+def household_event_key(household_id) -> str:
+    return f"household:{household_id}"
+
+def publish_household_change(household_id) -> None:
+    """Tell household streams that members joined or left (they re-read who to watch)."""
+    publish_change(household_event_key(household_id))
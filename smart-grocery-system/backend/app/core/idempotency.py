@@ -0,0 +1,324 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import token_subject
+from app.db.session import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+PURGE_EVERY_SECONDS = 600
+
+# Outcomes of trying to claim a key
+OWNER, DONE, IN_FLIGHT, RETRY = "owner", "done", "in_flight", "retry"
+
+
+def _lock_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+
+def _claim(user_id: UUID, key: str) -> Tuple[str, Optional[IdempotencyKey]]:
+    """
+    Inserts an in-flight row for (user, key). The primary key makes this the lock:
+    exactly one of several concurrent duplicates gets OWNER and runs the request.
+    The row's fingerprint is filled in when the request finishes (the body is hashed as it streams).
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        row = db.get(IdempotencyKey, (user_id, key))
+        if row is None:
+            db.add(IdempotencyKey(user_id=user_id, key=key, fingerprint="", expires_at=_lock_expiry()))
+            try:
+                db.commit()
+                return OWNER, None
+            except IntegrityError:
+                db.rollback()
+                return RETRY, None
+
+        if row.expires_at < now:
+            # An expired response, or a first request that stopped renewing its lock (died): take the key over
+            taken = db.query(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at == row.expires_at
+            ).update({
+                IdempotencyKey.fingerprint: "",
+                IdempotencyKey.status_code: None,
+                IdempotencyKey.content_type: None,
+                IdempotencyKey.body: None,
+                IdempotencyKey.expires_at: _lock_expiry(),
+            }, synchronize_session=False)
+            db.commit()
+            return (OWNER if taken else RETRY), None
+
+        if row.status_code is None:
+            return IN_FLIGHT, None
+        db.expunge(row)
+        return DONE, row
+    finally:
+        db.close()
+
+def _lookup(user_id: UUID, key: str) -> Optional[IdempotencyKey]:
+    """The key's row as it is now (for a duplicate waiting on the first request)."""
+    db = SessionLocal()
+    try:
+        row = db.get(IdempotencyKey, (user_id, key))
+        if row is not None:
+            db.expunge(row)
+        return row
+    finally:
+        db.close()
+
+def _extend(user_id: UUID, key: str) -> bool:
+    """Heartbeat of a running first request: pushes its lock timeout out again."""
+    db = SessionLocal()
+    try:
+        extended = db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None)
+        ).update({IdempotencyKey.expires_at: _lock_expiry()}, synchronize_session=False)
+        db.commit()
+        return bool(extended)
+    finally:
+        db.close()
+
+def _finish(user_id: UUID, key: str, fingerprint: Optional[str], status_code: int,
+            content_type: Optional[str], body: Optional[bytes]) -> None:
+    """
+    Stores the response for replays, or frees the key when a retry should run the request
+    again (retryable status, response too large to keep, or a body the app never read in full).
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        retryable = status_code >= 500 or status_code in (409, 429)
+        if retryable or fingerprint is None or body is None:
+            query.delete(synchronize_session=False)
+        else:
+            query.update({
+                IdempotencyKey.fingerprint: fingerprint,
+                IdempotencyKey.status_code: status_code,
+                IdempotencyKey.content_type: content_type,
+                IdempotencyKey.body: zlib.compress(body),
+                IdempotencyKey.expires_at: datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def _request_digest(scope):
+    """sha256 over method, path and query; the body is added as it is received."""
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b"")):
+        digest.update(part + b"\0")
+    return digest
+
+def _purge_expired() -> None:
+    db = SessionLocal()
+    try:
+        db.query(IdempotencyKey).filter(IdempotencyKey.expires_at < datetime.utcnow())\
+            .delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+class IdempotencyMiddleware:
+    """
+    Makes authenticated writes (POST / PUT / PATCH / DELETE) that carry an
+    "Idempotency-Key: <unique id>" header safe to retry:
+    - the first request runs and its response is stored (compressed) for
+      IDEMPOTENCY_TTL_SECONDS,
+    - a retry with the same key and the same body gets that response back without the
+      endpoint running again (marked "Idempotent-Replayed: true"),
+    - a duplicate arriving while the first is still running waits for it (up to
+      IDEMPOTENCY_WAIT_SECONDS, then 409 + Retry-After); if the first one fails
+      meanwhile, the duplicate gets 409 + Retry-After too, and its retry runs the request,
+    - the same key with a different request body is rejected with 422.
+    5xx, 409 and 429 responses are not stored, so retrying those runs the request again.
+    Keys are per user. Requests without the header are untouched.
+
+    Bodies are never buffered: the first request's body streams through to the endpoint
+    (an import can be any size) and is hashed on the way; a duplicate's is hashed and dropped.
+    While the first request runs it renews its lock every third of IDEMPOTENCY_LOCK_SECONDS,
+    so only a request that died (stopped renewing) can have its key taken over.
+    """
+    def __init__(self, app):
+        self.app = app
+        self._last_purge = 0.0
+        self._purge_lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        key = headers.get(IDEMPOTENCY_HEADER, b"").decode("latin-1").strip()
+        user_id = self._user_id(headers.get(b"authorization", b""))
+        if not key or user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        if len(key) > 255:
+            await self._send_json(send, 400, b'{"detail":"Idempotency-Key must be at most 255 characters"}')
+            return
+
+        await self._maybe_purge()
+
+        # --- Claim the key ---
+        for _ in range(6):
+            state, stored = await run_in_threadpool(_claim, user_id, key)
+            if state != RETRY:
+                break
+
+        if state == RETRY:
+            # Could not insert the key at all (e.g. the token's user no longer exists)
+            await self.app(scope, receive, send)
+            return
+        if state == OWNER:
+            # --- We own the key: run the request and record what it returned ---
+            await self._run(scope, receive, send, user_id, key)
+            return
+
+        # --- A retry or a duplicate: compare bodies, waiting for the first request if it still runs ---
+        fingerprint = await self._fingerprint(scope, receive)
+        if fingerprint is None:
+            return
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        delay = 0.05
+        while state == IN_FLIGHT and time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            stored = await run_in_threadpool(_lookup, user_id, key)
+            state = IN_FLIGHT if stored is not None and stored.status_code is None else DONE
+
+        if state == IN_FLIGHT:
+            await self._send_json(
+                send, 409, b'{"detail":"A request with this Idempotency-Key is still being processed"}',
+                extra_headers=[(b"retry-after", b"1")]
+            )
+        elif stored is None:
+            # The first request failed (nothing stored); this body was read, so it can't run here
+            await self._send_json(
+                send, 409, b'{"detail":"The first request with this Idempotency-Key failed; retry it"}',
+                extra_headers=[(b"retry-after", b"0")]
+            )
+        elif stored.fingerprint != fingerprint:
+            await self._send_json(send, 422, b'{"detail":"Idempotency-Key was already used for a different request"}')
+        else:
+            await self._replay(send, stored)
+
+    async def _fingerprint(self, scope, receive) -> Optional[str]:
+        """Reads the whole body into the hash without keeping it (None if the client went away)."""
+        digest = _request_digest(scope)
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            digest.update(message.get("body", b""))
+            more = message.get("more_body", False)
+        return digest.hexdigest()
+
+    async def _keep_lock(self, user_id: UUID, key: str) -> None:
+        while True:
+            await asyncio.sleep(settings.IDEMPOTENCY_LOCK_SECONDS / 3)
+            try:
+                await run_in_threadpool(_extend, user_id, key)
+            except Exception as e:
+                logger.error(f"Could not extend the lock of Idempotency-Key {key}: {e}")
+
+    async def _run(self, scope, receive, send, user_id: UUID, key: str) -> None:
+        digest = _request_digest(scope)
+        body_read = False
+        status_code = 500
+        content_type = None
+        chunks = []
+        size = 0
+
+        async def hashing_receive():
+            nonlocal body_read
+            message = await receive()
+            if message["type"] == "http.request":
+                digest.update(message.get("body", b""))
+                body_read = body_read or not message.get("more_body", False)
+            return message
+
+        async def capture(message):
+            nonlocal status_code, content_type, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body" and size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                chunks.append(chunk)
+            await send(message)
+
+        heartbeat = asyncio.create_task(self._keep_lock(user_id, key))
+        try:
+            await self.app(scope, hashing_receive, capture)
+        finally:
+            heartbeat.cancel()
+            body = b"".join(chunks) if size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES else None
+            try:
+                await run_in_threadpool(
+                    _finish, user_id, key, digest.hexdigest() if body_read else None, status_code, content_type, body
+                )
+            except Exception as e:
+                # The lock times out on its own (IDEMPOTENCY_LOCK_SECONDS, no longer renewed)
+                logger.error(f"Could not record the response for Idempotency-Key {key}: {e}")
+
+    async def _replay(self, send, stored: IdempotencyKey) -> None:
+        body = zlib.decompress(stored.body) if stored.body else b""
+        headers = [
+            (b"content-length", str(len(body)).encode()),
+            (b"idempotent-replayed", b"true"),
+        ]
+        if stored.content_type:
+            headers.append((b"content-type", stored.content_type.encode("latin-1")))
+        await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _send_json(self, send, status_code: int, body: bytes, extra_headers=()) -> None:
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status_code, "headers": headers + list(extra_headers)})
+        await send({"type": "http.response.body", "body": body})
+
+    def _user_id(self, authorization: bytes) -> Optional[UUID]:
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        subject = token_subject(token.strip())
+        try:
+            return UUID(subject) if subject else None
+        except ValueError:
+            return None
+
+    async def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        with self._purge_lock:
+            if now - self._last_purge < PURGE_EVERY_SECONDS:
+                return
+            self._last_purge = now
+        try:
+            await run_in_threadpool(_purge_expired)
+        except Exception as e:
+            logger.error(f"Could not purge expired idempotency keys: {e}")
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(db, user_id, params) returning a JSON-able result
+JobHandler = Callable[[Session, UUID, dict], Any]
+_handlers: Dict[str, JobHandler] = {}
+_admin_kinds = set()
+
+# Raised by a handler, these mean the job can never succeed (not allowed, bad params): no retry
+PERMANENT_ERRORS = (PermissionError, LookupError, ValueError, TypeError)
+
+def register_job(kind: str, admin_only: bool = False):
+    """Decorator: makes a function runnable as a background job of this kind."""
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        if admin_only:
+            _admin_kinds.add(kind)
+        return handler
+    return decorator
+
+def job_kinds():
+    return sorted(_handlers)
+
+def requires_admin(kind: str) -> bool:
+    """Only accounts in ADMIN_EMAILS may queue this kind (checked at enqueue time)."""
+    return kind in _admin_kinds
+
+def dedupe_key(params: Optional[dict]) -> str:
+    return hashlib.sha1(json.dumps(params or {}, sort_keys=True, default=str).encode()).hexdigest()
+
+def enqueue_job(db: Session, user_id: UUID, kind: str, params: Optional[dict] = None) -> Job:
+    """
+    Persists a job and commits. If the user already has an identical job waiting,
+    that one is returned instead of queueing the work twice.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    key = dedupe_key(params)
+
+    def identical(*statuses):
+        return db.query(Job).filter(
+            Job.user_id == user_id,
+            Job.kind == kind,
+            Job.dedupe_key == key,
+            Job.status.in_(statuses)
+        ).order_by(Job.created_at.desc()).first()
+
+    for _ in range(3):
+        job = identical(JobStatus.PENDING.value)
+        if job:
+            return job
+
+        job = Job(user_id=user_id, kind=kind, params=params or {}, dedupe_key=key, status=JobStatus.PENDING.value)
+        try:
+            with db.begin_nested():
+                db.add(job)
+            break
+        except IntegrityError:
+            # Lost the race to a concurrent identical request (unique pending index). The winner
+            # may already be RUNNING, which frees the index: look again, then insert again
+            job = None
+    else:
+        # Still losing: the newest identical job, whatever its state, stands for this request
+        job = identical(*(status.value for status in JobStatus))
+    db.commit()
+
+    get_job_runner().notify()
+    return job
+
+
+class JobRunner:
+    """
+    A bounded worker pool fed from the jobs table.
+
+    A dispatcher thread claims one job per free worker (oldest first; SKIP LOCKED on
+    Postgres, so several app processes can share the table) and marks it RUNNING with
+    a lease, which the worker renews while the handler runs. Failed jobs are retried until
+    JOB_MAX_ATTEMPTS (unless the error is permanent), and jobs whose worker died mid-run
+    are picked up again once their lease runs out - including after a restart.
+
+    A claim is identified by the job's attempt number: a worker only renews the lease and
+    records the outcome while the job is still RUNNING on its attempt, so a worker that
+    lost its lease (stalled past it) can't overwrite the run that took over.
+    """
+    def __init__(self, session_factory, workers: int, poll_seconds: float):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-worker")
+        self._slots = threading.BoundedSemaphore(workers)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+                self._dispatcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        # Running jobs finish; unclaimed ones stay PENDING for the next start
+        self._pool.shutdown(wait=True)
+
+    def notify(self) -> None:
+        """A job was enqueued: look now instead of at the next poll."""
+        if settings.JOBS_ENABLED:
+            self.start()
+            self._wake.set()
+
+    def _dispatch(self) -> None:
+        while not self._stop.is_set():
+            self._slots.acquire()
+            if self._stop.is_set():
+                break
+            try:
+                claimed = self._claim()
+            except Exception as e:
+                logger.error(f"Could not claim a job: {e}")
+                claimed = None
+
+            if claimed is None:
+                self._slots.release()
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+
+            try:
+                self._pool.submit(self._run, *claimed)
+            except RuntimeError:
+                # Pool shut down between the claim and the submit; the lease will expire
+                self._slots.release()
+
+    def _claim(self) -> Optional[Tuple[UUID, int]]:
+        """(job id, attempt) of the job this worker now holds the lease on."""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            query = db.query(Job).filter(or_(
+                Job.status == JobStatus.PENDING.value,
+                and_(Job.status == JobStatus.RUNNING.value, Job.locked_until < now)
+            )).order_by(Job.created_at).limit(1)
+            if db.get_bind().dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+
+            job = query.first()
+            if job is None:
+                return None
+
+            if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+                # Its workers keep dying (or it keeps failing); stop trying
+                job.status = JobStatus.FAILED.value
+                job.error = job.error or f"Gave up after {job.attempts} attempts"
+                job.finished_at = now
+                job.locked_until = None
+                db.commit()
+                return self._claim()
+
+            job.status = JobStatus.RUNNING.value
+            job.attempts += 1
+            job.started_at = now
+            job.locked_until = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+            db.commit()
+            return job.id, job.attempts
+        finally:
+            db.close()
+
+    @staticmethod
+    def _held(db: Session, job_id: UUID, attempt: int):
+        """The job, while it is still RUNNING on this worker's claim."""
+        return db.query(Job).filter(
+            Job.id == job_id, Job.status == JobStatus.RUNNING.value, Job.attempts == attempt
+        )
+
+    def _keep_lease(self, job_id: UUID, attempt: int, done: threading.Event) -> None:
+        """Renews the lease every third of JOB_LEASE_SECONDS until the handler returns."""
+        while not done.wait(settings.JOB_LEASE_SECONDS / 3):
+            db = self.session_factory()
+            try:
+                held = self._held(db, job_id, attempt).update({
+                    Job.locked_until: datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+                }, synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                logger.error(f"Could not renew the lease of job {job_id}: {e}")
+                continue
+            finally:
+                db.close()
+            if not held:
+                logger.warning(f"Job {job_id} lost its lease (attempt {attempt}); its outcome won't be recorded")
+                return
+
+    def _run(self, job_id: UUID, attempt: int) -> None:
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._keep_lease, args=(job_id, attempt, done), daemon=True)
+        db = self.session_factory()
+        try:
+            job = db.get(Job, job_id)
+            kind, user_id, params = job.kind, job.user_id, job.params or {}
+            # Don't sit in a transaction (holding a connection) while the handler runs
+            db.commit()
+            heartbeat.start()
+
+            handler = _handlers.get(kind)
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for job kind {kind}")
+                result = handler(db, user_id, params)
+                outcome = {Job.result: jsonable_encoder(result), Job.status: JobStatus.SUCCEEDED.value,
+                           Job.error: None, Job.finished_at: datetime.utcnow()}
+            except Exception as e:
+                logger.exception(f"Job {job_id} ({kind}) failed")
+                db.rollback()
+                retry = not isinstance(e, PERMANENT_ERRORS) and attempt < settings.JOB_MAX_ATTEMPTS
+                outcome = {Job.error: str(e) or e.__class__.__name__,
+                           Job.status: JobStatus.PENDING.value if retry else JobStatus.FAILED.value,
+                           Job.finished_at: None if retry else datetime.utcnow()}
+            done.set()
+            heartbeat.join()
+
+            try:
+                held = self._held(db, job_id, attempt).update({**outcome, Job.locked_until: None}, synchronize_session=False)
+                db.commit()
+            except IntegrityError:
+                # Going back to PENDING clashed with an identical job queued meanwhile; let that one run
+                db.rollback()
+                held = self._held(db, job_id, attempt).update({
+                    Job.status: JobStatus.FAILED.value, Job.finished_at: datetime.utcnow(), Job.locked_until: None
+                }, synchronize_session=False)
+                db.commit()
+            if not held:
+                logger.warning(f"Job {job_id} finished after losing its lease (attempt {attempt}); outcome dropped")
+        except Exception as e:
+            logger.error(f"Could not record the outcome of job {job_id}: {e}")
+        finally:
+            done.set()
+            db.close()
+            self._slots.release()
+            self._wake.set()
+
+
+_runner: Optional[JobRunner] = None
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    if _runner is None:
+        from app.db.session import SessionLocal
+        _runner = JobRunner(SessionLocal, settings.JOB_WORKERS, settings.JOB_POLL_SECONDS)
+    return _runner
+
+def stop_job_runner() -> None:
+    """Shutdown: let running jobs finish; the next get_job_runner() starts a fresh pool."""
+    global _runner
+    if _runner is not None:
+        _runner.stop()
+        _runner = None
@@ -0,0 +1,135 @@
+import cProfile
+import functools
+import hmac
+import inspect
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+# The profiler for the current request (None when the request is not being profiled).
+# ContextVars are copied into the threadpool, so sync endpoints see it too.
+_current_profile: ContextVar[Optional[cProfile.Profile]] = ContextVar("_current_profile", default=None)
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute that runs the endpoint under the request's cProfile (if any).
+    The profiler has to be enabled inside the endpoint call itself because
+    sync endpoints run in a worker thread, not in the middleware's thread.
+    """
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _wrap_endpoint(endpoint), **kwargs)
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+    """
+    Starts the profiler, or returns False when another one is already active: from Python 3.12
+    cProfile runs on sys.monitoring, which allows one profiler per process. The request then
+    runs unprofiled instead of failing.
+    """
+    try:
+        profile.enable()
+        return True
+    except ValueError as e:
+        logger.warning(f"Request not profiled: {e}")
+        return False
+
+def _wrap_endpoint(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None or not _enable(profile):
+                return await endpoint(*args, **kwargs)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profile.disable()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None or not _enable(profile):
+            return endpoint(*args, **kwargs)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile.disable()
+    return wrapper
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when it carries a valid "X-Profile: <admin token>" header,
+    or when it is picked by PROFILING_SAMPLE_RATE. The result is written as a
+    pstats file (open with `python -m pstats` or snakeviz) named after the route
+    and the request duration. At most PROFILING_MAX_CONCURRENT profiles run at once
+    (always 1 on Python 3.12+); extra candidates are simply served unprofiled.
+    """
+    def __init__(self, app):
+        self.app = app
+        max_concurrent = settings.PROFILING_MAX_CONCURRENT
+        if sys.version_info >= (3, 12):
+            max_concurrent = 1  # One active profiler per process (sys.monitoring)
+        self.slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        os.makedirs(settings.PROFILING_OUTPUT_DIR, exist_ok=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self.slots.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = cProfile.Profile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _current_profile.reset(token)
+            try:
+                self._dump(profile, scope, elapsed_ms)
+            finally:
+                self.slots.release()
+
+    def _should_profile(self, scope) -> bool:
+        admin_token = settings.PROFILING_ADMIN_TOKEN
+        if admin_token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value.decode("latin-1"), admin_token)
+        return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+    def _dump(self, profile: cProfile.Profile, scope, elapsed_ms: float) -> None:
+        # Tag with the route template ("/api/v1/recipes/{recipe_id}"), not the raw ids
+        path = scope["path"]
+        for name, value in scope.get("path_params", {}).items():
+            path = path.replace(str(value), "{" + name + "}")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        filename = f"{stamp}_{scope['method']}_{slug}_{elapsed_ms:.0f}ms.prof"
+        filepath = os.path.join(settings.PROFILING_OUTPUT_DIR, filename)
+        try:
+            profile.dump_stats(filepath)
+            logger.info(f"Profiled {scope['method']} {path} in {elapsed_ms:.1f}ms -> {filepath}")
+        except Exception as e:
+            logger.error(f"Error writing profile {filepath}: {e}")
@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy import case, delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PURGE_EVERY_SECONDS = 600
+
+
+class Limit:
+    """A token bucket: `burst` requests at once, refilling at `per_minute`."""
+    def __init__(self, burst: int, per_minute: float):
+        self.burst = float(burst)
+        self.rate = per_minute / 60.0  # tokens per second
+
+    @property
+    def refill_seconds(self) -> float:
+        """After this long without requests the bucket is full again, i.e. the same as no bucket."""
+        return self.burst / self.rate if self.rate > 0 else float("inf")
+
+
+class InMemoryBuckets:
+    """
+    Token buckets for one process. Each key costs one (tokens, timestamp) tuple;
+    buckets that have refilled completely are evicted, and at most RATE_LIMIT_MAX_KEYS are kept.
+    """
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self._max_idle = 0.0
+
+    def take(self, key: str, limit: Limit) -> float:
+        """Takes a token; returns 0 if allowed, otherwise the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            self._max_idle = max(self._max_idle, limit.refill_seconds)
+            tokens, last = self._buckets.pop(key, (limit.burst, now))
+            tokens = min(limit.burst, tokens + (now - last) * limit.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / limit.rate if limit.rate > 0 else float("inf")
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+        return wait
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < self._max_idle and len(self._buckets) <= self.max_keys:
+                break
+            del self._buckets[key]
+
+
+class DatabaseBuckets:
+    """
+    Token buckets in the rate_limit_buckets table, shared by every worker process.
+    Refill and take happen in one upsert, so concurrent workers can't both spend the last token.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self._dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+        self._last_purge = 0.0
+        self._max_idle = 0.0
+
+    def take(self, key: str, limit: Limit) -> float:
+        from app.models.rate_limit_bucket import RateLimitBucket as Bucket
+
+        now = time.time()
+        self._max_idle = max(self._max_idle, limit.refill_seconds)
+        refilled = Bucket.tokens + (now - Bucket.updated) * limit.rate
+        refilled = case((refilled > limit.burst, limit.burst), else_=refilled)
+
+        insert = self._dialect.insert(Bucket).values(key=key, tokens=limit.burst - 1, updated=now)
+        statement = insert.on_conflict_do_update(
+            index_elements=[Bucket.key],
+            set_={"tokens": refilled - 1, "updated": now},
+            where=refilled >= 1
+        ).returning(Bucket.tokens)
+
+        with self.engine.begin() as conn:
+            allowed = conn.execute(statement).first() is not None
+            if allowed:
+                wait = 0.0
+            else:
+                tokens, updated = conn.execute(
+                    Bucket.__table__.select().with_only_columns(Bucket.tokens, Bucket.updated)
+                    .where(Bucket.key == key)
+                ).one()
+                missing = 1 - min(limit.burst, tokens + (now - updated) * limit.rate)
+                wait = missing / limit.rate if limit.rate > 0 else float("inf")
+            if now - self._last_purge > PURGE_EVERY_SECONDS:
+                self._last_purge = now
+                conn.execute(delete(Bucket).where(Bucket.updated < now - self._max_idle))
+        return wait
+
+
+_buckets = None
+
+def get_buckets():
+    global _buckets
+    if _buckets is None:
+        if settings.RATE_LIMIT_BACKEND == "database":
+            from app.db.session import engine
+            _buckets = DatabaseBuckets(engine)
+        else:
+            _buckets = InMemoryBuckets(settings.RATE_LIMIT_MAX_KEYS)
+    return _buckets
+
+def set_buckets(buckets) -> None:
+    """Plug in another backend (anything with take(key, limit) -> seconds to wait)."""
+    global _buckets
+    _buckets = buckets
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+    return request.client.host if request.client else "unknown"
+
+def enforce_rate_limit(request: Request, route: str, user: Optional[str] = None) -> None:
+    """
+    Spends a token from the client IP's bucket for this route, and from the user's
+    (e.g. the email being logged into) if given. 429 + Retry-After when either is empty.
+    Call it before doing anything expensive.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    checks = [(f"{route}:ip:{client_ip(request)}", Limit(settings.RATE_LIMIT_IP_BURST, settings.RATE_LIMIT_IP_PER_MINUTE))]
+    if user:
+        # Hashed: keeps keys short and emails out of the buckets table
+        digest = hashlib.sha1(user.strip().lower().encode()).hexdigest()
+        checks.append((f"{route}:user:{digest}", Limit(settings.RATE_LIMIT_USER_BURST, settings.RATE_LIMIT_USER_PER_MINUTE)))
+
+    for key, limit in checks:
+        try:
+            wait = get_buckets().take(key, limit)
+        except Exception as e:
+            # Fail open: a broken limiter must not lock everyone out
+            logger.error(f"Rate limiter unavailable: {e}")
+            return
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(max(1, int(wait + 0.999)))}
+            )
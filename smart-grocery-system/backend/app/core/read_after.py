@@ -0,0 +1,54 @@
+from contextvars import ContextVar
+from typing import Optional
+from app.core import security
+
+# Response header with the signed marker after a write; clients send it back on their next requests
+READ_AFTER_HEADER = "X-Read-After"
+
+# {"user_id": ..., "version": ...} of the current request's write (None outside ReadAfterMiddleware).
+# The dict is shared with the threadpool copy of the context, so sync endpoints can fill it in.
+_current_write: ContextVar[Optional[dict]] = ContextVar("_current_write", default=None)
+
+def note_write(user_id, data_version: int) -> None:
+    """Called by bump_data_version: the response to this request should carry a marker."""
+    write = _current_write.get()
+    if write is not None:
+        write["user_id"], write["version"] = user_id, data_version
+
+def required_version(marker: Optional[str], user_id: Optional[str]) -> Optional[int]:
+    """The data version a replica needs before it may serve this user (None: any replica will do)."""
+    if not marker or not user_id:
+        return None
+    return security.read_after_version(marker, user_id)
+
+
+class ReadAfterMiddleware:
+    """
+    Read-your-writes across workers: a successful write's response carries
+    "X-Read-After: <signed data version>". When the client sends it back, any worker
+    serving a read checks that its replica has replayed that version, and reads from
+    the primary if not (see get_read_db). Only installed when there are replicas.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        write: dict = {}
+        token = _current_write.set(write)
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and write and message["status"] < 400:
+                marker = security.read_after_marker(write["user_id"], write["version"])
+                message["headers"] = list(message.get("headers", [])) + [
+                    (READ_AFTER_HEADER.lower().encode(), marker.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            _current_write.reset(token)
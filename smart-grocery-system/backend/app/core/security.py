@@ -1,6 +1,9 @@
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Any, Union
-from jose import jwt
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
 
@@ -24,4 +27,38 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+def token_subject(token: str) -> Optional[str]:
+    """The user id in a valid, unexpired token (None otherwise). No database lookup."""
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+def _read_after_mac(user_id: Any, payload: str) -> str:
+    message = f"{user_id}.{payload}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+def read_after_marker(user_id: Any, data_version: int) -> str:
+    """
+    "<data version>.<expiry>.<signature>", sent to the client after a write and sent back on reads,
+    so whichever worker serves the read can tell whether its replica has that write yet.
+    """
+    payload = f"{data_version}.{int(time.time() + settings.REPLICA_STICKY_SECONDS)}"
+    return f"{payload}.{_read_after_mac(user_id, payload)}"
+
+def read_after_version(marker: Optional[str], user_id: Any) -> Optional[int]:
+    """The data version in the user's valid, unexpired marker (None otherwise)."""
+    try:
+        version, expires, mac = (marker or "").split(".")
+        if not hmac.compare_digest(mac, _read_after_mac(user_id, f"{version}.{expires}")):
+            return None
+        return int(version) if int(expires) >= time.time() else None
+    except ValueError:
+        return None
+
+def is_admin(email: Optional[str]) -> bool:
+    """The account may curate the shared ingredient catalog (settings.ADMIN_EMAILS)."""
+    admins = {e.strip().lower() for e in settings.ADMIN_EMAILS.split(",") if e.strip()}
+    return bool(email) and email.lower() in admins
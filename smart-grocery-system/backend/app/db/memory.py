@@ -0,0 +1,45 @@
+"""
+The whole schema in an in-memory SQLite database, for endpoint tests and benchmarks
+that need a fresh database in milliseconds instead of a PostgreSQL server:
+
+    DATABASE_URL=sqlite:// python load_test.py --duration 5
+
+The tests (tests/conftest.py) set DATABASE_URL=sqlite:// before importing the app
+and call reset_database() before each test; with TEST_DATABASE_URL they run against
+PostgreSQL at `alembic upgrade head` instead.
+"""
+import importlib
+import pkgutil
+from app.db.base import Base
+from app.db.session import engine, is_memory_database
+from app.core.config import settings
+import app.models
+
+def import_models() -> None:
+    """Every model module, so Base.metadata holds every table."""
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+
+def create_schema() -> None:
+    """Creates every table from the models, without alembic (the search table is created on first write)."""
+    import_models()
+    Base.metadata.create_all(engine)
+
+def reset_database() -> None:
+    """Drops and recreates the in-memory schema, and forgets what was cached from the old rows."""
+    if not is_memory_database(settings.DATABASE_URL):
+        raise RuntimeError("reset_database() only runs against an in-memory database (DATABASE_URL=sqlite://)")
+    import_models()
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE IF EXISTS recipes_fts")
+    Base.metadata.create_all(engine)
+    forget_cached_rows()
+
+def forget_cached_rows() -> None:
+    """Drops the in-process indexes and rate limit buckets, which would outlive the rows they were built from."""
+    from app.core import rate_limit
+    from app.utils import ingredient_matching, price_index
+    ingredient_matching._index = None
+    price_index._index = None
+    rate_limit.set_buckets(None)
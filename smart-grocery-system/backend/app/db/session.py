@@ -1,18 +1,89 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+def is_memory_database(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:")
 
 # Create engine
-# pool_pre_ping=True handles checking if the connection is alive before using it
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+if is_memory_database(settings.DATABASE_URL):
+    # In-memory SQLite (tests, benchmarks, see app/db/memory.py): the database lives in one
+    # connection, so the pool holds exactly that one and sessions take turns with it
+    # (a second connection would be a second, empty database)
+    engine = create_engine(
+        settings.DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=QueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=60
+    )
+else:
+    # pool_pre_ping=True handles checking if the connection is alive before using it
+    engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Read replicas (optional): read-only endpoints are spread over these ---
+replica_engines = [
+    create_engine(url.strip(), pool_pre_ping=True)
+    for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+ReplicaSessionLocals = [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in replica_engines]
+_replica_turn = itertools.count()
+
+# user id -> until when (time.monotonic) their reads stay on the primary
+_sticky_until: Dict[str, float] = {}
+_sticky_lock = threading.Lock()
+
+def stick_to_primary(user_id) -> None:
+    """
+    Read-your-writes within this process: after a user writes, their reads go to the primary
+    for REPLICA_STICKY_SECONDS. Across workers, the client's X-Read-After marker does it
+    (see read_session's min_version).
+    """
+    if not replica_engines:
+        return
+    now = time.monotonic()
+    with _sticky_lock:
+        _sticky_until[str(user_id)] = now + settings.REPLICA_STICKY_SECONDS
+        if len(_sticky_until) > 10000:
+            for key, until in list(_sticky_until.items()):
+                if until < now:
+                    del _sticky_until[key]
+
+def read_session(user_id: Optional[str] = None, min_version: Optional[int] = None) -> Session:
+    """
+    A session for read-only work: on the next replica (round robin), or on the primary
+    when there are no replicas, the user wrote recently through this process, the replica
+    hasn't replayed the user's data_version min_version yet, or it is unreachable.
+    """
+    if ReplicaSessionLocals and time.monotonic() >= _sticky_until.get(str(user_id), 0.0):
+        db = ReplicaSessionLocals[next(_replica_turn) % len(ReplicaSessionLocals)]()
+        try:
+            if min_version is None or user_id is None:
+                db.connection()
+                return db
+            replica_version = db.execute(select(User.data_version).where(User.id == user_id)).scalar()
+            if replica_version is not None and replica_version >= min_version:
+                return db
+            db.close()
+        except OperationalError as e:
+            db.close()
+            logger.warning(f"Read replica unavailable, using the primary: {e}")
+    return SessionLocal()
+
 # Dependency for API endpoints
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
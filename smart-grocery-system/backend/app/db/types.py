@@ -0,0 +1,21 @@
+import uuid
+from sqlalchemy import Uuid
+from sqlalchemy.types import TypeDecorator
+
+class UUID(TypeDecorator):
+    """
+    A UUID column that works on every database the app runs on: native UUID on
+    PostgreSQL, 32 hex characters on SQLite. Binds uuid.UUID or its string form,
+    so ids straight from a path or JSON body can be compared on either.
+    """
+    impl = Uuid
+    cache_ok = True
+
+    def __init__(self, as_uuid: bool = True):
+        # Same signature as postgresql.UUID; values always come back as uuid.UUID
+        super().__init__(as_uuid=True)
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
@@ -1,10 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.config import settings
 from app.api.endpoints import auth
 from fastapi.middleware.cors import CORSMiddleware  # <--- Import this
 from app.api.endpoints import auth, recipes, ingredients, inventory, grocery # <--- Import grocery
-app = FastAPI(title=settings.PROJECT_NAME)
+from app.api.endpoints import meal_plans, friends, households, sync, jobs, export
+from app.core.jobs import get_job_runner, stop_job_runner
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.read_after import READ_AFTER_HEADER, ReadAfterMiddleware
+from app.db.memory import create_schema
+from app.db.session import is_memory_database
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # An in-memory database (DATABASE_URL=sqlite://) starts empty: build the schema from the models
+    if is_memory_database(settings.DATABASE_URL):
+        create_schema()
+    # Start the background job workers (picks up jobs left over from the last run)
+    if settings.JOBS_ENABLED:
+        get_job_runner().start()
+    yield
+    stop_job_runner()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+
+# --- IDEMPOTENCY-KEY SUPPORT ON WRITES ---
+# Added before CORS so replayed responses still get the CORS headers
+app.add_middleware(IdempotencyMiddleware)
+
+# --- READ-YOUR-WRITES ACROSS WORKERS (only with read replicas) ---
+if settings.DATABASE_REPLICA_URLS.strip():
+    app.add_middleware(ReadAfterMiddleware)
 
 # --- ADD CORS MIDDLEWARE ---
 origins = [
@@ -18,8 +46,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Idempotent-Replayed", "Retry-After", READ_AFTER_HEADER],
 )
 
+# --- OPT-IN REQUEST PROFILING ---
+# Only installed when enabled, so it costs nothing in normal operation
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Include the Auth Router
 # We prefix with /api/v1/auth to match your specs
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
@@ -32,6 +66,18 @@ app.include_router(ingredients.router, prefix="/api/v1/ingredients", tags=["ingr
 app.include_router(inventory.router, prefix="/api/v1/inventory", tags=["inventory"]) # <--- Add this
 # --- 5. Include the grocery router ---
 app.include_router(grocery.router, prefix="/api/v1/grocery", tags=["grocery"]) # <--- Add router
+# --- 6. Include the meal plan router ---
+app.include_router(meal_plans.router, prefix="/api/v1/meal-plans", tags=["meal-plans"])
+# --- 7. Include the friends router ---
+app.include_router(friends.router, prefix="/api/v1/friends", tags=["friends"])
+# --- 8. Include the households router ---
+app.include_router(households.router, prefix="/api/v1/households", tags=["households"])
+# --- 9. Include the offline sync router ---
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["sync"])
+# --- 10. Include the background jobs router ---
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["jobs"])
+# --- 11. Include the export / import router ---
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
 
 @app.get("/")
 def root():
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, BigInteger
+
+from app.db.base import Base
+
+class CatalogVersion(Base):
+    """
+    A single row (id 1) counting writes to the ingredient catalog: ingredients and aliases
+    added, merged or removed. Every process compares it with the version its in-memory
+    name index was built from (app/utils/ingredient_matching.py).
+    """
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
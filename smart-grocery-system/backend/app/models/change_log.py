@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Index
+from app.db.types import UUID
+
+from app.db.base import Base
+
+class ChangeLog(Base):
+    """
+    One row per recipe, recipe ingredient or inventory item touched by a write, stamped
+    with the data_version that write gave the user. Writes to one user are serialized by
+    the data_version row lock, so "version > cursor" never skips a late commit.
+    """
+    __tablename__ = "change_log"
+    # GET /sync scans (user, version > cursor)
+    __table_args__ = (
+        Index("ix_change_log_user_id_version", "user_id", "version"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    version = Column(BigInteger, nullable=False)
+    entity = Column(String(32), nullable=False)  # "recipe", "recipe_ingredient" or "inventory"
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from app.db.types import UUID
 from datetime import datetime
 import enum
 
@@ -12,6 +12,13 @@ class FriendshipStatus(str, enum.Enum):
 
 class Friendship(Base):
     __tablename__ = "friendships"
+    # Friend lookups run from both sides ("my requests" / "requests to me"), filtered by status.
+    # The migration also adds a LEAST/GREATEST unique index so A->B and B->A can't both exist.
+    __table_args__ = (
+        UniqueConstraint("requester_id", "addressee_id", name="uq_friendships_requester_addressee"),
+        Index("ix_friendships_requester_id_status", "requester_id", "status"),
+        Index("ix_friendships_addressee_id_status", "addressee_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     requester_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
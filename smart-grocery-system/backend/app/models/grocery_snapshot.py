@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, Float, Integer, String, LargeBinary, DateTime, ForeignKey, Index
+from app.db.types import UUID
+
+from app.db.base import Base
+
+class GrocerySnapshot(Base):
+    """
+    A grocery list frozen at one point in time. The lines are packed into `payload`
+    (see app/utils/grocery_snapshot.py): a typical weekly list is a few hundred bytes.
+    """
+    __tablename__ = "grocery_snapshots"
+    # "My snapshots", newest first (keyset pages on created_at, id)
+    __table_args__ = (
+        Index("ix_grocery_snapshots_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    label = Column(String(100), nullable=True)  # e.g. "Saturday trip"
+    version = Column(String(16), nullable=False)  # Content hash: equal lists, equal versions
+    item_count = Column(Integer, nullable=False)
+    servings_multiplier = Column(Float, nullable=False, default=1.0, server_default="1")  # What the list was made for
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed, see pack_grocery_list
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from app.db.types import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+class Household(Base):
+    __tablename__ = "households"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    members = relationship("HouseholdMember", back_populates="household", cascade="all, delete-orphan")
+
+class HouseholdMember(Base):
+    __tablename__ = "household_members"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    household_id = Column(UUID(as_uuid=True), ForeignKey("households.id"), nullable=False, index=True)
+    # A user shops with at most one household
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True, index=True)
+    joined_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    household = relationship("Household", back_populates="members")
+    user = relationship("User")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, SmallInteger, LargeBinary, DateTime, ForeignKey, Index
+from app.db.types import UUID
+
+from app.db.base import Base
+
+class IdempotencyKey(Base):
+    """
+    The outcome of a write sent with an Idempotency-Key header (see app/core/idempotency.py).
+    While the first request runs, status_code is NULL, fingerprint is empty and expires_at is
+    its lock timeout (renewed while it runs); afterwards it holds the fingerprint and the
+    compressed response until expires_at (the TTL).
+    """
+    __tablename__ = "idempotency_keys"
+    # TTL cleanup
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of method, path and body
+    status_code = Column(SmallInteger, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    body = Column(LargeBinary, nullable=True)  # zlib-compressed
+    expires_at = Column(DateTime, nullable=False)
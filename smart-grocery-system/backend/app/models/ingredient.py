@@ -1,6 +1,6 @@
 import uuid
 from sqlalchemy import Column, String
-from sqlalchemy.dialects.postgresql import UUID
+from app.db.types import UUID
 from app.db.base import Base
 
 class Ingredient(Base):
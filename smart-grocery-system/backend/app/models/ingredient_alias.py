@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from app.db.types import UUID
+from app.db.base import Base
+
+class IngredientAlias(Base):
+    """
+    Another name for a catalog ingredient ("green onion" -> Scallions). `key` is the
+    normalized name (app/utils/ingredient_matching.py), so each spelling maps to one ingredient.
+    """
+    __tablename__ = "ingredient_aliases"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    ingredient_id = Column(UUID(as_uuid=True), ForeignKey("ingredients.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)  # As entered
+    key = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
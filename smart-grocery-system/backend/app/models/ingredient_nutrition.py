@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from app.db.types import UUID
+from app.db.base import Base
+
+class IngredientNutrition(Base):
+    """
+    Nutrients in `per_quantity` `unit` of an ingredient (e.g. per 100 g).
+    Loaded as a matrix by app/utils/nutrition_logic.py.
+    """
+    __tablename__ = "ingredient_nutrition"
+
+    ingredient_id = Column(UUID(as_uuid=True), ForeignKey("ingredients.id"), primary_key=True)
+    per_quantity = Column(Float, nullable=False, default=1.0)
+    unit = Column(String, nullable=True)  # None = per piece
+    calories = Column(Float, nullable=False, default=0.0)  # kcal
+    protein = Column(Float, nullable=False, default=0.0)  # grams
+    carbs = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    fiber = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, UniqueConstraint, Index
+from app.db.types import UUID
+from app.db.base import Base
+
+class IngredientPrice(Base):
+    """
+    What an ingredient costs per one `unit` (e.g. 2.49 per kg), at a store or, with store "",
+    as a typical price anywhere. Read through the in-memory index in app/utils/price_index.py.
+    """
+    __tablename__ = "ingredient_prices"
+    __table_args__ = (
+        UniqueConstraint("ingredient_id", "store", name="uq_ingredient_prices_ingredient_store"),
+        # The index's version check: max(updated_at)
+        Index("ix_ingredient_prices_updated_at", "updated_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    ingredient_id = Column(UUID(as_uuid=True), ForeignKey("ingredients.id"), nullable=False)
+    store = Column(String(100), nullable=False, default="", server_default="")
+    unit = Column(String, nullable=True)  # None = per piece
+    price = Column(Numeric(12, 4), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
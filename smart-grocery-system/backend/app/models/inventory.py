@@ -1,11 +1,16 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
+from app.db.types import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Inventory(Base):
     __tablename__ = "inventory"
+    # One item per ingredient per user: adding an ingredient again updates the existing item
+    __table_args__ = (
+        UniqueConstraint("user_id", "ingredient_id", name="uq_inventory_user_id_ingredient_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -13,6 +18,9 @@ class Inventory(Base):
     
     quantity = Column(String, nullable=False, default="0")
     unit = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    # Optimistic concurrency: bumped by every write, checked by updates that send it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     user = relationship("User", back_populates="inventory")
@@ -0,0 +1,43 @@
+import uuid
+import enum
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON, text
+from app.db.types import UUID
+
+from app.db.base import Base
+
+class JobStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+class Job(Base):
+    """A unit of background work (see app/core/jobs.py). Persisted so it survives restarts."""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers claim the oldest runnable job
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        # "My jobs" listing
+        Index("ix_jobs_user_id_created_at", "user_id", "created_at"),
+        # At most one identical pending job per user; enqueueing it again returns the existing one
+        Index(
+            "uq_jobs_pending_dedupe", "user_id", "kind", "dedupe_key", unique=True,
+            postgresql_where=text("status = 'PENDING'"), sqlite_where=text("status = 'PENDING'")
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    kind = Column(String(64), nullable=False)
+    params = Column(JSON, nullable=True)
+    dedupe_key = Column(String(40), nullable=False)  # sha1 of the params
+    status = Column(String(16), default=JobStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # A RUNNING job whose lease ran out (its worker died) is picked up again
+    locked_until = Column(DateTime, nullable=True)
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, Index
+from app.db.types import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+class MealPlanEntry(Base):
+    __tablename__ = "meal_plan_entries"
+    # Grocery lists are computed over (user, date range), so keep that scan on an index
+    __table_args__ = (
+        Index("ix_meal_plan_entries_user_id_planned_date", "user_id", "planned_date"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    recipe_id = Column(UUID(as_uuid=True), ForeignKey("recipes.id"), nullable=False)
+    planned_date = Column(Date, nullable=False)
+    servings = Column(Integer, nullable=True)  # None = cook the recipe's own servings
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    recipe = relationship("Recipe")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Float, Index
+
+from app.db.base import Base
+
+class RateLimitBucket(Base):
+    """
+    A token bucket shared by all worker processes (RATE_LIMIT_BACKEND=database,
+    see app/core/rate_limit.py). Times are epoch seconds so the refill is plain arithmetic on any database.
+    """
+    __tablename__ = "rate_limit_buckets"
+    # Idle cleanup
+    __table_args__ = (
+        Index("ix_rate_limit_buckets_updated", "updated"),
+    )
+
+    key = Column(String(100), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated = Column(Float, nullable=False)
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, DateTime, Index, text
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app.db.types import UUID
 import uuid
+from datetime import datetime
 
 from app.db.base import Base
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    # A user's recipes (owner, newest first) and full-text search; the friends feed index is below the class
+    __table_args__ = (
+        Index("ix_recipes_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_recipes_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -14,15 +21,30 @@ class Recipe(Base):
     instructions = Column(Text, nullable=True)
     servings = Column(Integer, nullable=True)
     is_selected = Column(Boolean, default=False)
+    target_servings = Column(Integer, nullable=True)  # Servings to shop for while selected (None = recipe servings)
     
     # --- NEW COLUMN ---
     is_shared_to_friends = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    # Optimistic concurrency: bumped by every edit of the content (title, instructions, servings,
+    # ingredients). Selecting / sharing are single-field toggles and don't count as edits.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Full-text search over title, ingredient names and instructions (see utils/search_logic.py).
+    # Deferred so normal recipe queries don't load it; SQLite uses an FTS5 table instead.
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
     # ------------------
 
     # Relationships
     user = relationship("User", back_populates="recipes")
     ingredients = relationship("RecipeIngredient", back_populates="recipe", cascade="all, delete-orphan")
-    
+
+# Friends feed keyset scan: only shared recipes, newest first across every owner
+Index(
+    "ix_recipes_shared_created_at_id", Recipe.created_at.desc(), Recipe.id.desc(),
+    postgresql_where=text("is_shared_to_friends"), sqlite_where=text("is_shared_to_friends")
+)
+
 class RecipeIngredient(Base):
     __tablename__ = "recipe_ingredients"
 
@@ -31,6 +53,7 @@ class RecipeIngredient(Base):
     ingredient_id = Column(UUID(as_uuid=True), ForeignKey("ingredients.id"), nullable=False)
     quantity = Column(String, nullable=False)
     unit = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     recipe = relationship("Recipe", back_populates="ingredients")
     ingredient = relationship("Ingredient")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, BigInteger
+from app.db.types import UUID
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -14,6 +14,8 @@ class User(Base):
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every write to the user's recipes / inventory; used as the ETag of their GETs
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
     recipes = relationship("Recipe", back_populates="user", cascade="all, delete-orphan")
     inventory = relationship("Inventory", back_populates="user", cascade="all, delete-orphan")
     # Relationships (We will uncomment these later when we create the other models)
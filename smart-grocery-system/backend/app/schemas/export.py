@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+# --- Records of the NDJSON export (GET /export, POST /import) ---
+
+class ExportHeader(BaseModel):
+    type: str = "header"
+    format: str
+    version: int
+
+class ExportIngredientLine(BaseModel):
+    name: str = Field(..., min_length=1)
+    aisle: Optional[str] = None  # Used when the ingredient has to be created
+    quantity: str
+    unit: Optional[str] = None
+
+class ExportRecipe(BaseModel):
+    type: str = "recipe"
+    id: Optional[UUID] = None  # Kept on import when free, so importing a file twice doesn't duplicate
+    title: str = Field(..., min_length=1)
+    instructions: Optional[str] = None
+    servings: Optional[int] = None
+    is_selected: bool = False
+    target_servings: Optional[int] = Field(default=None, gt=0)
+    is_shared_to_friends: bool = False
+    ingredients: List[ExportIngredientLine] = Field(default=[], max_length=500)
+
+class ExportInventoryItem(BaseModel):
+    type: str = "inventory"
+    name: str = Field(..., min_length=1)
+    aisle: Optional[str] = None
+    quantity: str
+    unit: Optional[str] = None
+
+class ExportEnd(BaseModel):
+    type: str = "end"
+    recipes: int
+    inventory: int
+
+class ImportSummary(BaseModel):
+    recipes: int = 0  # Created
+    skipped_recipes: int = 0  # Already in your collection (same id)
+    inventory: int = 0  # Items created or overwritten
+    ingredients_created: int = 0  # Names the catalog didn't have yet
@@ -24,4 +24,11 @@ class FriendshipResponse(FriendshipBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Schema for one accepted friend (from the current user's point of view)
+class FriendResponse(BaseModel):
+    friendship_id: int
+    user_id: UUID
+    email: str
+    since: datetime
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class GrocerySnapshotCreate(BaseModel):
+    label: Optional[str] = Field(default=None, max_length=100)
+    servings_multiplier: float = Field(default=1.0, gt=0)
+
+class GrocerySnapshotSummary(BaseModel):
+    id: UUID
+    label: Optional[str] = None
+    version: str
+    item_count: int
+    servings_multiplier: float = 1.0
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class GrocerySnapshotPage(BaseModel):
+    items: List[GrocerySnapshotSummary]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to get the next page
+
+class GrocerySnapshotResponse(GrocerySnapshotSummary):
+    items: Dict[str, List[dict]]  # Aisle -> lines, as the grocery list was
+
+class GrocerySnapshotDiff(BaseModel):
+    base: str  # Snapshot id
+    target: str  # Snapshot id, or "current" for the live list
+    added: List[dict] = []
+    changed: List[dict] = []  # With "previous_quantity"
+    removed: List[dict] = []
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import List
+
+class HouseholdCreate(BaseModel):
+    name: str
+
+class HouseholdMemberAdd(BaseModel):
+    user_id: UUID
+
+class HouseholdMemberResponse(BaseModel):
+    user_id: UUID
+    email: str
+    joined_at: datetime
+
+class HouseholdResponse(BaseModel):
+    id: UUID
+    name: str
+    members: List[HouseholdMemberResponse] = []
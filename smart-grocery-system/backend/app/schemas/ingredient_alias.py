@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import List
+
+class IngredientAliasCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)  # e.g. "green onion" for Scallions
+
+class IngredientAliasResponse(BaseModel):
+    id: UUID
+    ingredient_id: UUID
+    name: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class IngredientMergeRequest(BaseModel):
+    target_id: UUID  # The entry that stays
+    source_ids: List[UUID] = Field(..., min_length=1, max_length=100)  # Duplicates folded into it, then deleted
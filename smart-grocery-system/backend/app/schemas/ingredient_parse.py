@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import List, Optional
+
+class IngredientParseRequest(BaseModel):
+    lines: List[str] = Field(..., min_length=1, max_length=5000)  # e.g. "2 1/2 cups all-purpose flour, sifted"
+
+class ParsedIngredientLine(BaseModel):
+    text: str  # The line as sent
+    quantity: str  # Ready for RecipeIngredientCreate: "2", "5/2", "0.333" ("1" when the line has none)
+    amount: Optional[float] = None  # The quantity as a number, None when the line has none
+    unit: Optional[str] = None  # Normalized: "cups" -> "cup", "Tbsp." -> "tbsp"
+    name: str
+    note: Optional[str] = None  # Preparation etc.: "sifted", "to taste"
+    ingredient_id: Optional[UUID] = None  # The catalog ingredient the name matched, if any
+    matched_name: Optional[str] = None
@@ -7,7 +7,8 @@ class InventoryBase(BaseModel):
     unit: Optional[str] = None
 
 class InventoryUpdate(InventoryBase):
-    pass
+    # The version the client last saw; if set and the item changed since, the update is rejected (409)
+    version: Optional[int] = None
 
 class InventoryCreate(InventoryBase):
     ingredient_id: UUID
@@ -16,6 +17,7 @@ class InventoryResponse(InventoryBase):
     id: UUID
     ingredient_id: UUID
     ingredient_name: str # Mapped from relation
+    version: int = 1
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Any, Optional
+
+class JobCreate(BaseModel):
+    kind: str  # e.g. "recipe_suggestions", "grocery_list", "search_reindex"
+    params: dict = {}
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    params: Optional[dict] = None
+    status: str  # PENDING, RUNNING, SUCCEEDED or FAILED
+    attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import date
+from typing import Dict, List, Optional
+
+class MealPlanEntryBase(BaseModel):
+    recipe_id: UUID
+    planned_date: date
+    servings: Optional[int] = Field(default=None, gt=0)
+
+class MealPlanEntryCreate(MealPlanEntryBase):
+    pass
+
+class MealPlanEntryResponse(MealPlanEntryBase):
+    id: UUID
+    recipe_title: str # Mapped from relation
+
+    class Config:
+        from_attributes = True
+
+# One shopping trip: everything needed for the meals planned from shop_date to end
+class GroceryTrip(BaseModel):
+    shop_date: date
+    end: date
+    items: Dict[str, List[dict]]
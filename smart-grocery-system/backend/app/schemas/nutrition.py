@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class Nutrients(BaseModel):
+    calories: float = 0.0  # kcal
+    protein: float = 0.0  # grams
+    carbs: float = 0.0
+    fat: float = 0.0
+    fiber: float = 0.0
+
+class IngredientNutritionSet(BaseModel):
+    per_quantity: float = Field(default=1.0, gt=0)  # e.g. 100 ...
+    unit: Optional[str] = None  # ... "g" (None = per piece)
+    calories: float = Field(default=0.0, ge=0)
+    protein: float = Field(default=0.0, ge=0)
+    carbs: float = Field(default=0.0, ge=0)
+    fat: float = Field(default=0.0, ge=0)
+    fiber: float = Field(default=0.0, ge=0)
+
+class IngredientNutritionResponse(IngredientNutritionSet):
+    ingredient_id: UUID
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class RecipeNutrition(BaseModel):
+    recipe_id: UUID
+    servings: int
+    total: Nutrients
+    per_serving: Nutrients
+    missing_ingredients: List[str] = []  # Lines without nutrient data (or in an incompatible unit)
+
+class SelectedRecipeNutrition(BaseModel):
+    recipe_id: UUID
+    title: str
+    total: Nutrients  # Scaled to the recipe's target servings
+    missing_ingredients: List[str] = []
+
+class SelectionNutrition(BaseModel):
+    total: Nutrients
+    recipes: List[SelectedRecipeNutrition] = []
+
+class GroceryListWithNutrition(BaseModel):
+    items: Dict[str, List[dict]]  # The grocery list, aisle -> lines
+    nutrition: SelectionNutrition  # What the selected recipes add up to
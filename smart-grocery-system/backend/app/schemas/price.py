@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+class IngredientPriceSet(BaseModel):
+    store: Optional[str] = Field(default=None, max_length=100)  # None = a typical price anywhere
+    unit: Optional[str] = None  # The price is per one of these, e.g. "kg" (None = per piece)
+    price: Decimal = Field(..., gt=0, max_digits=12, decimal_places=4)
+
+class IngredientPriceResponse(BaseModel):
+    id: UUID
+    ingredient_id: UUID
+    store: Optional[str] = None
+    unit: Optional[str] = None
+    price: Decimal
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class PricedGroceryList(BaseModel):
+    items: Dict[str, List[dict]]  # Aisle -> lines, each with "cost" and "store" when it has a price
+    subtotals: Dict[str, float]  # Per aisle
+    store_subtotals: Dict[str, float] = {}  # Per store (cheapest_store mode)
+    total: float
+    unpriced_items: int = 0  # Lines left out of the total: no price in a compatible unit
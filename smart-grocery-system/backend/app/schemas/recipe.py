@@ -1,6 +1,8 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from uuid import UUID
+from datetime import datetime
+from app.schemas.inventory import InventoryResponse
 
 # --- Nested Schemas ---
 
@@ -32,18 +34,40 @@ class RecipeBase(BaseModel):
 
 class RecipeCreate(RecipeBase):
     ingredients: List[RecipeIngredientCreate] = []
+    # Free-text lines ("2 cups flour, sifted"), parsed and added after `ingredients`
+    ingredients_text: List[str] = Field(default=[], max_length=500)
 
 class RecipeUpdate(RecipeBase):
     ingredients: List[RecipeIngredientCreate] = []
+    ingredients_text: List[str] = Field(default=[], max_length=500)
+    # The version the client last saw; if set and the recipe changed since, the update is rejected (409)
+    version: Optional[int] = None
+
+# Copy friends' shared recipes into your own collection
+class RecipeCopyRequest(BaseModel):
+    recipe_ids: List[UUID] = Field(..., min_length=1, max_length=200)
 
 class RecipeResponse(RecipeBase):
     id: UUID
     ingredients: List[RecipeIngredientResponse] = []
     is_selected: bool # <--- Add this
+    target_servings: Optional[int] = None
+    is_shared_to_friends: bool = False
+    version: int = 1
     
     class Config:
         from_attributes = True
 
+# Several recipes in one request (week views, suggestion lists)
+MAX_BATCH_RECIPES = 500
+
+class RecipeBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_RECIPES)
+
+class RecipeBatchResponse(BaseModel):
+    recipes: Dict[UUID, RecipeResponse]  # In the order asked for
+    missing: List[UUID] = []  # Not found, or not yours
+
 class MissingIngredient(BaseModel):
     name: str
     missing_qty: str
@@ -54,4 +78,28 @@ class RecipeSuggestion(BaseModel):
     title: str
     servings: int
     match_percentage: int
-    missing_ingredients: List[MissingIngredient]
\ No newline at end of file
+    missing_ingredients: List[MissingIngredient]
+
+# --- Cooking ---
+
+class CookResponse(BaseModel):
+    inventory: List[InventoryResponse]  # The whole pantry, after the deductions
+    grocery: Dict[str, List[dict]]  # The refreshed shopping list
+    # Recipe lines the pantry couldn't cover: not stocked, stocked in an incompatible unit, or not enough
+    missing_ingredients: List[MissingIngredient] = []
+
+# --- Friends Feed ---
+
+class SharedRecipeResponse(BaseModel):
+    id: UUID
+    owner_id: UUID
+    owner_email: str
+    title: str
+    instructions: Optional[str] = None
+    servings: Optional[int] = None
+    created_at: datetime
+    ingredients: List[RecipeIngredientResponse] = []
+
+class SharedRecipeFeed(BaseModel):
+    items: List[SharedRecipeResponse]
+    next_cursor: Optional[str] = None # Pass back as ?cursor= to get the next page
@@ -0,0 +1,78 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from app.schemas.recipe import RecipeCreate
+
+# --- Pull (GET /sync) ---
+
+class SyncRecipe(BaseModel):
+    id: UUID
+    title: str
+    instructions: Optional[str] = None
+    servings: Optional[int] = None
+    is_selected: bool = False
+    target_servings: Optional[int] = None
+    is_shared_to_friends: bool = False
+    version: int = 1
+    updated_at: Optional[datetime] = None
+
+class SyncRecipeIngredient(BaseModel):
+    id: UUID
+    recipe_id: UUID
+    ingredient_id: UUID
+    name: str
+    quantity: str
+    unit: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+class SyncInventoryItem(BaseModel):
+    id: UUID
+    ingredient_id: UUID
+    ingredient_name: str
+    quantity: str
+    unit: Optional[str] = None
+    version: int = 1
+    updated_at: Optional[datetime] = None
+
+class SyncTombstones(BaseModel):
+    recipes: List[UUID] = []
+    recipe_ingredients: List[UUID] = []
+    inventory: List[UUID] = []
+
+class SyncResponse(BaseModel):
+    cursor: int  # Send back as ?since= next time
+    full: bool = False  # True = this is everything, replace the local copy
+    recipes: List[SyncRecipe] = []
+    # Every line of each recipe above (lines of other recipes are unchanged)
+    recipe_ingredients: List[SyncRecipeIngredient] = []
+    inventory: List[SyncInventoryItem] = []
+    deleted: SyncTombstones = SyncTombstones()
+
+# --- Push (POST /sync) ---
+
+class SyncRecipeChange(RecipeCreate):
+    # Set to update a recipe; a new id (generated offline) creates it with that id
+    id: Optional[UUID] = None
+    # The version the edit was based on; if the recipe changed since, the whole upload is rejected (409)
+    version: Optional[int] = None
+
+class SyncSelectionChange(BaseModel):
+    recipe_id: UUID
+    is_selected: bool
+    target_servings: Optional[int] = Field(default=None, gt=0)
+
+class SyncInventoryChange(BaseModel):
+    # Inventory holds one row per ingredient, so offline edits are keyed by ingredient
+    ingredient_id: UUID
+    quantity: str = "0"
+    unit: Optional[str] = None
+    deleted: bool = False
+    # The version the edit was based on; if the item changed since, the whole upload is rejected (409)
+    version: Optional[int] = None
+
+class SyncUpload(BaseModel):
+    since: int = Field(default=0, ge=0)  # The client's cursor; the response has everything after it
+    recipes: List[SyncRecipeChange] = Field(default=[], max_length=200)
+    selections: List[SyncSelectionChange] = Field(default=[], max_length=500)
+    inventory: List[SyncInventoryChange] = Field(default=[], max_length=500)
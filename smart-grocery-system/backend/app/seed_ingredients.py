@@ -1,6 +1,9 @@
 import logging
 from app.db.session import SessionLocal
 from app.models.ingredient import Ingredient
+from app.models.ingredient_alias import IngredientAlias
+from app.utils.data_version import bump_catalog_version
+from app.utils.ingredient_matching import normalize_name
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,6 +38,18 @@ COMMON_INGREDIENTS = [
     {"name": "Sugar", "aisle": "Baking", "default_unit": "kg"},
 ]
 
+# Other names recipes use for the same thing (plurals and "fresh ..." are folded anyway)
+COMMON_ALIASES = {
+    "Ground Beef": ["minced beef", "beef mince", "hamburger meat"],
+    "Chicken Breast": ["boneless chicken breast", "chicken breast fillet"],
+    "Cheddar Cheese": ["cheddar"],
+    "Olive Oil": ["extra virgin olive oil", "evoo"],
+    "Black Pepper": ["pepper", "ground black pepper"],
+    "Flour": ["all-purpose flour", "plain flour"],
+    "Sugar": ["white sugar", "granulated sugar"],
+    "Salt": ["table salt", "sea salt"],
+}
+
 def seed_ingredients():
     db = SessionLocal()
     try:
@@ -48,8 +63,21 @@ def seed_ingredients():
                 db.add(ingredient)
                 count += 1
         
+        db.flush()
+
+        aliases = 0
+        for name, alias_names in COMMON_ALIASES.items():
+            ingredient = db.query(Ingredient).filter(Ingredient.name == name).first()
+            for alias_name in alias_names:
+                key = normalize_name(alias_name)
+                if ingredient and not db.query(IngredientAlias).filter(IngredientAlias.key == key).first():
+                    db.add(IngredientAlias(ingredient_id=ingredient.id, name=alias_name, key=key))
+                    aliases += 1
+
+        if count or aliases:
+            bump_catalog_version(db)
         db.commit()
-        logger.info(f"Successfully added {count} new ingredients.")
+        logger.info(f"Successfully added {count} new ingredients and {aliases} aliases.")
     except Exception as e:
         logger.error(f"Error seeding data: {e}")
         db.rollback()
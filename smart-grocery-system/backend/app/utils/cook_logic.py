@@ -0,0 +1,96 @@
+from sqlalchemy import case, delete, update
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.inventory import Inventory
+from app.models.ingredient import Ingredient
+from app.utils.grocery_logic import format_quantity, parse_quantity
+from app.utils.units import convert
+from uuid import UUID
+
+class InventoryChanged(Exception):
+    """The pantry changed between reading it and writing the deductions."""
+
+def deduct_recipe(db: Session, user_id: UUID, recipe: Recipe, servings: Optional[int] = None) -> Tuple[List[UUID], List[UUID], List[dict]]:
+    """
+    Takes one cooking of the recipe (scaled to `servings`) out of the user's inventory.
+    Recipe units are converted to the unit each item is stocked in (g -> kg, tbsp -> ml, ...).
+
+    The items are locked while the new quantities are worked out, then written with one
+    UPDATE (and one DELETE for items that run out), both guarded by the versions that were read.
+    Does not commit.
+
+    Returns (updated item ids, used up item ids, what could not be taken from the pantry).
+    """
+    scale = servings / recipe.servings if servings and recipe.servings else 1.0
+
+    lines = db.query(
+        RecipeIngredient.ingredient_id,
+        RecipeIngredient.quantity,
+        RecipeIngredient.unit,
+        Ingredient.name
+    ).join(Ingredient, RecipeIngredient.ingredient_id == Ingredient.id)\
+     .filter(RecipeIngredient.recipe_id == recipe.id).all()
+    if not lines:
+        return [], [], []
+
+    # Lock in id order, so two cooks on the same pantry can't deadlock each other
+    items = db.query(Inventory).filter(
+        Inventory.user_id == user_id,
+        Inventory.ingredient_id.in_([line.ingredient_id for line in lines])
+    ).order_by(Inventory.id).with_for_update().all()
+    stock = {item.ingredient_id: item for item in items}
+    names = {line.ingredient_id: line.name for line in lines}
+
+    # --- How much of each item the recipe uses, in the item's unit ---
+    used = {}
+    missing = []
+    for ingredient_id, quantity, unit, name in lines:
+        needed = parse_quantity(quantity) * scale
+        item = stock.get(ingredient_id)
+        in_stock_unit = convert(needed, unit, item.unit) if item else None
+        if in_stock_unit is None:
+            missing.append({"name": name, "missing_qty": format_quantity(needed), "unit": unit or ""})
+            continue
+        used[item.id] = used.get(item.id, 0.0) + in_stock_unit
+
+    # --- New quantities; anything that runs out is removed ---
+    remaining, used_up = {}, []
+    for item in items:
+        if item.id not in used:
+            continue
+        on_hand = parse_quantity(item.quantity)
+        left = on_hand - used[item.id]
+        if left > 0.01:
+            remaining[item.id] = format_quantity(left)
+        else:
+            used_up.append(item.id)
+            if left < -0.01:
+                missing.append({"name": names[item.ingredient_id], "missing_qty": format_quantity(-left), "unit": item.unit or ""})
+
+    read_versions = {item.id: item.version for item in items}
+
+    if remaining:
+        written = db.execute(
+            update(Inventory).where(
+                Inventory.id.in_(list(remaining)),
+                Inventory.version == case(read_versions, value=Inventory.id)
+            ).values(
+                quantity=case(remaining, value=Inventory.id),
+                version=Inventory.version + 1
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        if written != len(remaining):
+            raise InventoryChanged()
+
+    if used_up:
+        removed = db.execute(
+            delete(Inventory).where(
+                Inventory.id.in_(used_up),
+                Inventory.version == case(read_versions, value=Inventory.id)
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        if removed != len(used_up):
+            raise InventoryChanged()
+
+    return list(remaining), used_up, missing
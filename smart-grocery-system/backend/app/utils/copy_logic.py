@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import and_, case, false, func, insert, literal, null, select
+from sqlalchemy.orm import Session
+from typing import Dict, List
+from app.models.recipe import Recipe, RecipeIngredient
+from uuid import UUID
+from app.utils.friend_logic import friend_ids_select
+
+def new_uuid_sql(db: Session):
+    """A fresh UUID generated by the database, one per inserted row."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.gen_random_uuid()
+    # SQLite stores UUIDs as 32 hex chars
+    return func.lower(func.hex(func.randomblob(16)))
+
+def copy_shared_recipes(db: Session, user_id: UUID, recipe_ids: List[UUID]) -> Dict[UUID, UUID]:
+    """
+    Copies friends' shared recipes (and their ingredient lines) into the user's collection
+    with two INSERT ... SELECT statements. Rows never leave the database, ingredient ids are
+    reused as-is, and the "is shared AND owned by an accepted friend" check is part of each
+    SELECT, so recipes the user may not see are silently skipped.
+
+    Returns {source recipe id: new recipe id} for the recipes that were copied.
+    Does not commit.
+    """
+    # New ids are picked up front so the second statement can map lines to the copies
+    id_map = {recipe_id: uuid.uuid4() for recipe_id in set(recipe_ids)}
+    if not id_map:
+        return {}
+
+    def mapped(column):
+        return case(
+            *[(column == old_id, literal(new_id, Recipe.id.type)) for old_id, new_id in id_map.items()]
+        )
+
+    allowed = and_(
+        Recipe.id.in_(list(id_map)),
+        Recipe.is_shared_to_friends == True,
+        Recipe.user_id.in_(friend_ids_select(user_id))
+    )
+
+    now = datetime.utcnow()
+
+    # --- 1. Copy the recipes ---
+    copied_ids = db.execute(
+        insert(Recipe).from_select(
+            ["id", "user_id", "title", "instructions", "servings",
+             "is_selected", "target_servings", "is_shared_to_friends", "created_at", "updated_at"],
+            select(
+                mapped(Recipe.id),
+                literal(user_id, Recipe.user_id.type),
+                Recipe.title,
+                Recipe.instructions,
+                Recipe.servings,
+                false(),
+                null(),
+                false(),
+                literal(now),
+                literal(now),
+            ).where(allowed)
+        ).returning(Recipe.id)
+    ).scalars().all()
+
+    if not copied_ids:
+        return {}
+
+    # --- 2. Copy their ingredient lines ---
+    db.execute(
+        insert(RecipeIngredient).from_select(
+            ["id", "recipe_id", "ingredient_id", "quantity", "unit", "updated_at"],
+            select(
+                new_uuid_sql(db),
+                mapped(RecipeIngredient.recipe_id),
+                RecipeIngredient.ingredient_id,
+                RecipeIngredient.quantity,
+                RecipeIngredient.unit,
+                literal(now),
+            ).join(Recipe, RecipeIngredient.recipe_id == Recipe.id).where(allowed)
+        )
+    )
+
+    copied = set(copied_ids)
+    return {old_id: new_id for old_id, new_id in id_map.items() if new_id in copied}
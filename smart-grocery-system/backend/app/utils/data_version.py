@@ -0,0 +1,59 @@
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.core.read_after import note_write
+from app.models.catalog_version import CatalogVersion
+from app.models.user import User
+from uuid import UUID
+
+def bump_data_version(db: Session, user_id: UUID) -> int:
+    """
+    Increments the user's data version inside the current transaction and returns it.
+    Call before db.commit() in every write that changes recipes, selections or inventory.
+    The row lock this takes serializes the user's writes until commit.
+    """
+    version = db.execute(
+        update(User).where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    note_write(user_id, version)
+    return version
+
+def bump_catalog_version(db: Session) -> None:
+    """
+    Increments the ingredient catalog's version inside the current transaction. Call before
+    db.commit() in every write that adds, renames, merges or removes ingredients or aliases,
+    so other processes rebuild their name index. The row lock serializes catalog writes.
+    """
+    bumped = db.execute(
+        update(CatalogVersion).where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not bumped:
+        # A database built without migrations (DATABASE_URL=sqlite://) starts without the row
+        db.add(CatalogVersion(id=1, version=1))
+        db.flush()
+
+def data_etag(user: User, *parts) -> str:
+    """Weak ETag from the user's data version (plus anything else the response depends on)."""
+    tag = "-".join([f"v{user.data_version or 0}"] + [str(p) for p in parts])
+    return f'W/"{tag}"'
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Sets the ETag on the response, and returns a 304 to send instead
+    when the client's If-None-Match already has it.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison: ignore W/ prefixes
+        candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,341 @@
+import json
+import uuid
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import read_session
+from app.models.ingredient import Ingredient
+from app.models.inventory import Inventory
+from app.models.recipe import Recipe, RecipeIngredient
+from app.schemas.export import ExportEnd, ExportInventoryItem, ExportRecipe, ImportSummary
+from app.utils.data_version import bump_catalog_version, bump_data_version
+from app.utils.ingredient_matching import get_ingredient_index
+from app.utils.search_logic import refresh_search_index
+from app.utils.sync_logic import log_changes, INVENTORY, RECIPE
+from uuid import UUID
+
+# --- Format ---
+# One JSON object per line. A header, then one line per recipe (with its ingredient lines
+# and selection) and per inventory item, then an "end" line with the counts, so a cut-off
+# file is detected on import. Ingredients are referenced by name: ids differ between servers.
+FORMAT = "smart-grocery-export"
+FORMAT_VERSION = 1
+
+CHUNK_ROWS = 1000  # Rows fetched per round trip (server-side cursor on Postgres)
+FLUSH_BYTES = 64 * 1024  # Output is sent in pieces of about this size
+
+def _line(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+# --- Export ---
+
+def export_records(db: Session, user_id: UUID) -> Iterator[dict]:
+    """
+    The user's data as export records. Rows are streamed in chunks of CHUNK_ROWS, and a recipe
+    is emitted as soon as its last line has been read, so memory doesn't grow with the account.
+    """
+    yield {"type": "header", "format": FORMAT, "version": FORMAT_VERSION, "exported_at": datetime.utcnow().isoformat()}
+
+    rows = db.execute(
+        select(
+            Recipe.id, Recipe.title, Recipe.instructions, Recipe.servings, Recipe.is_selected,
+            Recipe.target_servings, Recipe.is_shared_to_friends,
+            Ingredient.name, Ingredient.aisle, RecipeIngredient.quantity, RecipeIngredient.unit
+        ).select_from(Recipe)
+         .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+         .outerjoin(Ingredient, RecipeIngredient.ingredient_id == Ingredient.id)
+         .where(Recipe.user_id == user_id)
+         .order_by(Recipe.id, Ingredient.name, RecipeIngredient.id)
+         .execution_options(yield_per=CHUNK_ROWS)
+    )
+    recipes = 0
+    current = None
+    for row in rows:
+        if current is None or current["id"] != row.id:
+            if current is not None:
+                yield current
+                recipes += 1
+            current = {
+                "type": "recipe",
+                "id": row.id,
+                "title": row.title,
+                "instructions": row.instructions,
+                "servings": row.servings,
+                "is_selected": bool(row.is_selected),
+                "target_servings": row.target_servings,
+                "is_shared_to_friends": bool(row.is_shared_to_friends),
+                "ingredients": [],
+            }
+        if row.name is not None:
+            current["ingredients"].append({"name": row.name, "aisle": row.aisle, "quantity": row.quantity, "unit": row.unit})
+    if current is not None:
+        yield current
+        recipes += 1
+
+    rows = db.execute(
+        select(Ingredient.name, Ingredient.aisle, Inventory.quantity, Inventory.unit)
+        .join(Ingredient, Inventory.ingredient_id == Ingredient.id)
+        .where(Inventory.user_id == user_id)
+        .order_by(Inventory.id)
+        .execution_options(yield_per=CHUNK_ROWS)
+    )
+    items = 0
+    for row in rows:
+        yield {"type": "inventory", "name": row.name, "aisle": row.aisle, "quantity": row.quantity, "unit": row.unit}
+        items += 1
+
+    yield {"type": "end", "recipes": recipes, "inventory": items}
+
+def export_stream(user_id: UUID, compress: bool = False, min_version: Optional[int] = None) -> Iterator[bytes]:
+    """
+    NDJSON (gzip-compressed with compress=True) for a StreamingResponse. Opens its own session
+    (on a replica that has min_version, see read_session), so the request's can be closed;
+    on Postgres the whole export reads one snapshot.
+    """
+    db = read_session(user_id, min_version)
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+        buffer: List[str] = []
+        size = 0
+        for record in export_records(db, user_id):
+            line = _line(record)
+            buffer.append(line)
+            size += len(line)
+            if size >= FLUSH_BYTES:
+                data = "".join(buffer).encode()
+                buffer, size = [], 0
+                data = gzip.compress(data) if gzip else data
+                if data:
+                    yield data
+
+        data = "".join(buffer).encode()
+        yield gzip.compress(data) + gzip.flush() if gzip else data
+    finally:
+        db.close()
+
+# --- Import ---
+
+IMPORT_BATCH = 500  # Recipes / inventory items written per round of INSERTs
+MAX_LINE_BYTES = 4 * 1024 * 1024
+INFLATE_STEP = 1024 * 1024  # Most bytes one decompress() call may produce
+
+class ImportFormatError(ValueError):
+    """The upload isn't a (complete) export file; the message says which line."""
+
+class ImportTooLargeError(ImportFormatError):
+    """The upload inflates to more than IMPORT_MAX_BYTES."""
+
+class NdjsonDecoder:
+    """
+    Splits body chunks into (line number, record); gzip is detected from the first bytes.
+    Compressed input is inflated INFLATE_STEP bytes at a time, and the inflated total is
+    capped at max_bytes, so a small gzip bomb can't fill memory.
+    """
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes or settings.IMPORT_MAX_BYTES
+        self.gunzip = None
+        self.started = False
+        self.pending = b""
+        self.number = 0
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> List[Tuple[int, dict]]:
+        if not chunk:
+            return []
+        if not self.started:
+            self.started = True
+            if chunk[:2] == b"\x1f\x8b":
+                self.gunzip = zlib.decompressobj(31)
+        if not self.gunzip:
+            return self._split(chunk)
+        records = []
+        while chunk:
+            records += self._split(self.gunzip.decompress(chunk, INFLATE_STEP))
+            chunk = self.gunzip.unconsumed_tail
+        return records
+
+    def close(self) -> List[Tuple[int, dict]]:
+        records = self._split(self.gunzip.flush()) if self.gunzip else []
+        lines, self.pending = [self.pending], b""
+        return records + self._records(lines)
+
+    def _split(self, data: bytes) -> List[Tuple[int, dict]]:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise ImportTooLargeError(f"The file is larger than {self.max_bytes} bytes (uncompressed)")
+        *lines, self.pending = (self.pending + data).split(b"\n")
+        if len(self.pending) > MAX_LINE_BYTES:
+            raise ImportFormatError(f"Line {self.number + len(lines) + 1}: too long")
+        return self._records(lines)
+
+    def _records(self, lines: List[bytes]) -> List[Tuple[int, dict]]:
+        records = []
+        for raw in lines:
+            self.number += 1
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                raise ImportFormatError(f"Line {self.number}: not valid JSON")
+            if not isinstance(record, dict):
+                raise ImportFormatError(f"Line {self.number}: not an export record")
+            records.append((self.number, record))
+        return records
+
+
+class AccountImporter:
+    """
+    Writes export records into the user's account in batches of IMPORT_BATCH, all inside the
+    caller's transaction (it commits, or rolls back on ImportFormatError).
+
+    Recipes are added next to the existing ones; a recipe whose id is already in the user's
+    collection is skipped, so re-importing a file is harmless. Inventory items overwrite the
+    user's item for the same ingredient. Unknown ingredient names are added to the catalog.
+    """
+    def __init__(self, db: Session, user_id: UUID):
+        self.db = db
+        self.user_id = user_id
+        self.version = bump_data_version(db, user_id)
+        self.index = get_ingredient_index(db)
+        self.ingredients: Dict[str, UUID] = {}  # Lower-cased name in the file -> ingredient id
+        self.seen_recipe_ids = set()
+        self.recipes: List[ExportRecipe] = []
+        self.items: List[ExportInventoryItem] = []
+        self.header = False
+        self.end: Optional[ExportEnd] = None
+        self.received = {"recipes": 0, "inventory": 0}
+        self.summary = ImportSummary()
+
+    def add(self, records: List[Tuple[int, dict]]) -> None:
+        for number, record in records:
+            kind = record.get("type")
+            if not self.header:
+                if kind != "header" or record.get("format") != FORMAT:
+                    raise ImportFormatError(f"Line {number}: expected the export header")
+                if not isinstance(record.get("version"), int) or record["version"] > FORMAT_VERSION:
+                    raise ImportFormatError(f"Line {number}: unsupported export version {record.get('version')}")
+                self.header = True
+                continue
+            if self.end is not None:
+                raise ImportFormatError(f"Line {number}: data after the end record")
+            try:
+                if kind == "recipe":
+                    self.recipes.append(ExportRecipe.model_validate(record))
+                    self.received["recipes"] += 1
+                elif kind == "inventory":
+                    self.items.append(ExportInventoryItem.model_validate(record))
+                    self.received["inventory"] += 1
+                elif kind == "end":
+                    self.end = ExportEnd.model_validate(record)
+                else:
+                    raise ImportFormatError(f"Line {number}: unknown record type {kind!r}")
+            except ValidationError as e:
+                raise ImportFormatError(f"Line {number}: {e.errors()[0]['loc']} {e.errors()[0]['msg']}")
+
+            if len(self.recipes) >= IMPORT_BATCH:
+                self._write_recipes()
+            if len(self.items) >= IMPORT_BATCH:
+                self._write_inventory()
+
+    def finish(self) -> ImportSummary:
+        if not self.header:
+            raise ImportFormatError("The file is empty")
+        if self.end is None:
+            raise ImportFormatError("The file is incomplete (no end record)")
+        if (self.end.recipes, self.end.inventory) != (self.received["recipes"], self.received["inventory"]):
+            raise ImportFormatError("The file is incomplete (fewer records than its end record says)")
+        self._write_recipes()
+        self._write_inventory()
+        if self.summary.ingredients_created:
+            # Last, so the catalog row stays locked only until the caller's commit
+            bump_catalog_version(self.db)
+        return self.summary
+
+    def _ingredient_ids(self, lines: Iterable) -> None:
+        """Resolves names against the catalog (and its aliases); adds the ones it doesn't have (one INSERT)."""
+        new = {}
+        for line in lines:
+            key = line.name.strip().lower()
+            if key in self.ingredients or key in new:
+                continue
+            found = self.index.resolve(line.name)
+            if found:
+                self.ingredients[key] = found[0]
+            else:
+                new[key] = {"id": uuid.uuid4(), "name": line.name.strip(), "aisle": line.aisle or "Other", "default_unit": line.unit}
+        if new:
+            self.db.execute(insert(Ingredient), list(new.values()))
+            self.ingredients.update({key: row["id"] for key, row in new.items()})
+            self.summary.ingredients_created += len(new)
+
+    def _write_recipes(self) -> None:
+        batch, self.recipes = self.recipes, []
+        if not batch:
+            return
+        wanted = [r.id for r in batch if r.id]
+        taken = dict(self.db.query(Recipe.id, Recipe.user_id).filter(Recipe.id.in_(wanted)).all()) if wanted else {}
+
+        now = datetime.utcnow()
+        recipe_rows, line_rows = [], []
+        for r in batch:
+            if r.id and taken.get(r.id) == self.user_id:
+                self.summary.skipped_recipes += 1
+                continue
+            recipe_id = r.id if r.id and r.id not in taken and r.id not in self.seen_recipe_ids else uuid.uuid4()
+            self.seen_recipe_ids.add(recipe_id)
+            recipe_rows.append({
+                "id": recipe_id, "user_id": self.user_id, "title": r.title, "instructions": r.instructions,
+                "servings": r.servings, "is_selected": r.is_selected, "target_servings": r.target_servings,
+                "is_shared_to_friends": r.is_shared_to_friends, "created_at": now, "updated_at": now,
+            })
+            self._ingredient_ids(r.ingredients)
+            line_rows += [
+                {"id": uuid.uuid4(), "recipe_id": recipe_id, "ingredient_id": self.ingredients[line.name.strip().lower()],
+                 "quantity": line.quantity, "unit": line.unit, "updated_at": now}
+                for line in r.ingredients
+            ]
+
+        if recipe_rows:
+            self.db.execute(insert(Recipe), recipe_rows)
+        if line_rows:
+            self.db.execute(insert(RecipeIngredient), line_rows)
+        new_ids = [row["id"] for row in recipe_rows]
+        refresh_search_index(self.db, new_ids)
+        log_changes(self.db, self.user_id, self.version, RECIPE, new_ids)
+        self.summary.recipes += len(recipe_rows)
+
+    def _write_inventory(self) -> None:
+        batch, self.items = self.items, []
+        if not batch:
+            return
+        self._ingredient_ids(batch)
+        # One row per ingredient: the last line for an ingredient wins
+        wanted = {self.ingredients[item.name.strip().lower()]: item for item in batch}
+        existing = {
+            i.ingredient_id: i for i in self.db.query(Inventory).filter(
+                Inventory.user_id == self.user_id, Inventory.ingredient_id.in_(list(wanted))
+            )
+        }
+        new_rows = []
+        for ingredient_id, item in wanted.items():
+            current = existing.get(ingredient_id)
+            if current:
+                current.quantity, current.unit = item.quantity, item.unit
+                current.version = (current.version or 1) + 1
+            else:
+                new_rows.append({"id": uuid.uuid4(), "user_id": self.user_id, "ingredient_id": ingredient_id,
+                                 "quantity": item.quantity, "unit": item.unit, "updated_at": datetime.utcnow()})
+        if new_rows:
+            self.db.execute(insert(Inventory), new_rows)
+        self.db.flush()
+        log_changes(self.db, self.user_id, self.version, INVENTORY,
+                    [i.id for i in existing.values()] + [row["id"] for row in new_rows])
+        self.summary.inventory += len(wanted)
@@ -0,0 +1,44 @@
+from sqlalchemy import and_, or_, select, union_all
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.models.friendship import Friendship, FriendshipStatus
+from uuid import UUID
+
+def friend_ids_select(user_id: UUID):
+    """
+    SELECT of the ids of the user's accepted friends, in either direction.
+    Each half is served by one of the (requester_id, status) / (addressee_id, status) indexes,
+    so it can be embedded as `WHERE user_id IN (...)` without loading the friend list first.
+    """
+    accepted = FriendshipStatus.ACCEPTED.value
+    return union_all(
+        select(Friendship.addressee_id.label("friend_id")).where(
+            Friendship.requester_id == user_id, Friendship.status == accepted
+        ),
+        select(Friendship.requester_id.label("friend_id")).where(
+            Friendship.addressee_id == user_id, Friendship.status == accepted
+        ),
+    )
+
+def is_friend_of(user_id: UUID, owner_id):
+    """
+    WHERE clause: owner_id is one of the user's accepted friends. The two directions are OR-ed
+    IN subqueries, which PostgreSQL can't turn into a join: each is read once into a hashed
+    lookup, so a scan filtered by this keeps walking its own index in order (and stops at LIMIT).
+    """
+    accepted = FriendshipStatus.ACCEPTED.value
+    return or_(
+        owner_id.in_(select(Friendship.addressee_id).where(
+            Friendship.requester_id == user_id, Friendship.status == accepted
+        )),
+        owner_id.in_(select(Friendship.requester_id).where(
+            Friendship.addressee_id == user_id, Friendship.status == accepted
+        )),
+    )
+
+def find_friendship(db: Session, user_a: UUID, user_b: UUID) -> Optional[Friendship]:
+    """The friendship row between two users, whoever sent the request."""
+    return db.query(Friendship).filter(or_(
+        and_(Friendship.requester_id == user_a, Friendship.addressee_id == user_b),
+        and_(Friendship.requester_id == user_b, Friendship.addressee_id == user_a),
+    )).first()
@@ -0,0 +1,30 @@
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+def flatten_grocery_list(grocery_list: Dict[str, List[dict]]) -> Dict[Tuple[str, str], dict]:
+    """{aisle: [items]} -> {(name, unit): item with its aisle}, the shape diffs are computed on."""
+    flat = {}
+    for aisle, items in grocery_list.items():
+        for item in items:
+            flat[(item["name"], item["unit"])] = {**item, "aisle": aisle}
+    return flat
+
+def grocery_list_version(grocery_list: Dict[str, List[dict]]) -> str:
+    """Short content hash: equal lists always get the same version."""
+    payload = json.dumps(grocery_list, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+def diff_grocery_lists(old: Dict[Tuple[str, str], dict], new: Dict[Tuple[str, str], dict]) -> dict:
+    """
+    Incremental changes between two flattened lists:
+    added / removed lines and lines whose quantity changed (with the old quantity).
+    """
+    added = [new[key] for key in new.keys() - old.keys()]
+    removed = [old[key] for key in old.keys() - new.keys()]
+    changed = [
+        {**new[key], "previous_quantity": old[key]["quantity"]}
+        for key in new.keys() & old.keys()
+        if new[key]["quantity"] != old[key]["quantity"]
+    ]
+    return {"added": added, "changed": changed, "removed": removed}
@@ -1,8 +1,14 @@
+from sqlalchemy import Float, cast, func, select
 from sqlalchemy.orm import Session
-from typing import Dict, List
-from app.models.recipe import Recipe
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from app.models.recipe import Recipe, RecipeIngredient
 from app.models.inventory import Inventory
 from app.models.ingredient import Ingredient
+from app.models.meal_plan import MealPlanEntry
+from app.models.household import HouseholdMember
+from app.models.user import User
+from app.utils.price_index import PriceIndex
 from uuid import UUID
 
 def parse_quantity(qty_str: str) -> float:
@@ -20,68 +26,236 @@ def parse_quantity(qty_str: str) -> float:
     except ValueError:
         return 0.0
 
-def generate_grocery_list(db: Session, user_id: UUID) -> Dict[str, List[dict]]:
+def format_quantity(qty: float) -> str:
+    """2.0 -> '2', 0.125 -> '0.13'"""
+    return f"{qty:.2f}".rstrip('0').rstrip('.')
+
+def servings_scale(target_servings):
     """
-    1. Aggregates ingredients from selected recipes.
-    2. Subtracts inventory.
-    3. Groups by Aisle.
+    SQL expression for the factor a recipe's quantities are multiplied by:
+    target servings / recipe servings (1.0 when either is missing).
     """
-    
-    # --- 1. Fetch Selected Recipes ---
-    selected_recipes = db.query(Recipe).filter(
-        Recipe.user_id == user_id, 
-        Recipe.is_selected == True
-    ).all()
+    base = func.nullif(Recipe.servings, 0)
+    return func.coalesce(cast(target_servings, Float) / base, 1.0)
 
-    # Dictionary Key: (ingredient_id, unit) -> Value: { 'qty': float, 'obj': Ingredient }
-    # We group by Unit as well because we can't subtract 'grams' from 'cups' easily in MVP
+def needed_ingredients_query(db: Session, scale):
+    """
+    One row per recipe ingredient line: (ingredient_id, unit, quantity, scale, name, aisle).
+    Callers add the filters that pick which recipes (and how many servings) to shop for.
+    """
+    return db.query(
+        RecipeIngredient.ingredient_id,
+        RecipeIngredient.unit,
+        RecipeIngredient.quantity,
+        scale.label("scale"),
+        Ingredient.name,
+        Ingredient.aisle,
+    ).join(Recipe, RecipeIngredient.recipe_id == Recipe.id)\
+     .join(Ingredient, RecipeIngredient.ingredient_id == Ingredient.id)
+
+def sum_needed(rows, servings_multiplier: float = 1.0) -> dict:
+    """
+    Sums (already scaled) ingredient rows in a single pass.
+    Key: (ingredient_id, unit) -> Value: { 'qty': float, 'name': str, 'aisle': str }
+    We group by Unit as well because we can't subtract 'grams' from 'cups' easily in MVP
+    """
     needed_map = {}
 
-    for recipe in selected_recipes:
-        for r_ing in recipe.ingredients:
-            key = (r_ing.ingredient_id, r_ing.unit)
-            qty_val = parse_quantity(r_ing.quantity)
+    for row in rows:
+        ing_id, unit, quantity, scale, name, aisle = row[:6]
+        key = (ing_id, unit)
+        qty_val = parse_quantity(quantity) * (scale or 1.0) * servings_multiplier
+
+        if key not in needed_map:
+            needed_map[key] = {'qty': 0.0, 'name': name, 'aisle': aisle}
+
+        needed_map[key]['qty'] += qty_val
 
-            if key not in needed_map:
-                needed_map[key] = {
-                    'qty': 0.0,
-                    'ingredient': r_ing.ingredient
-                }
-            
-            needed_map[key]['qty'] += qty_val
+    return needed_map
 
-    # --- 2. Fetch Inventory & Subtract ---
-    user_inventory = db.query(Inventory).filter(Inventory.user_id == user_id).all()
+def load_inventory(db: Session, user_ids) -> Dict[tuple, float]:
+    """(ingredient_id, unit) -> quantity on hand, summed over the given users (a list or a subquery)."""
+    user_inventory = db.query(Inventory.ingredient_id, Inventory.unit, Inventory.quantity)\
+        .filter(Inventory.user_id.in_(user_ids)).all()
 
-    for item in user_inventory:
-        qty_val = parse_quantity(item.quantity)
-        key = (item.ingredient_id, item.unit)
+    on_hand = {}
+    for ing_id, unit, quantity in user_inventory:
+        key = (ing_id, unit)
+        on_hand[key] = on_hand.get(key, 0.0) + parse_quantity(quantity)
+    return on_hand
 
+def subtract_inventory(needed_map: dict, on_hand: Dict[tuple, float]) -> None:
+    """
+    Uses up inventory against needed_map, in place. on_hand is reduced by what was
+    used, so calling this for consecutive shopping trips carries the leftovers forward.
+    """
+    for key, data in needed_map.items():
         # Only subtract if we actually need this item (and units match)
-        if key in needed_map:
-            needed_map[key]['qty'] -= qty_val
+        available = on_hand.get(key, 0.0)
+        if available > 0 and data['qty'] > 0:
+            used = min(available, data['qty'])
+            data['qty'] -= used
+            on_hand[key] = available - used
 
-    # --- 3. Format & Group by Aisle ---
+def format_grocery_list(needed_map: dict, extra_fields: Optional[dict] = None) -> Dict[str, List[dict]]:
+    """
+    Groups what is still needed by aisle.
+    extra_fields: optional (ingredient_id, unit) -> dict of additional keys for that line.
+    """
     final_list = {}
 
     for (ing_id, unit), data in needed_map.items():
         remaining_qty = data['qty']
-        ingredient = data['ingredient']
 
         # If we still need it (greater than generic "epsilon" to handle float errors)
         if remaining_qty > 0.01:
-            aisle = ingredient.aisle or "Other"
-            
+            aisle = data['aisle'] or "Other"
+
             if aisle not in final_list:
                 final_list[aisle] = []
 
             # Format quantity back to pretty string if it's an integer
-            display_qty = f"{remaining_qty:.2f}".rstrip('0').rstrip('.')
-            
-            final_list[aisle].append({
-                "name": ingredient.name,
+            display_qty = format_quantity(remaining_qty)
+
+            line = {
+                "name": data['name'],
                 "quantity": display_qty,
                 "unit": unit or ""
-            })
+            }
+            if extra_fields:
+                line.update(extra_fields.get((ing_id, unit), {}))
+            final_list[aisle].append(line)
+
+    return final_list
+
+def build_grocery_list(
+    db: Session,
+    user_id: UUID,
+    rows,
+    servings_multiplier: float = 1.0,
+    prices: Optional[PriceIndex] = None,
+    cheapest_store: bool = False
+) -> Dict[str, List[dict]]:
+    """
+    1. Aggregates the ingredient rows.
+    2. Subtracts inventory.
+    3. Prices what is left (if a price index is given): adds "cost" and "store" to lines.
+    4. Groups by Aisle.
+    """
+    needed_map = sum_needed(rows, servings_multiplier)
+    subtract_inventory(needed_map, load_inventory(db, [user_id]))
+    extra_fields = prices.price_lines(needed_map, cheapest_store) if prices else None
+    return format_grocery_list(needed_map, extra_fields)
+
+def generate_grocery_list(
+    db: Session,
+    user_id: UUID,
+    servings_multiplier: float = 1.0,
+    prices: Optional[PriceIndex] = None,
+    cheapest_store: bool = False
+) -> Dict[str, List[dict]]:
+    """
+    Shopping list for the user's selected recipes, each scaled to its target servings
+    (and then by servings_multiplier), minus inventory, grouped by aisle.
+    All selected ingredient lines come back from one joined query.
+    """
+    rows = needed_ingredients_query(db, servings_scale(Recipe.target_servings)).filter(
+        Recipe.user_id == user_id,
+        Recipe.is_selected == True
+    ).all()
+
+    return build_grocery_list(db, user_id, rows, servings_multiplier, prices, cheapest_store)
+
+def trip_date_for(day: date, start: date, shopping_days: List[int]) -> date:
+    """The last shopping day (ISO weekday 0=Mon..6=Sun) on or before `day`, but not before `start`."""
+    days_back = min((day.weekday() - weekday) % 7 for weekday in shopping_days)
+    return max(day - timedelta(days=days_back), start)
+
+def generate_meal_plan_grocery_list(
+    db: Session,
+    user_id: UUID,
+    start: date,
+    end: date,
+    shopping_days: Optional[List[int]] = None
+) -> List[dict]:
+    """
+    Shopping list(s) for every meal planned between start and end (inclusive),
+    each scaled to the entry's servings. All lines come from one aggregation query
+    over the (user_id, planned_date) index.
+
+    Without shopping_days this is a single trip. With shopping_days, each meal is bought
+    on the last shopping day before it, and inventory is used up by the earliest trips first.
+    """
+    rows = needed_ingredients_query(db, servings_scale(MealPlanEntry.servings))\
+        .add_columns(MealPlanEntry.planned_date)\
+        .join(MealPlanEntry, MealPlanEntry.recipe_id == Recipe.id)\
+        .filter(
+            MealPlanEntry.user_id == user_id,
+            MealPlanEntry.planned_date >= start,
+            MealPlanEntry.planned_date <= end
+        ).all()
+
+    # --- Bucket rows per trip ---
+    trip_rows = {}
+    for row in rows:
+        shop_date = trip_date_for(row.planned_date, start, shopping_days) if shopping_days else start
+        trip_rows.setdefault(shop_date, []).append(tuple(row)[:6])
+
+    if not trip_rows:
+        trip_rows[start] = []
+
+    # --- Build each trip, consuming inventory in date order ---
+    on_hand = load_inventory(db, [user_id])
+    shop_dates = sorted(trip_rows)
+    trips = []
+    for i, shop_date in enumerate(shop_dates):
+        trip_end = shop_dates[i + 1] - timedelta(days=1) if i + 1 < len(shop_dates) else end
+        needed_map = sum_needed(trip_rows[shop_date])
+        subtract_inventory(needed_map, on_hand)
+        trips.append({
+            "shop_date": shop_date,
+            "end": trip_end,
+            "items": format_grocery_list(needed_map)
+        })
+
+    return trips
+
+def generate_household_grocery_list(db: Session, household_id: UUID) -> Dict[str, List[dict]]:
+    """
+    One shopping list for everyone in the household: the selected recipes of all
+    members (scaled like generate_grocery_list), minus the members' combined inventory.
+    Each line lists the member recipes that need it, biggest share first.
+    """
+    member_ids = select(HouseholdMember.user_id).where(HouseholdMember.household_id == household_id)
+
+    rows = needed_ingredients_query(db, servings_scale(Recipe.target_servings))\
+        .add_columns(User.email, Recipe.title)\
+        .join(User, Recipe.user_id == User.id)\
+        .filter(
+            Recipe.user_id.in_(member_ids),
+            Recipe.is_selected == True
+        ).all()
+
+    needed_map = sum_needed(rows)
+
+    # --- Who needs what: (ingredient_id, unit) -> {(email, recipe title): qty} ---
+    sources = {}
+    for row in rows:
+        key = (row.ingredient_id, row.unit)
+        source = (row.email, row.title)
+        shares = sources.setdefault(key, {})
+        shares[source] = shares.get(source, 0.0) + parse_quantity(row.quantity) * (row.scale or 1.0)
+
+    on_hand = load_inventory(db, member_ids)
+    subtract_inventory(needed_map, on_hand)
 
-    return final_list
\ No newline at end of file
+    extra_fields = {
+        key: {
+            "sources": [
+                {"member": email, "recipe": title}
+                for (email, title), _ in sorted(shares.items(), key=lambda s: s[1], reverse=True)
+            ]
+        }
+        for key, shares in sources.items()
+    }
+    return format_grocery_list(needed_map, extra_fields)
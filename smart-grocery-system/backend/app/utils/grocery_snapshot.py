@@ -0,0 +1,31 @@
+import json
+import zlib
+from typing import Dict, List
+
+# Packed form: {"aisles": [...], "lines": [[aisle index, name, quantity, unit, extra?], ...]},
+# as compact JSON, zlib-compressed. Any other keys of a line (e.g. cost) go in an optional
+# fifth element, a {key: value} dict; lines without any have only four.
+
+def pack_grocery_list(grocery_list: Dict[str, List[dict]]) -> bytes:
+    aisles = sorted(grocery_list)
+    lines = []
+    for i, aisle in enumerate(aisles):
+        for item in sorted(grocery_list[aisle], key=lambda item: (item["name"], item["unit"])):
+            line = [i, item["name"], item["quantity"], item["unit"]]
+            extra = {k: v for k, v in item.items() if k not in ("name", "quantity", "unit")}
+            if extra:
+                line.append(extra)
+            lines.append(line)
+    payload = json.dumps({"aisles": aisles, "lines": lines}, separators=(",", ":"), default=str)
+    return zlib.compress(payload.encode(), 9)
+
+def unpack_grocery_list(payload: bytes) -> Dict[str, List[dict]]:
+    packed = json.loads(zlib.decompress(payload))
+    aisles = packed["aisles"]
+    grocery_list = {aisle: [] for aisle in aisles}
+    for line in packed["lines"]:
+        item = {"name": line[1], "quantity": line[2], "unit": line[3]}
+        if len(line) > 4:
+            item.update(line[4])
+        grocery_list[aisles[line[0]]].append(item)
+    return grocery_list
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.events import get_broker
+from app.db.session import SessionLocal
+from app.utils.grocery_diff import diff_grocery_lists, flatten_grocery_list, grocery_list_version
+
+KEEPALIVE_SECONDS = 15
+SNAPSHOT_CACHE_SIZE = 2048
+
+# (stream key, version) -> flattened list, so a reconnecting client that sends
+# Last-Event-ID gets a diff instead of the whole list again.
+_snapshots: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+def remember_snapshot(stream_key: str, version: str, flat: dict) -> None:
+    with _snapshots_lock:
+        _snapshots[(stream_key, version)] = flat
+        _snapshots.move_to_end((stream_key, version))
+        while len(_snapshots) > SNAPSHOT_CACHE_SIZE:
+            _snapshots.popitem(last=False)
+
+def recall_snapshot(stream_key: str, version: Optional[str]) -> Optional[dict]:
+    if not version:
+        return None
+    with _snapshots_lock:
+        return _snapshots.get((stream_key, version))
+
+def sse_event(event: str, version: str, data: dict) -> str:
+    return f"id: {version}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def grocery_event_stream(
+    request: Request,
+    stream_key: str,
+    watch_keys: Iterable,
+    compute: Callable[..., Dict[str, List[dict]]],
+    last_event_id: Optional[str] = None,
+    rewatch: Optional[Callable[..., Optional[Iterable]]] = None
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a grocery list:
+    - "snapshot" with the full list on first connect (or when the resume version is unknown),
+    - "diff" with added / changed / removed lines whenever a watched user writes,
+    - a comment line every KEEPALIVE_SECONDS so proxies keep the connection open.
+    Event ids are list versions; browsers send the last one back as Last-Event-ID on reconnect.
+
+    compute(db) is run in the threadpool with its own short-lived session,
+    so an idle stream does not hold a database connection.
+    watch_keys are the event keys (user ids, ...) whose changes wake the stream. rewatch(db),
+    if given, re-reads them on every reload, so e.g. members who join a household later are
+    watched too; when it returns None the stream ends (the client reconnects and is told why).
+    """
+    def load():
+        db = SessionLocal()
+        try:
+            keys = rewatch(db) if rewatch else None
+            if rewatch and keys is None:
+                return None
+            grocery_list = compute(db)
+        finally:
+            db.close()
+        return keys, grocery_list_version(grocery_list), flatten_grocery_list(grocery_list), grocery_list
+
+    broker = get_broker()
+    watched = {str(k) for k in watch_keys}
+    subscription = broker.subscribe(watched)
+
+    def follow(keys) -> None:
+        """Subscribe to the new set before dropping the old one, so no change falls in between."""
+        nonlocal subscription, watched
+        keys = {str(k) for k in keys} if keys is not None else watched
+        if keys == watched:
+            return
+        previous, subscription, watched = subscription, broker.subscribe(keys), keys
+        if previous.changed.is_set():
+            subscription.changed.set()
+        broker.unsubscribe(previous)
+
+    try:
+        loaded = await run_in_threadpool(load)
+        if loaded is None:
+            return
+        keys, version, flat, grocery_list = loaded
+        follow(keys)
+        remember_snapshot(stream_key, version, flat)
+
+        previous = recall_snapshot(stream_key, last_event_id)
+        if previous is None:
+            yield sse_event("snapshot", version, {"version": version, "items": grocery_list})
+        elif last_event_id != version:
+            yield sse_event("diff", version, {"version": version, "base": last_event_id, **diff_grocery_lists(previous, flat)})
+
+        while not await request.is_disconnected():
+            try:
+                await asyncio.wait_for(subscription.wait(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            loaded = await run_in_threadpool(load)
+            if loaded is None:
+                return
+            keys, new_version, new_flat, _ = loaded
+            follow(keys)
+            if new_version == version:
+                continue
+
+            remember_snapshot(stream_key, new_version, new_flat)
+            yield sse_event("diff", new_version, {"version": new_version, "base": version, **diff_grocery_lists(flat, new_flat)})
+            version, flat = new_version, new_flat
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,141 @@
+import re
+import threading
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from app.models.catalog_version import CatalogVersion
+from app.models.ingredient import Ingredient
+from app.models.ingredient_alias import IngredientAlias
+from uuid import UUID
+
+# --- Name Normalization ---
+
+# Words that describe the ingredient rather than name it ("fresh basil" is basil)
+DESCRIPTORS = {
+    "fresh", "large", "small", "medium", "ripe", "raw", "whole", "organic", "chopped", "diced",
+    "minced", "sliced", "grated", "shredded", "crushed", "finely", "roughly", "peeled",
+}
+NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def singular(word: str) -> str:
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("oes") or word.endswith("ches") or word.endswith("shes"):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def normalize_name(name: str) -> str:
+    """'Spring Onions' -> 'spring onion', 'Fresh Tomatoes' -> 'tomato', 'all-purpose flour' -> 'all purpose flour'."""
+    words = [singular(w) for w in NON_WORD.sub(" ", name.lower()).split() if w not in DESCRIPTORS]
+    return " ".join(words)
+
+def within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance of a and b is at most `limit` (stops as soon as a row exceeds it)."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+def deletions(key: str) -> set:
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+def typo_limit(key: str) -> int:
+    """Edits tolerated for a name this long: none for short words, where one letter is another food."""
+    if len(key) >= 10:
+        return 2
+    if len(key) >= 6:
+        return 1
+    return 0
+
+# --- In-Memory Index ---
+
+class IngredientIndex:
+    """
+    Every ingredient name and alias by normalized key, plus a deletion index for typos:
+    two words within one edit share a key-minus-one-letter, so candidates are a few dict
+    lookups instead of a scan (for two edits, only the name's side deletes twice, so
+    a double substitution is not caught). Matching a name runs no query.
+    """
+    def __init__(self, version: tuple, names: List[Tuple[UUID, str]], aliases: List[Tuple[UUID, str]]):
+        self.version = version
+        self.by_key: Dict[str, Tuple[UUID, str]] = {}
+        canonical = {ingredient_id: name for ingredient_id, name in names}
+        for ingredient_id, name in names + aliases:
+            key = normalize_name(name)
+            if key:
+                self.by_key.setdefault(key, (ingredient_id, canonical.get(ingredient_id, name)))
+        # Typo candidates: every key under itself and each one-letter deletion of it
+        self.deletions: Dict[str, List[str]] = {}
+        for key in self.by_key:
+            for variant in {key} | deletions(key):
+                self.deletions.setdefault(variant, []).append(key)
+
+    def lookup(self, name: str) -> Optional[Tuple[UUID, str]]:
+        """(ingredient id, canonical name) for an exact match of the normalized name or an alias."""
+        return self.by_key.get(normalize_name(name))
+
+    def resolve(self, name: str) -> Optional[Tuple[UUID, str]]:
+        """lookup(), else the one ingredient within typo_limit edits ("brocoli" -> Broccoli)."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        found = self.by_key.get(key)
+        if found:
+            return found
+
+        limit = typo_limit(key)
+        if not limit:
+            return None
+        variants = {key} | deletions(key)
+        if limit > 1:
+            variants |= {d for v in list(variants) for d in deletions(v)}
+        candidates = {candidate for v in variants for candidate in self.deletions.get(v, ())}
+        matches = {self.by_key[candidate] for candidate in candidates if within_distance(key, candidate, limit)}
+        # Two different ingredients equally close: don't guess
+        return matches.pop() if len({m[0] for m in matches}) == 1 else None
+
+    def match(self, name: str) -> Optional[Tuple[UUID, str]]:
+        """resolve(), else the longest trailing run of words: "all-purpose flour" -> Flour."""
+        found = self.resolve(name)
+        if found:
+            return found
+        words = normalize_name(name).split()
+        for start in range(1, len(words)):
+            found = self.by_key.get(" ".join(words[start:]))
+            if found:
+                return found
+        return None
+
+
+_index: Optional[IngredientIndex] = None
+_index_lock = threading.Lock()
+
+def ingredient_version(db: Session) -> int:
+    """The catalog version (one primary key read); every catalog write bumps it (bump_catalog_version)."""
+    return db.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar() or 0
+
+def get_ingredient_index(db: Session) -> IngredientIndex:
+    """The in-memory index, rebuilt only when the catalog changed since it was loaded."""
+    global _index
+    version = ingredient_version(db)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is not None and _index.version == version:
+            return _index
+        _index = IngredientIndex(
+            version,
+            db.query(Ingredient.id, Ingredient.name).all(),
+            db.query(IngredientAlias.ingredient_id, IngredientAlias.name).all()
+        )
+        return _index
@@ -0,0 +1,159 @@
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.orm import Session
+from typing import Dict, List
+from app.models.ingredient import Ingredient
+from app.models.ingredient_alias import IngredientAlias
+from app.models.ingredient_nutrition import IngredientNutrition
+from app.models.ingredient_price import IngredientPrice
+from app.models.inventory import Inventory
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.user import User
+from app.utils.data_version import bump_catalog_version
+from app.utils.grocery_logic import format_quantity, parse_quantity
+from app.utils.ingredient_matching import normalize_name
+from app.utils.search_logic import refresh_search_index
+from app.utils.sync_logic import log_changes, INVENTORY, RECIPE
+from app.utils.units import convert
+from uuid import UUID
+
+REINDEX_CHUNK = 1000
+
+def merge_ingredients(db: Session, target_id: UUID, source_ids: List[UUID]) -> dict:
+    """
+    Folds duplicate catalog entries (source_ids) into target_id, with set-based statements:
+    recipe lines are repointed in one UPDATE; inventory is repointed, or added into the owner's
+    target item when the units convert (otherwise the target item is kept and the other quantity
+    is dropped and reported); prices, nutrition and aliases move unless the target
+    has its own; the source names become aliases of the target. Then the sources are deleted,
+    and the affected recipes are reindexed and logged for sync under a bumped data version.
+
+    Returns the counts, the dropped inventory quantities ({user_id, quantity, unit}) and
+    {user id: data version} of the users whose data changed.
+    Does not commit.
+    """
+    target = db.get(Ingredient, target_id)
+    if target is None:
+        raise ValueError(f"Ingredient {target_id} not found")
+    sources = db.query(Ingredient).filter(Ingredient.id.in_(list(set(source_ids) - {target_id}))).all()
+    source_ids = [s.id for s in sources]
+    if not source_ids:
+        return {"merged": 0, "recipe_lines": 0, "inventory": 0, "recipes": 0, "dropped": [], "users": {}}
+
+    # --- Recipes ---
+    affected_recipes = db.execute(
+        select(Recipe.id, Recipe.user_id).distinct()
+        .join(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+        .where(RecipeIngredient.ingredient_id.in_(source_ids))
+    ).all()
+    recipe_lines = db.execute(
+        update(RecipeIngredient).where(RecipeIngredient.ingredient_id.in_(source_ids))
+        .values(ingredient_id=target_id).execution_options(synchronize_session=False)
+    ).rowcount
+
+    # --- Inventory: one item per ingredient, so a user holding both keeps one ---
+    items = db.query(Inventory.id, Inventory.user_id, Inventory.ingredient_id, Inventory.quantity, Inventory.unit).filter(
+        Inventory.ingredient_id.in_(source_ids + [target_id]),
+        Inventory.user_id.in_(select(Inventory.user_id).where(Inventory.ingredient_id.in_(source_ids)))
+    ).order_by(Inventory.ingredient_id != target_id, Inventory.id).all()  # Target items first
+
+    kept: Dict[UUID, list] = {}  # user -> [item id, quantity, unit] that the others are added into
+    repointed, removed, grown, dropped = [], [], set(), []
+    changed_items: Dict[UUID, set] = {}
+    for item_id, user_id, ingredient_id, quantity, unit in items:
+        holder = kept.get(user_id)
+        changed_items.setdefault(user_id, set()).add(item_id)
+        if holder is None:
+            if ingredient_id != target_id:
+                repointed.append(item_id)
+            kept[user_id] = [item_id, parse_quantity(quantity), unit]
+            continue
+
+        removed.append(item_id)
+        in_holder_unit = convert(parse_quantity(quantity), unit, holder[2])
+        if in_holder_unit is not None:
+            holder[1] += in_holder_unit
+            grown.add(holder[0])
+            continue
+        # No common unit: the kept item stays as it was, and the job result says what was dropped
+        dropped.append({"user_id": str(user_id), "quantity": quantity, "unit": unit})
+
+    if repointed:
+        db.execute(
+            update(Inventory).where(Inventory.id.in_(repointed))
+            .values(ingredient_id=target_id, version=Inventory.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    if removed:
+        totals = {item_id: format_quantity(qty) for item_id, qty, _ in kept.values() if item_id in grown}
+        if totals:
+            db.execute(
+                update(Inventory).where(Inventory.id.in_(list(totals)))
+                .values(quantity=case(totals, value=Inventory.id), version=Inventory.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+        db.execute(delete(Inventory).where(Inventory.id.in_(removed)).execution_options(synchronize_session=False))
+
+    # --- Prices, nutrition, aliases: the target's own win ---
+    stores = {store for (store,) in db.query(IngredientPrice.store).filter(IngredientPrice.ingredient_id == target_id)}
+    for price in db.query(IngredientPrice).filter(IngredientPrice.ingredient_id.in_(source_ids)).order_by(IngredientPrice.updated_at.desc()):
+        if price.store in stores:
+            db.delete(price)
+        else:
+            price.ingredient_id = target_id
+            stores.add(price.store)
+
+    has_nutrition = db.get(IngredientNutrition, target_id) is not None
+    for nutrition in db.query(IngredientNutrition).filter(IngredientNutrition.ingredient_id.in_(source_ids)):
+        if has_nutrition:
+            db.delete(nutrition)
+        else:
+            nutrition.ingredient_id = target_id
+            has_nutrition = True
+
+    db.execute(
+        update(IngredientAlias).where(IngredientAlias.ingredient_id.in_(source_ids))
+        .values(ingredient_id=target_id).execution_options(synchronize_session=False)
+    )
+    alias_keys = {key for (key,) in db.query(IngredientAlias.key)}
+    for source in sources:
+        key = normalize_name(source.name)
+        if key and key not in alias_keys and key != normalize_name(target.name):
+            db.add(IngredientAlias(ingredient_id=target_id, name=source.name, key=key))
+            alias_keys.add(key)
+
+    db.flush()
+    db.execute(delete(Ingredient).where(Ingredient.id.in_(source_ids)).execution_options(synchronize_session=False))
+    bump_catalog_version(db)
+
+    # --- Search documents and sync logs of everyone affected ---
+    recipe_ids = [recipe_id for recipe_id, _ in affected_recipes]
+    for start in range(0, len(recipe_ids), REINDEX_CHUNK):
+        refresh_search_index(db, recipe_ids[start:start + REINDEX_CHUNK])
+
+    user_ids = {user_id for _, user_id in affected_recipes} | set(changed_items)
+    versions = {}
+    if user_ids:
+        versions = dict(db.execute(
+            update(User).where(User.id.in_(list(user_ids)))
+            .values(data_version=User.data_version + 1)
+            .returning(User.id, User.data_version)
+            .execution_options(synchronize_session=False)
+        ).all())
+    recipes_by_user: Dict[UUID, list] = {}
+    for recipe_id, user_id in affected_recipes:
+        recipes_by_user.setdefault(user_id, []).append(recipe_id)
+    for user_id, user_recipe_ids in recipes_by_user.items():
+        log_changes(db, user_id, versions[user_id], RECIPE, user_recipe_ids)
+    removed_ids = set(removed)
+    for user_id, item_ids in changed_items.items():
+        log_changes(db, user_id, versions[user_id], INVENTORY, item_ids - removed_ids)
+        log_changes(db, user_id, versions[user_id], INVENTORY, item_ids & removed_ids, deleted=True)
+
+    return {
+        "merged": len(source_ids),
+        "recipe_lines": recipe_lines,
+        "inventory": len(repointed) + len(removed),
+        "recipes": len(recipe_ids),
+        "dropped": dropped,
+        "users": versions,
+    }
@@ -0,0 +1,121 @@
+import re
+from fractions import Fraction
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.utils.ingredient_matching import IngredientIndex, get_ingredient_index
+from app.utils.units import ALIASES, UNITS
+
+# --- Tables (compiled once, at import) ---
+
+UNICODE_FRACTIONS = {
+    "½": Fraction(1, 2), "⅓": Fraction(1, 3), "⅔": Fraction(2, 3), "¼": Fraction(1, 4), "¾": Fraction(3, 4),
+    "⅕": Fraction(1, 5), "⅖": Fraction(2, 5), "⅗": Fraction(3, 5), "⅘": Fraction(4, 5), "⅙": Fraction(1, 6),
+    "⅚": Fraction(5, 6), "⅛": Fraction(1, 8), "⅜": Fraction(3, 8), "⅝": Fraction(5, 8), "⅞": Fraction(7, 8),
+}
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "half": Fraction(1, 2),
+}
+# Units we can't convert between, but still want to split off the name
+COUNT_UNITS = {
+    "clove": "clove", "cloves": "clove", "can": "can", "cans": "can", "tin": "can", "tins": "can",
+    "pinch": "pinch", "pinches": "pinch", "dash": "dash", "dashes": "dash",
+    "bunch": "bunch", "bunches": "bunch", "slice": "slice", "slices": "slice",
+    "stick": "stick", "sticks": "stick", "handful": "handful", "handfuls": "handful",
+    "package": "package", "packages": "package", "pkg": "package", "packet": "packet", "packets": "packet",
+    "jar": "jar", "jars": "jar", "sprig": "sprig", "sprigs": "sprig", "head": "head", "heads": "head",
+    "bag": "bag", "bags": "bag", "bottle": "bottle", "bottles": "bottle",
+}
+UNIT_WORDS: Dict[str, str] = {
+    **{unit: unit for unit in UNITS},
+    **{alias: unit for alias, unit in ALIASES.items() if alias},
+    **COUNT_UNITS,
+}
+
+_fraction_chars = "".join(UNICODE_FRACTIONS)
+_number = rf"(?:\d+\s+\d+/\d+|\d+\s*[{_fraction_chars}]|\d+/\d+|\d*\.\d+|\d+|[{_fraction_chars}])"
+_word = "|".join(sorted(NUMBER_WORDS, key=len, reverse=True))
+_unit = "|".join(re.escape(u) for u in sorted(UNIT_WORDS, key=len, reverse=True))
+
+LINE_PATTERN = re.compile(
+    rf"""^\s*
+    (?:(?P<qty>{_number}|(?:{_word})(?=\s))            # 2 1/2 | 1½ | 0.5 | a | two
+       (?:\s*(?:-|–|to)\s*{_number})?                  # ranges (2-3): the first number is used
+    )?\s*
+    (?:(?P<unit>{_unit})\.?(?![a-z]))?\s*              # cups | g | tbsp.
+    (?:of\s+)?
+    (?P<name>.*?)\s*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+PARENTHESES = re.compile(r"\(([^)]*)\)")
+# "salt to taste", "parsley for garnish": the tail is a note, not part of the name
+NOTE_TAIL = re.compile(r"\s+(?:to taste|as needed|if needed|optional|for garnish|for serving|for frying)\b.*$", re.IGNORECASE)
+SPACES = re.compile(r"\s+")
+
+def parse_amount(text: str) -> Optional[Fraction]:
+    text = text.strip().lower()
+    if text in NUMBER_WORDS:
+        return Fraction(NUMBER_WORDS[text])
+    total = Fraction(0)
+    for part in text.split():
+        if part[-1] in UNICODE_FRACTIONS:
+            total += UNICODE_FRACTIONS[part[-1]]
+            part = part[:-1]
+        if part:
+            try:
+                total += Fraction(part)
+            except ZeroDivisionError:  # "1/0"
+                return None
+    return total
+
+def format_amount(amount: Fraction) -> str:
+    """A quantity string grocery_logic.parse_quantity understands: '2', '5/2', '0.333'."""
+    if amount.denominator == 1:
+        return str(amount.numerator)
+    if amount.denominator <= 16:
+        return f"{amount.numerator}/{amount.denominator}"
+    return f"{float(amount):.3f}".rstrip("0").rstrip(".")
+
+def load_catalog(db: Session) -> IngredientIndex:
+    """What parsed names are matched against: the catalog's names and aliases."""
+    return get_ingredient_index(db)
+
+
+def parse_line(text: str, catalog: Optional[IngredientIndex] = None) -> dict:
+    """
+    "2 1/2 cups all-purpose flour, sifted" ->
+    {"quantity": "5/2", "amount": 2.5, "unit": "cup", "name": "all-purpose flour", "note": "sifted",
+     "ingredient_id": <Flour's id>, "matched_name": "Flour"}
+    Lines without a quantity get quantity "1" (e.g. "salt to taste").
+    """
+    cleaned = SPACES.sub(" ", PARENTHESES.sub(" ", text)).strip().lstrip("-•*").strip()
+    match = LINE_PATTERN.match(cleaned)
+    qty, unit, rest = match.group("qty"), match.group("unit"), match.group("name")
+
+    name, _, note = rest.partition(",")
+    name = name.strip(" .;:")
+    notes = [note.strip()]
+    tail = NOTE_TAIL.search(name)
+    if tail:
+        name, notes = name[:tail.start()], [tail.group().strip()] + notes
+    if "(" in text:
+        notes += [aside.strip() for aside in PARENTHESES.findall(text)]
+    if not name and unit:
+        # "2 cans" - the "unit" was the thing itself
+        name, unit = unit, None
+
+    amount = parse_amount(qty) if qty else None
+    found = catalog.match(name) if catalog and name else None
+    return {
+        "text": text,
+        "quantity": format_amount(amount) if amount is not None else "1",
+        "amount": float(amount) if amount is not None else None,
+        "unit": UNIT_WORDS.get(unit.lower().rstrip(".")) if unit else None,
+        "name": name,
+        "note": ", ".join(filter(None, notes)) or None,
+        "ingredient_id": found[0] if found else None,
+        "matched_name": found[1] if found else None,
+    }
+
+def parse_lines(lines: List[str], catalog: Optional[IngredientIndex] = None) -> List[dict]:
+    return [parse_line(line, catalog) for line in lines]
@@ -0,0 +1,48 @@
+from sqlalchemy.orm import Session
+from uuid import UUID
+from app.core.events import publish_change
+from app.core.jobs import register_job
+from app.core.security import is_admin
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.utils.grocery_logic import generate_grocery_list
+from app.utils.ingredient_merge import merge_ingredients
+from app.utils.search_logic import refresh_search_index
+from app.utils.suggestion_logic import suggest_recipes
+
+# --- Background Jobs ---
+# Each handler gets its own session, runs in the worker pool, and returns a JSON-able result
+# that is stored on the job (GET /jobs/{id}). Handlers that write must commit themselves.
+
+@register_job("recipe_suggestions")
+def rank_suggestions(db: Session, user_id: UUID, params: dict):
+    """Recipes ranked by how much of them the user already has (GET /recipes/suggestions)."""
+    return suggest_recipes(db, user_id)
+
+@register_job("grocery_list")
+def materialize_grocery_list(db: Session, user_id: UUID, params: dict):
+    """The grocery list for the user's selected recipes, e.g. to prefetch before a trip."""
+    return generate_grocery_list(db, user_id, float(params.get("servings_multiplier", 1.0)))
+
+@register_job("search_reindex")
+def rebuild_search_index(db: Session, user_id: UUID, params: dict):
+    """Recomputes the search documents of all the user's recipes."""
+    recipe_ids = [recipe_id for (recipe_id,) in db.query(Recipe.id).filter(Recipe.user_id == user_id)]
+    refresh_search_index(db, recipe_ids)
+    db.commit()
+    return {"recipes": len(recipe_ids)}
+
+@register_job("ingredient_merge", admin_only=True)
+def merge_duplicate_ingredients(db: Session, user_id: UUID, params: dict):
+    """
+    Folds catalog duplicates into one ingredient (admins only; POST /ingredients/merge).
+    params: {"target_id": ..., "source_ids": [...]}
+    """
+    user = db.get(User, user_id)
+    if user is None or not is_admin(user.email):
+        raise PermissionError("Only admins can merge ingredients")
+    result = merge_ingredients(db, UUID(str(params["target_id"])), [UUID(str(i)) for i in params.get("source_ids", [])])
+    db.commit()
+    for changed_user_id in result.pop("users"):
+        publish_change(changed_user_id)
+    return result
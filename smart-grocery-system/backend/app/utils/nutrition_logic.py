@@ -0,0 +1,116 @@
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable
+from app.models.ingredient import Ingredient
+from app.models.ingredient_nutrition import IngredientNutrition
+from app.models.recipe import Recipe, RecipeIngredient
+from app.utils.grocery_logic import parse_quantity
+from app.utils.units import convert
+from uuid import UUID
+
+NUTRIENTS = ("calories", "protein", "carbs", "fat", "fiber")
+
+def as_dict(values) -> Dict[str, float]:
+    return {name: round(float(v), 1) for name, v in zip(NUTRIENTS, values)}
+
+def nutrition_version(db: Session) -> str:
+    """Changes whenever nutrient data is added or changed (for ETags)."""
+    count, last_update = db.query(func.count(IngredientNutrition.ingredient_id), func.max(IngredientNutrition.updated_at)).one()
+    # Full precision: two edits in the same second must still change it (isoformat: no spaces in an ETag)
+    return f"{count}.{last_update.isoformat() if last_update else 0}"
+
+def recipe_nutrition(db: Session, recipe_ids: Iterable[UUID]) -> Dict[UUID, dict]:
+    """
+    Nutrient totals for many recipes at once: every usable recipe line adds its amount
+    (in the ingredient's nutrition unit) times that ingredient's row of N (ingredients x
+    nutrients) into its recipe's row of the totals. Memory stays lines + recipes x nutrients,
+    never recipes x ingredients. Two queries and one scatter-add, however many recipes.
+    recipe_id -> {"total": {...}, "missing": [names of lines without usable nutrient data]}
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return {}
+
+    lines = db.query(
+        RecipeIngredient.recipe_id,
+        RecipeIngredient.ingredient_id,
+        RecipeIngredient.quantity,
+        RecipeIngredient.unit,
+        Ingredient.name
+    ).join(Ingredient, RecipeIngredient.ingredient_id == Ingredient.id)\
+     .filter(RecipeIngredient.recipe_id.in_(recipe_ids)).all()
+
+    facts = db.query(IngredientNutrition).filter(
+        IngredientNutrition.ingredient_id.in_(list({line.ingredient_id for line in lines}))
+    ).all() if lines else []
+
+    # --- N: one row per ingredient with data ---
+    column = {f.ingredient_id: i for i, f in enumerate(facts)}
+    nutrients = np.array([[getattr(f, n) or 0.0 for n in NUTRIENTS] for f in facts], dtype=float).reshape(len(facts), len(NUTRIENTS))
+
+    # --- Sparse lines: (recipe row, ingredient row of N, amount) ---
+    row = {recipe_id: i for i, recipe_id in enumerate(recipe_ids)}
+    rows, cols, amounts = [], [], []
+    missing = {recipe_id: [] for recipe_id in recipe_ids}
+    for recipe_id, ingredient_id, quantity, unit, name in lines:
+        j = column.get(ingredient_id)
+        amount = convert(parse_quantity(quantity), unit, facts[j].unit) if j is not None else None
+        if amount is None:
+            missing[recipe_id].append(name)
+            continue
+        rows.append(row[recipe_id])
+        cols.append(j)
+        amounts.append(amount / (facts[j].per_quantity or 1.0))
+
+    totals = np.zeros((len(recipe_ids), len(NUTRIENTS)))
+    cols = np.array(cols, dtype=int)
+    np.add.at(totals, np.array(rows, dtype=int), np.array(amounts, dtype=float)[:, None] * nutrients[cols])
+
+    return {
+        recipe_id: {"total": totals[row[recipe_id]], "missing": missing[recipe_id]}
+        for recipe_id in recipe_ids
+    }
+
+def recipe_nutrition_summary(db: Session, recipe: Recipe) -> dict:
+    """Totals and per serving for one recipe."""
+    result = recipe_nutrition(db, [recipe.id])[recipe.id]
+    servings = recipe.servings or 1
+    return {
+        "recipe_id": recipe.id,
+        "servings": servings,
+        "total": as_dict(result["total"]),
+        "per_serving": as_dict(result["total"] / servings),
+        "missing_ingredients": result["missing"]
+    }
+
+def selection_nutrition(db: Session, user_id: UUID, servings_multiplier: float = 1.0) -> dict:
+    """
+    Nutrients in everything the user's selected recipes make, each scaled to its
+    target servings (and by servings_multiplier) like the grocery list.
+    """
+    selected = db.query(Recipe.id, Recipe.title, Recipe.servings, Recipe.target_servings).filter(
+        Recipe.user_id == user_id,
+        Recipe.is_selected == True
+    ).all()
+    per_recipe = recipe_nutrition(db, [r.id for r in selected])
+
+    scales = np.array([
+        (r.target_servings / r.servings if r.target_servings and r.servings else 1.0) * servings_multiplier
+        for r in selected
+    ], dtype=float)
+    totals = np.array([per_recipe[r.id]["total"] for r in selected], dtype=float).reshape(len(selected), len(NUTRIENTS))
+    scaled = totals * scales[:, None]
+
+    return {
+        "total": as_dict(scaled.sum(axis=0)),
+        "recipes": [
+            {
+                "recipe_id": r.id,
+                "title": r.title,
+                "total": as_dict(scaled[i]),
+                "missing_ingredients": per_recipe[r.id]["missing"]
+            }
+            for i, r in enumerate(selected)
+        ]
+    }
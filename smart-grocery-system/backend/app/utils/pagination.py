@@ -0,0 +1,20 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+from fastapi import HTTPException
+from uuid import UUID
+
+# --- Keyset cursors ---
+# A cursor is the (created_at, id) of the last row on the previous page; the next page is
+# everything ordered after it, so rows added meanwhile are neither skipped nor repeated
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """(created_at, id) from encode_cursor; 400 for anything else."""
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from app.models.ingredient_price import IngredientPrice
+from app.utils.units import convert, normalize_unit
+from uuid import UUID
+
+class PriceIndex:
+    """
+    Every ingredient price, in memory: ingredient_id -> [(store, unit, price per unit)].
+    Pricing a line is a dict lookup and a unit conversion, no query.
+    """
+    def __init__(self, version: tuple, prices: Dict[UUID, List[Tuple[str, str, float]]]):
+        self.version = version
+        self.prices = prices
+        self.tag = hashlib.sha1(repr(version).encode()).hexdigest()[:10]  # For ETags
+
+    def line_cost(self, ingredient_id: UUID, qty: float, unit: Optional[str], cheapest_store: bool = False) -> Optional[Tuple[float, str]]:
+        """
+        (cost, store) for qty of the ingredient, or None if it has no price in a compatible unit.
+        Normally the typical price (store "") is used, else the average over stores;
+        with cheapest_store, the store where it costs least.
+        """
+        costs = []
+        for store, price_unit, price in self.prices.get(ingredient_id, ()):
+            in_price_unit = convert(qty, unit, price_unit)
+            if in_price_unit is not None:
+                costs.append((in_price_unit * price, store))
+        if not costs:
+            return None
+
+        if cheapest_store:
+            stores = [c for c in costs if c[1]] or costs
+            return min(stores)
+        for cost, store in costs:
+            if not store:
+                return cost, ""
+        return sum(cost for cost, _ in costs) / len(costs), ""
+
+    def price_lines(self, needed_map: dict, cheapest_store: bool = False) -> Dict[tuple, dict]:
+        """(ingredient_id, unit) -> {"cost", "store"} for the lines of a needed_map that have a price."""
+        priced = {}
+        for (ing_id, unit), data in needed_map.items():
+            if data['qty'] <= 0:
+                continue
+            found = self.line_cost(ing_id, data['qty'], unit, cheapest_store)
+            if found:
+                cost, store = found
+                priced[(ing_id, unit)] = {"cost": round(cost, 2), "store": store or None}
+        return priced
+
+
+_index: Optional[PriceIndex] = None
+_index_lock = threading.Lock()
+
+def price_version(db: Session) -> tuple:
+    """Changes whenever a price is added, changed or removed (one indexed aggregate, no row reads)."""
+    count, last_update = db.query(func.count(IngredientPrice.id), func.max(IngredientPrice.updated_at)).one()
+    return (count, str(last_update))
+
+def get_price_index(db: Session) -> PriceIndex:
+    """The in-memory index, rebuilt only when the prices table changed since it was loaded."""
+    global _index
+    version = price_version(db)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is not None and _index.version == version:
+            return _index
+        prices = {}
+        for ingredient_id, store, unit, price in db.query(
+            IngredientPrice.ingredient_id, IngredientPrice.store, IngredientPrice.unit, IngredientPrice.price
+        ):
+            prices.setdefault(ingredient_id, []).append((store or "", normalize_unit(unit), float(price)))
+        _index = PriceIndex(version, prices)
+        return _index
+
+def cost_summary(grocery: Dict[str, List[dict]]) -> dict:
+    """Per-aisle (and per-store) subtotals and the total, from lines priced by PriceIndex.price_lines."""
+    subtotals, store_subtotals = {}, {}
+    unpriced = 0
+    for aisle, lines in grocery.items():
+        for line in lines:
+            if line.get("cost") is None:
+                unpriced += 1
+                continue
+            subtotals[aisle] = subtotals.get(aisle, 0.0) + line["cost"]
+            if line.get("store"):
+                store_subtotals[line["store"]] = store_subtotals.get(line["store"], 0.0) + line["cost"]
+    return {
+        "items": grocery,
+        "subtotals": {aisle: round(total, 2) for aisle, total in subtotals.items()},
+        "store_subtotals": {store: round(total, 2) for store, total in store_subtotals.items()},
+        "total": round(sum(subtotals.values()), 2),
+        "unpriced_items": unpriced
+    }
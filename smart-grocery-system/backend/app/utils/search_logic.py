@@ -0,0 +1,119 @@
+from sqlalchemy import bindparam, column, desc, exists, func, or_, table, text
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Iterable, List, Optional
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.ingredient import Ingredient
+from uuid import UUID
+
+# --- Index Maintenance ---
+# Postgres: recipes.search_vector (tsvector, GIN indexed), weighted title > ingredients > instructions.
+# SQLite (local runs / tests): an FTS5 table with the same three fields.
+
+PG_REFRESH = text("""
+    UPDATE recipes SET search_vector =
+        setweight(to_tsvector('english', coalesce(recipes.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(ingredients.name, ' ')
+            FROM recipe_ingredients JOIN ingredients ON ingredients.id = recipe_ingredients.ingredient_id
+            WHERE recipe_ingredients.recipe_id = recipes.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(recipes.instructions, '')), 'C')
+    WHERE recipes.id IN :ids
+""")
+
+SQLITE_CREATE = text(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts "
+    "USING fts5(recipe_id UNINDEXED, title, ingredients, instructions)"
+)
+SQLITE_DELETE = text("DELETE FROM recipes_fts WHERE recipe_id IN :ids")
+SQLITE_INSERT = text("""
+    INSERT INTO recipes_fts (recipe_id, title, ingredients, instructions)
+    SELECT recipes.id, recipes.title, coalesce((
+        SELECT group_concat(ingredients.name, ' ')
+        FROM recipe_ingredients JOIN ingredients ON ingredients.id = recipe_ingredients.ingredient_id
+        WHERE recipe_ingredients.recipe_id = recipes.id
+    ), ''), coalesce(recipes.instructions, '')
+    FROM recipes WHERE recipes.id IN :ids
+""")
+
+recipes_fts = table("recipes_fts", column("recipe_id"), column("rank"))
+
+def _ids_param(statement):
+    return statement.bindparams(bindparam("ids", expanding=True, type_=Recipe.id.type))
+
+def refresh_search_index(db: Session, recipe_ids: Iterable[UUID]) -> None:
+    """
+    Recomputes the search document of the given recipes from their current title,
+    instructions and ingredient names. Call after writing them, before commit.
+    """
+    ids = list(recipe_ids)
+    if not ids:
+        return
+
+    # The session doesn't autoflush, and the SQL below reads the new rows
+    db.flush()
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(_ids_param(PG_REFRESH), {"ids": ids})
+    elif dialect == "sqlite":
+        db.execute(SQLITE_CREATE)
+        db.execute(_ids_param(SQLITE_DELETE), {"ids": ids})
+        db.execute(_ids_param(SQLITE_INSERT), {"ids": ids})
+
+# --- Search ---
+
+def _ingredient_match(term: str):
+    """The recipe has an ingredient whose name or aisle matches `term` ("chicken", "dairy")."""
+    # % and _ in the term are literal characters, not wildcards
+    escaped = term.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return exists().where(
+        RecipeIngredient.recipe_id == Recipe.id,
+        RecipeIngredient.ingredient_id == Ingredient.id,
+        or_(
+            func.lower(Ingredient.name).like(pattern, escape="\\"),
+            func.lower(Ingredient.aisle).like(pattern, escape="\\")
+        )
+    )
+
+def _fts5_query(q: str) -> str:
+    # Quote every word so user input can't break FTS5 syntax; words are ANDed
+    return " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
+
+def search_recipes(
+    db: Session,
+    user_id: UUID,
+    q: Optional[str] = None,
+    has: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    limit: int = 20
+) -> List[Recipe]:
+    """
+    The user's recipes matching `q` (best match first), that contain every `has`
+    ingredient and none of the `exclude` ones (matched on ingredient name or aisle).
+    """
+    query = db.query(Recipe).filter(Recipe.user_id == user_id).options(
+        selectinload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient)
+    )
+
+    for term in has or []:
+        query = query.filter(_ingredient_match(term))
+    for term in exclude or []:
+        query = query.filter(~_ingredient_match(term))
+
+    if q and q.strip():
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            ts_query = func.websearch_to_tsquery("english", q)
+            query = query.filter(Recipe.search_vector.op("@@")(ts_query))\
+                .order_by(desc(func.ts_rank_cd(Recipe.search_vector, ts_query)))
+        else:
+            db.execute(SQLITE_CREATE)
+            query = query.join(recipes_fts, recipes_fts.c.recipe_id == Recipe.id)\
+                .filter(text("recipes_fts MATCH :fts_query").bindparams(fts_query=_fts5_query(q)))\
+                .order_by(recipes_fts.c.rank)
+    else:
+        query = query.order_by(Recipe.title)
+
+    return query.limit(limit).all()
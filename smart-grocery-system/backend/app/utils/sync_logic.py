@@ -0,0 +1,160 @@
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session, joinedload
+from typing import Dict, Iterable, Tuple
+from app.core.config import settings
+from app.models.change_log import ChangeLog
+from app.models.inventory import Inventory
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.user import User
+from uuid import UUID
+
+RECIPE = "recipe"
+RECIPE_INGREDIENT = "recipe_ingredient"
+INVENTORY = "inventory"
+
+PRUNE_EVERY = 100  # A user's log is trimmed on every PRUNE_EVERY-th write
+
+def log_changes(db: Session, user_id: UUID, version: int, entity: str, ids: Iterable[UUID], deleted: bool = False) -> None:
+    """
+    Records that these rows changed (or were deleted) in the write that got `version`
+    from bump_data_version. Does not commit.
+    """
+    rows = [
+        {"user_id": user_id, "version": version, "entity": entity, "entity_id": entity_id, "deleted": deleted}
+        for entity_id in set(ids)
+    ]
+    if rows:
+        db.execute(insert(ChangeLog), rows)
+    if version % PRUNE_EVERY == 0:
+        prune_change_log(db, user_id, version)
+
+def prune_change_log(db: Session, user_id: UUID, version: int) -> None:
+    """
+    Drops the user's entries older than the last CHANGE_LOG_KEEP_VERSIONS writes (an index
+    range on (user_id, version)). changes_since answers older cursors with the full state.
+    """
+    db.execute(delete(ChangeLog).where(
+        ChangeLog.user_id == user_id,
+        ChangeLog.version <= version - settings.CHANGE_LOG_KEEP_VERSIONS
+    ).execution_options(synchronize_session=False))
+
+def changed_since(db: Session, user_id: UUID, since: int, cursor: int) -> Dict[Tuple[str, UUID], bool]:
+    """(entity, id) -> deleted, for the last change to each row in (since, cursor]."""
+    entries = db.query(ChangeLog.entity, ChangeLog.entity_id, ChangeLog.deleted).filter(
+        ChangeLog.user_id == user_id,
+        ChangeLog.version > since,
+        ChangeLog.version <= cursor
+    ).order_by(ChangeLog.version, ChangeLog.id).all()
+
+    latest = {}
+    for entity, entity_id, deleted in entries:
+        latest[(entity, entity_id)] = deleted
+    return latest
+
+def recipe_line(ri: RecipeIngredient) -> dict:
+    return {
+        "id": ri.id,
+        "recipe_id": ri.recipe_id,
+        "ingredient_id": ri.ingredient_id,
+        "name": ri.ingredient.name,
+        "quantity": ri.quantity,
+        "unit": ri.unit,
+        "updated_at": ri.updated_at
+    }
+
+def load_state(db: Session, user_id: UUID, recipe_ids=None, line_ids=(), inventory_ids=None) -> dict:
+    """
+    The current rows, serialized for sync: recipes (with every line of each), the extra
+    lines in line_ids, and inventory items. recipe_ids / inventory_ids of None mean all of them.
+    """
+    # --- Recipes (and every line of each) ---
+    recipes = []
+    if recipe_ids is None or recipe_ids:
+        query = db.query(Recipe).filter(Recipe.user_id == user_id)
+        if recipe_ids is not None:
+            query = query.filter(Recipe.id.in_(recipe_ids))
+        recipes = query.options(joinedload(Recipe.ingredients).joinedload(RecipeIngredient.ingredient)).all()
+
+    lines = [ri for r in recipes for ri in r.ingredients]
+    # Lines changed on their own, outside a recipe we already send
+    loose_line_ids = set(line_ids) - {ri.id for ri in lines}
+    if loose_line_ids:
+        lines += db.query(RecipeIngredient).join(Recipe, RecipeIngredient.recipe_id == Recipe.id).filter(
+            Recipe.user_id == user_id,
+            RecipeIngredient.id.in_(loose_line_ids)
+        ).options(joinedload(RecipeIngredient.ingredient)).all()
+
+    # --- Inventory ---
+    items = []
+    if inventory_ids is None or inventory_ids:
+        query = db.query(Inventory).filter(Inventory.user_id == user_id)
+        if inventory_ids is not None:
+            query = query.filter(Inventory.id.in_(inventory_ids))
+        items = query.options(joinedload(Inventory.ingredient)).all()
+
+    return {
+        "recipes": [
+            {
+                "id": r.id,
+                "title": r.title,
+                "instructions": r.instructions,
+                "servings": r.servings,
+                "is_selected": bool(r.is_selected),
+                "target_servings": r.target_servings,
+                "is_shared_to_friends": bool(r.is_shared_to_friends),
+                "version": r.version,
+                "updated_at": r.updated_at
+            }
+            for r in recipes
+        ],
+        "recipe_ingredients": [recipe_line(ri) for ri in lines],
+        "inventory": [
+            {
+                "id": i.id,
+                "ingredient_id": i.ingredient_id,
+                "ingredient_name": i.ingredient.name,
+                "quantity": i.quantity,
+                "unit": i.unit,
+                "version": i.version,
+                "updated_at": i.updated_at
+            }
+            for i in items
+        ],
+    }
+
+def changes_since(db: Session, user: User, since: int) -> dict:
+    """
+    Everything the user's offline copy is missing since the `since` cursor:
+    changed recipes (with all their lines), changed inventory, and tombstones for deletes.
+    since=0, a cursor this server never issued, or one older than the retained change log
+    (CHANGE_LOG_KEEP_VERSIONS writes) returns the full state instead.
+    """
+    cursor = user.data_version or 0
+    result = {"cursor": cursor, "full": False, "recipes": [], "recipe_ingredients": [], "inventory": [], "deleted": {}}
+    if since == cursor:
+        return result
+
+    if since <= 0 or since > cursor or since < cursor - settings.CHANGE_LOG_KEEP_VERSIONS:
+        result.update(load_state(db, user.id), full=True)
+        return result
+
+    changed = changed_since(db, user.id, since, cursor)
+    ids = {RECIPE: set(), RECIPE_INGREDIENT: set(), INVENTORY: set()}
+    for entity, entity_id in changed:
+        ids[entity].add(entity_id)
+
+    live_line_ids = {i for i in ids[RECIPE_INGREDIENT] if not changed[(RECIPE_INGREDIENT, i)]}
+    result.update(load_state(db, user.id, ids[RECIPE], live_line_ids, ids[INVENTORY]))
+
+    # --- Tombstones: anything logged that is no longer there ---
+    found = {
+        RECIPE: {r["id"] for r in result["recipes"]},
+        RECIPE_INGREDIENT: {ri["id"] for ri in result["recipe_ingredients"]},
+        INVENTORY: {i["id"] for i in result["inventory"]},
+    }
+    result["deleted"] = {
+        "recipes": sorted(ids[RECIPE] - found[RECIPE], key=str),
+        "recipe_ingredients": sorted(ids[RECIPE_INGREDIENT] - found[RECIPE_INGREDIENT], key=str),
+        "inventory": sorted(ids[INVENTORY] - found[INVENTORY], key=str),
+    }
+    return result
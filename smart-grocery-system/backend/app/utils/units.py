@@ -0,0 +1,56 @@
+from typing import Optional
+
+# --- Unit Conversion ---
+# unit -> (dimension, factor to the dimension's base unit: grams, millilitres, pieces)
+UNITS = {
+    "g": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "mg": ("mass", 0.001),
+    "oz": ("mass", 28.3495),
+    "lb": ("mass", 453.592),
+    "ml": ("volume", 1.0),
+    "l": ("volume", 1000.0),
+    "dl": ("volume", 100.0),
+    "cl": ("volume", 10.0),
+    "tsp": ("volume", 4.92892),
+    "tbsp": ("volume", 14.7868),
+    "cup": ("volume", 236.588),
+    "fl oz": ("volume", 29.5735),
+    "pint": ("volume", 473.176),
+    "whole": ("count", 1.0),
+    "dozen": ("count", 12.0),
+}
+
+ALIASES = {
+    "gram": "g", "grams": "g", "gr": "g",
+    "kilogram": "kg", "kilograms": "kg", "kilo": "kg", "kilos": "kg", "kgs": "kg",
+    "milligram": "mg", "milligrams": "mg",
+    "ounce": "oz", "ounces": "oz",
+    "pound": "lb", "pounds": "lb", "lbs": "lb",
+    "millilitre": "ml", "milliliter": "ml", "millilitres": "ml", "milliliters": "ml",
+    "litre": "l", "liter": "l", "litres": "l", "liters": "l", "ltr": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsps": "tbsp", "tbs": "tbsp",
+    "cups": "cup", "c": "cup",
+    "floz": "fl oz", "fluid ounce": "fl oz", "fluid ounces": "fl oz",
+    "pints": "pint", "pt": "pint",
+    "": "whole", "pc": "whole", "pcs": "whole", "piece": "whole", "pieces": "whole", "each": "whole", "x": "whole",
+}
+
+def normalize_unit(unit: Optional[str]) -> str:
+    """'Grams' -> 'g', None -> 'whole'. Unknown units come back lower-cased and trimmed."""
+    key = (unit or "").strip().lower().rstrip(".")
+    return ALIASES.get(key, key)
+
+def convert(qty: float, from_unit: Optional[str], to_unit: Optional[str]) -> Optional[float]:
+    """
+    qty in from_unit expressed in to_unit, or None if the two aren't comparable
+    (different dimensions, or a unit we don't know that isn't literally the same).
+    """
+    source, target = normalize_unit(from_unit), normalize_unit(to_unit)
+    if source == target:
+        return qty
+    source_info, target_info = UNITS.get(source), UNITS.get(target)
+    if not source_info or not target_info or source_info[0] != target_info[0]:
+        return None
+    return qty * source_info[1] / target_info[1]
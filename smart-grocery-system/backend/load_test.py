@@ -0,0 +1,315 @@
+"""
+Load-testing harness for the Smart Grocery API.
+
+Replays weighted user journeys (log in, browse recipes, toggle selections,
+fetch the grocery list, update inventory) with a ramping number of concurrent
+virtual shoppers, and reports throughput, error rate and latency percentiles
+per step for every stage, plus the stage where the API saturates.
+
+Every request uses the same paths, methods and payloads as the web frontend
+(see web/src/app/*/page.tsx and web/src/lib/api.ts).
+
+Usage (from the backend/ folder):
+
+    # In-process, against the ASGI app and the DATABASE_URL in .env
+    python load_test.py --stages 10,50,100,250,500 --duration 20
+
+    # In-process on a throwaway in-memory SQLite database (quick comparisons of
+    # application code; PostgreSQL numbers come from the run above)
+    DATABASE_URL=sqlite:// python load_test.py --stages 10,50 --duration 5
+
+    # Against a running server (uvicorn app.main:app --workers 4)
+    # All shoppers come from one IP, so start it with RATE_LIMIT_ENABLED=false
+    python load_test.py --base-url http://localhost:8000 --stages 50,200,500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+API_PREFIX = "/api/v1"
+PASSWORD = "load-test-password"
+
+
+# --- Metrics ---
+
+class StageStats:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.elapsed = 0.0
+
+    def record(self, step: str, seconds: float, ok: bool) -> None:
+        self.latencies[step].append(seconds * 1000)
+        if not ok:
+            self.errors[step] += 1
+
+    @property
+    def requests(self) -> int:
+        return sum(len(v) for v in self.latencies.values())
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.error_count / self.requests if self.requests else 0.0
+
+    def p95(self) -> float:
+        all_latencies = [ms for v in self.latencies.values() for ms in v]
+        return percentile(all_latencies, 95)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# --- Virtual Shopper ---
+
+class Shopper:
+    """One simulated browser session: a user, its token and its recipe/inventory ids."""
+
+    def __init__(self, client: httpx.AsyncClient, email: str):
+        self.client = client
+        self.email = email
+        self.token: Optional[str] = None
+        self.recipe_ids: List[str] = []
+        self.inventory_ids: List[str] = []
+        self.ingredients: List[dict] = []
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    async def call(self, stats: StageStats, step: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, API_PREFIX + path, headers=self.headers, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        stats.record(step, time.perf_counter() - start, ok)
+        return response if ok else None
+
+    # --- Steps (mirroring the frontend calls) ---
+
+    async def login(self, stats: StageStats) -> None:
+        # login/page.tsx posts form data, like OAuth2PasswordRequestForm expects
+        response = await self.call(
+            stats, "login", "POST", "/auth/login",
+            data={"username": self.email, "password": PASSWORD},
+        )
+        if response is not None:
+            self.token = response.json()["access_token"]
+
+    async def browse_recipes(self, stats: StageStats) -> None:
+        response = await self.call(stats, "list recipes", "GET", "/recipes")
+        if response is not None:
+            self.recipe_ids = [r["id"] for r in response.json()]
+        if self.recipe_ids:
+            await self.call(stats, "read recipe", "GET", f"/recipes/{random.choice(self.recipe_ids)}")
+
+    async def toggle_selection(self, stats: StageStats) -> None:
+        if not self.recipe_ids:
+            await self.browse_recipes(stats)
+        if self.recipe_ids:
+            await self.call(
+                stats, "toggle selection", "PATCH", f"/recipes/{random.choice(self.recipe_ids)}/select",
+                json={"is_selected": random.random() < 0.6},
+            )
+
+    async def grocery_list(self, stats: StageStats) -> None:
+        # grocery-list/page.tsx loads the recipes and the list side by side
+        await asyncio.gather(
+            self.call(stats, "list recipes", "GET", "/recipes"),
+            self.call(stats, "grocery list", "GET", "/grocery"),
+        )
+
+    async def suggestions(self, stats: StageStats) -> None:
+        await self.call(stats, "suggestions", "GET", "/recipes/suggestions")
+
+    async def update_inventory(self, stats: StageStats) -> None:
+        response = await self.call(stats, "list inventory", "GET", "/inventory")
+        if response is not None:
+            self.inventory_ids = [i["id"] for i in response.json()]
+        if self.inventory_ids and random.random() < 0.7:
+            await self.call(
+                stats, "update inventory", "PUT", f"/inventory/{random.choice(self.inventory_ids)}",
+                json={"quantity": str(random.randint(0, 5)), "unit": "unit"},
+            )
+        elif self.ingredients:
+            ing = random.choice(self.ingredients)
+            await self.call(
+                stats, "add inventory", "POST", "/inventory",
+                json={"ingredient_id": ing["id"], "quantity": "1", "unit": ing.get("default_unit") or "unit"},
+            )
+
+
+# Weighted journeys: (weight, name, steps)
+JOURNEYS: List[tuple] = [
+    (5, "re-login", [Shopper.login]),
+    (30, "browse", [Shopper.browse_recipes]),
+    (20, "plan meals", [Shopper.browse_recipes, Shopper.toggle_selection, Shopper.grocery_list]),
+    (25, "shopping trip", [Shopper.grocery_list]),
+    (10, "what can I cook", [Shopper.suggestions]),
+    (10, "restock pantry", [Shopper.update_inventory]),
+]
+
+
+def pick_journey() -> List[Callable]:
+    weights = [w for w, _, _ in JOURNEYS]
+    return random.choices(JOURNEYS, weights=weights)[0][2]
+
+
+# --- Setup ---
+
+async def create_shoppers(client: httpx.AsyncClient, count: int, recipes_per_user: int) -> List[Shopper]:
+    """Register users and give each a few recipes and inventory items, like real accounts."""
+    setup_stats = StageStats(0)
+    run_id = uuid.uuid4().hex[:8]
+    ingredients = (await client.get(f"{API_PREFIX}/ingredients")).json()
+    semaphore = asyncio.Semaphore(20)
+
+    async def setup(i: int) -> Shopper:
+        async with semaphore:
+            shopper = Shopper(client, f"load-{run_id}-{i}@example.com")
+            shopper.ingredients = ingredients
+            await shopper.call(setup_stats, "register", "POST", "/auth/register",
+                               json={"email": shopper.email, "password": PASSWORD})
+            await shopper.login(setup_stats)
+            for n in range(recipes_per_user):
+                picked = random.sample(ingredients, min(len(ingredients), 6))
+                await shopper.call(setup_stats, "create recipe", "POST", "/recipes", json={
+                    "title": f"Load Test Recipe {n}",
+                    "instructions": "Mix and cook.",
+                    "servings": 4,
+                    "ingredients": [
+                        {"ingredient_id": ing["id"], "quantity": str(random.randint(1, 3)), "unit": ing.get("default_unit")}
+                        for ing in picked
+                    ],
+                })
+            for ing in random.sample(ingredients, min(len(ingredients), 4)):
+                await shopper.call(setup_stats, "add inventory", "POST", "/inventory", json={
+                    "ingredient_id": ing["id"], "quantity": "1", "unit": ing.get("default_unit") or "unit",
+                })
+            return shopper
+
+    shoppers = await asyncio.gather(*(setup(i) for i in range(count)))
+    if setup_stats.error_count:
+        print(f"Setup finished with {setup_stats.error_count} errors")
+    return list(shoppers)
+
+
+# --- Runner ---
+
+async def run_stage(shoppers: List[Shopper], concurrency: int, duration: float, think_time: float) -> StageStats:
+    stats = StageStats(concurrency)
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(shopper: Shopper) -> None:
+        # Stagger the start so the ramp doesn't begin with a thundering herd
+        await asyncio.sleep(random.uniform(0, think_time))
+        while time.perf_counter() < deadline:
+            for step in pick_journey():
+                await step(shopper, stats)
+            await asyncio.sleep(random.expovariate(1 / think_time) if think_time else 0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(shoppers[i % len(shoppers)]) for i in range(concurrency)))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def print_stage(stats: StageStats) -> None:
+    print(f"\n=== {stats.concurrency} concurrent shoppers: "
+          f"{stats.requests} requests, {stats.throughput:.1f} req/s, "
+          f"{stats.error_rate:.2%} errors ===")
+    print(f"{'step':<18}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for step in sorted(stats.latencies):
+        values = stats.latencies[step]
+        print(f"{step:<18}{len(values):>8}{stats.errors[step]:>8}"
+              f"{statistics.median(values):>10.1f}{percentile(values, 95):>10.1f}"
+              f"{percentile(values, 99):>10.1f}{max(values):>10.1f}")
+
+
+def find_saturation(results: List[StageStats]) -> Optional[StageStats]:
+    """
+    The first stage where adding shoppers stopped buying throughput (< 10% gain)
+    while latency or errors went up - i.e. requests are now just queueing.
+    """
+    for previous, current in zip(results, results[1:]):
+        flat = current.throughput < previous.throughput * 1.1
+        degraded = current.p95() > previous.p95() * 2 or current.error_rate > 0.01
+        if flat and degraded:
+            return current
+    return None
+
+
+def build_client(base_url: Optional[str]) -> httpx.AsyncClient:
+    # follow_redirects: the frontend calls "/recipes", which FastAPI redirects to "/recipes/"
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(60.0)
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout, follow_redirects=True)
+
+    from app.core.config import settings
+    from app.db.memory import create_schema
+    from app.db.session import is_memory_database
+    from app.main import app
+    # The ASGI transport doesn't run the app's lifespan, so build an in-memory schema here
+    if is_memory_database(settings.DATABASE_URL):
+        create_schema()
+    # Every virtual shopper shares one client IP; don't let the login throttle skew the numbers
+    settings.RATE_LIMIT_ENABLED = False
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout, follow_redirects=True)
+
+
+async def main(args: argparse.Namespace) -> None:
+    stages = [int(s) for s in args.stages.split(",")]
+    async with build_client(args.base_url) as client:
+        print(f"Creating {args.users} test users...")
+        shoppers = await create_shoppers(client, args.users, args.recipes_per_user)
+
+        results = []
+        for concurrency in stages:
+            stats = await run_stage(shoppers, concurrency, args.duration, args.think_time)
+            print_stage(stats)
+            results.append(stats)
+
+    print("\n=== Summary ===")
+    for stats in results:
+        print(f"{stats.concurrency:>6} shoppers: {stats.throughput:>8.1f} req/s  "
+              f"p95 {stats.p95():>8.1f} ms  errors {stats.error_rate:.2%}")
+    saturated = find_saturation(results)
+    if saturated:
+        print(f"Saturation reached at ~{saturated.concurrency} concurrent shoppers")
+    else:
+        print("No saturation detected within the tested stages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ramp concurrent shoppers against the grocery API")
+    parser.add_argument("--base-url", help="Run against a live server instead of the in-process ASGI app")
+    parser.add_argument("--stages", default="10,50,100,250,500", help="Comma separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per stage")
+    parser.add_argument("--users", type=int, default=100, help="Distinct accounts shared by the shoppers")
+    parser.add_argument("--recipes-per-user", type=int, default=8)
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between journeys (seconds)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,43 @@
+import pytest
+from app.core import security
+from app.core.config import settings
+
+AUTH = "/api/v1/auth"
+
+
+@pytest.fixture
+def hashing(monkeypatch):
+    """Counts bcrypt calls (hash and verify)."""
+    calls = []
+    hash_password, verify_password = security.get_password_hash, security.verify_password
+    monkeypatch.setattr(security, "get_password_hash", lambda *args: calls.append("hash") or hash_password(*args))
+    monkeypatch.setattr(security, "verify_password", lambda *args: calls.append("verify") or verify_password(*args))
+    return calls
+
+
+def test_login_is_throttled_per_account_before_the_password_is_checked(client, hashing):
+    client.post(f"{AUTH}/register", json={"email": "cook@example.com", "password": "secret"})
+    for _ in range(settings.RATE_LIMIT_USER_BURST):
+        wrong = client.post(f"{AUTH}/login", data={"username": "cook@example.com", "password": "guess"})
+        assert wrong.status_code == 400
+    checked = len(hashing)
+
+    throttled = client.post(f"{AUTH}/login", data={"username": "cook@example.com", "password": "secret"})
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) >= 1
+    assert len(hashing) == checked
+
+    # Another account from the same client still gets in
+    client.post(f"{AUTH}/register", json={"email": "other@example.com", "password": "secret"})
+    assert client.post(f"{AUTH}/login", data={"username": "other@example.com", "password": "secret"}).status_code == 200
+
+
+def test_register_is_throttled_before_hashing(client, hashing):
+    for _ in range(settings.RATE_LIMIT_USER_BURST):
+        client.post(f"{AUTH}/register", json={"email": "cook@example.com", "password": "secret"})
+    assert hashing == ["hash"]
+
+    throttled = client.post(f"{AUTH}/register", json={"email": "cook@example.com", "password": "secret"})
+    assert throttled.status_code == 429
+    assert "Retry-After" in throttled.headers
+    assert hashing == ["hash"]
@@ -0,0 +1,75 @@
+import gzip
+import json
+from app.core.config import settings
+from app.utils.export_logic import NdjsonDecoder
+
+
+def fill_account(client, headers):
+    recipe = client.post("/api/v1/recipes/", json={"title": "Pancakes", "servings": 2, "ingredients": [
+        {"name": "Flour", "quantity": "250", "unit": "g"}, {"name": "Milk", "quantity": "0.5", "unit": "l"},
+    ]}, headers=headers).json()
+    client.patch(f"/api/v1/recipes/{recipe['id']}/select", json={"is_selected": True}, headers=headers)
+    flour_id = recipe["ingredients"][0]["ingredient_id"]
+    client.post("/api/v1/inventory/", json={"ingredient_id": flour_id, "quantity": "1", "unit": "kg"}, headers=headers)
+    return recipe
+
+
+def account(client, headers):
+    """What an export should carry over, without the row ids."""
+    recipes = [
+        (r["title"], r["servings"], r["is_selected"], sorted((i["name"], i["quantity"], i["unit"]) for i in r["ingredients"]))
+        for r in client.get("/api/v1/recipes/", headers=headers).json()
+    ]
+    inventory = [(i["ingredient_name"], i["quantity"], i["unit"]) for i in client.get("/api/v1/inventory/", headers=headers).json()]
+    return recipes, inventory
+
+
+def test_export_import_round_trip(client, login):
+    owner = login("owner@example.com")
+    fill_account(client, owner)
+    exported = client.get("/api/v1/export", params={"gzip": True}, headers=owner)
+    assert exported.status_code == 200
+    records = [json.loads(line) for line in gzip.decompress(exported.content).splitlines()]
+    assert [r["type"] for r in records] == ["header", "recipe", "inventory", "end"]
+
+    copy = login("copy@example.com")
+    imported = client.post("/api/v1/import", content=exported.content, headers=copy)
+    assert imported.status_code == 200
+    assert imported.json()["recipes"] == 1
+    assert imported.json()["inventory"] == 1
+    assert account(client, copy) == account(client, owner)
+
+    # Importing your own export again adds nothing
+    again = client.post("/api/v1/import", content=exported.content, headers=owner)
+    assert again.json()["skipped_recipes"] == 1
+    assert len(client.get("/api/v1/recipes/", headers=owner).json()) == 1
+
+
+def test_incomplete_file_imports_nothing(client, login):
+    owner = login("owner@example.com")
+    fill_account(client, owner)
+    lines = client.get("/api/v1/export", headers=owner).content.splitlines()
+
+    copy = login("copy@example.com")
+    response = client.post("/api/v1/import", content=b"\n".join(lines[:-1]), headers=copy)
+    assert response.status_code == 400
+    assert account(client, copy) == ([], [])
+
+
+def test_gzip_bomb_is_refused(client, login, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 1024 * 1024)
+    owner = login("owner@example.com")
+    bomb = gzip.compress(b"\n" * (64 * 1024 * 1024))  # 64 KB that inflate to 64 MB
+
+    response = client.post("/api/v1/import", content=bomb, headers=owner)
+    assert response.status_code == 413
+    assert account(client, owner) == ([], [])
+
+
+def test_decoder_reads_gzip_split_anywhere():
+    body = b"".join(json.dumps({"type": "recipe", "n": n}).encode() + b"\n" for n in range(100_000))
+    compressed = gzip.compress(body)
+    decoder = NdjsonDecoder()
+    records = decoder.feed(compressed[:10]) + decoder.feed(compressed[10:]) + decoder.close()
+    assert [record["n"] for _, record in records] == list(range(100_000))
+    assert decoder.size == len(body)
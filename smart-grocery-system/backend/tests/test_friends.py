@@ -0,0 +1,45 @@
+FRIENDS = "/api/v1/friends"
+
+
+def register(client, login, email):
+    user_id = client.post("/api/v1/auth/register", json={"email": email, "password": "secret"}).json()["id"]
+    return user_id, login(email)
+
+
+def befriend(client, requester, addressee_id, addressee):
+    request = client.post(f"{FRIENDS}/requests", json={"addressee_id": addressee_id}, headers=requester).json()
+    client.patch(f"{FRIENDS}/requests/{request['id']}", json={"status": "ACCEPTED"}, headers=addressee)
+
+
+def share(client, headers, title, shared=True):
+    recipe = client.post("/api/v1/recipes/", json={"title": title}, headers=headers).json()
+    if shared:
+        client.patch(f"/api/v1/recipes/{recipe['id']}/share", json={"is_shared_to_friends": True}, headers=headers)
+    return recipe
+
+
+def test_feed_pages_through_friends_shared_recipes_newest_first(client, login):
+    me_id, me = register(client, login, "me@example.com")
+    asked_id, asked = register(client, login, "asked@example.com")
+    asker_id, asker = register(client, login, "asker@example.com")
+    _, stranger = register(client, login, "stranger@example.com")
+    befriend(client, me, asked_id, asked)  # Friends in both directions count
+    befriend(client, asker, me_id, me)
+
+    titles = []
+    for n in range(5):
+        share(client, asked if n % 2 else asker, f"Shared {n}")
+        titles.append(f"Shared {n}")
+    share(client, asked, "Private", shared=False)
+    share(client, stranger, "Stranger's")
+
+    page = client.get(f"{FRIENDS}/feed", params={"limit": 3}, headers=me).json()
+    seen = [r["title"] for r in page["items"]]
+    while page["next_cursor"]:
+        page = client.get(f"{FRIENDS}/feed", params={"limit": 3, "cursor": page["next_cursor"]}, headers=me).json()
+        seen += [r["title"] for r in page["items"]]
+    assert seen == titles[::-1]
+
+
+def test_feed_rejects_a_bad_cursor(client, login):
+    assert client.get(f"{FRIENDS}/feed", params={"cursor": "nope"}, headers=login()).status_code == 400
@@ -0,0 +1,99 @@
+GROCERY = "/api/v1/grocery"
+
+
+def select(client, headers, title, ingredients, servings=4):
+    recipe = client.post("/api/v1/recipes/", json={"title": title, "servings": servings, "ingredients": ingredients}, headers=headers).json()
+    client.patch(f"/api/v1/recipes/{recipe['id']}/select", json={"is_selected": True}, headers=headers)
+    return recipe
+
+
+def stock(client, headers, ingredient_id, quantity, unit):
+    return client.post("/api/v1/inventory/", json={"ingredient_id": ingredient_id, "quantity": quantity, "unit": unit}, headers=headers).json()
+
+
+def lines(items):
+    return sorted((item["name"], float(item["quantity"]), item["unit"]) for aisle in items.values() for item in aisle)
+
+
+def pancakes(client, headers):
+    recipe = select(client, headers, "Pancakes", [
+        {"name": "Flour", "quantity": "500", "unit": "g"}, {"name": "Eggs", "quantity": "2"},
+    ])
+    stock(client, headers, recipe["ingredients"][0]["ingredient_id"], "200", "g")
+    return recipe
+
+
+# --- Totals ---
+
+def test_multiplier_scales_before_inventory_is_taken_off(client, login):
+    headers = login()
+    pancakes(client, headers)
+
+    assert lines(client.get(f"{GROCERY}/", headers=headers).json()) == [("Eggs", 2, ""), ("Flour", 300, "g")]
+    doubled = client.get(f"{GROCERY}/", params={"servings_multiplier": 2}, headers=headers).json()
+    assert lines(doubled) == [("Eggs", 4, ""), ("Flour", 800, "g")]
+
+
+def test_meal_plan_splits_into_trips_and_uses_inventory_once(client, login):
+    headers = login()
+    recipe = pancakes(client, headers)
+    client.post("/api/v1/meal-plans/", json={"recipe_id": recipe["id"], "planned_date": "2026-10-20", "servings": 8}, headers=headers)
+    client.post("/api/v1/meal-plans/", json={"recipe_id": recipe["id"], "planned_date": "2026-10-23"}, headers=headers)
+
+    trips = client.get(f"{GROCERY}/meal-plan", params={
+        "start": "2026-10-19", "end": "2026-10-25", "shopping_days": [0, 3]
+    }, headers=headers).json()
+    assert [(trip["shop_date"], trip["end"]) for trip in trips] == [("2026-10-19", "2026-10-21"), ("2026-10-22", "2026-10-25")]
+    # Twice the servings on the 20th; the 200 g in stock only count towards the first trip
+    assert lines(trips[0]["items"]) == [("Eggs", 4, ""), ("Flour", 800, "g")]
+    assert lines(trips[1]["items"]) == [("Eggs", 2, ""), ("Flour", 500, "g")]
+
+
+def test_meal_plan_rejects_an_inverted_range(client, login):
+    response = client.get(f"{GROCERY}/meal-plan", params={"start": "2026-10-25", "end": "2026-10-19"}, headers=login())
+    assert response.status_code == 400
+
+
+def test_household_list_adds_up_every_member(client, login):
+    owner = login("owner@example.com")
+    member_id = client.post("/api/v1/auth/register", json={"email": "member@example.com", "password": "secret"}).json()["id"]
+    member = login("member@example.com")
+    request = client.post("/api/v1/friends/requests", json={"addressee_id": member_id}, headers=owner).json()
+    client.patch(f"/api/v1/friends/requests/{request['id']}", json={"status": "ACCEPTED"}, headers=member)
+    client.post("/api/v1/households/", json={"name": "Home"}, headers=owner)
+    assert client.post("/api/v1/households/me/members", json={"user_id": member_id}, headers=owner).status_code == 200
+
+    select(client, owner, "Pancakes", [{"name": "Flour", "quantity": "500", "unit": "g"}])
+    bread = select(client, member, "Bread", [{"name": "Flour", "quantity": "300", "unit": "g"}])
+    stock(client, member, bread["ingredients"][0]["ingredient_id"], "200", "g")
+
+    assert lines(client.get(f"{GROCERY}/household", headers=owner).json()) == [("Flour", 600, "g")]
+    assert lines(client.get(f"{GROCERY}/household", headers=member).json()) == [("Flour", 600, "g")]
+
+
+def test_household_list_needs_a_household(client, login):
+    assert client.get(f"{GROCERY}/household", headers=login()).status_code == 404
+
+
+# --- Snapshots ---
+
+def test_snapshot_diff_against_another_snapshot_and_the_current_list(client, login):
+    headers = login()
+    pancakes(client, headers)
+    before = client.post(f"{GROCERY}/snapshots", json={"label": "Monday"}, headers=headers).json()
+    assert before["item_count"] == 2
+
+    flour = client.get("/api/v1/inventory/", headers=headers).json()[0]
+    client.put(f"/api/v1/inventory/{flour['id']}", json={"quantity": "500", "unit": "g"}, headers=headers)
+    select(client, headers, "Omelette", [{"name": "Eggs", "quantity": "3"}])
+    select(client, headers, "Latte", [{"name": "Milk", "quantity": "1", "unit": "l"}])
+
+    current = client.get(f"{GROCERY}/snapshots/{before['id']}/diff/current", headers=headers).json()
+    assert [(i["name"], i["quantity"], i["previous_quantity"]) for i in current["changed"]] == [("Eggs", "5", "2")]
+    assert [i["name"] for i in current["added"]] == ["Milk"]
+    assert [i["name"] for i in current["removed"]] == ["Flour"]
+
+    after = client.post(f"{GROCERY}/snapshots", json={"label": "Thursday"}, headers=headers).json()
+    saved = client.get(f"{GROCERY}/snapshots/{before['id']}/diff/{after['id']}", headers=headers).json()
+    assert {key: saved[key] for key in ("added", "changed", "removed")} == {key: current[key] for key in ("added", "changed", "removed")}
+    assert client.get(f"{GROCERY}/snapshots/{after['id']}/diff/{before['id']}", headers=login("other@example.com")).status_code == 404
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware
+
+
+@pytest.fixture
+def writes(client):
+    """A write endpoint behind the middleware that counts its runs and takes `delay` seconds."""
+    class Writes:
+        runs = []
+        delay = 0.0
+
+    async def write(request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        Writes.runs.append(size)
+        await asyncio.sleep(Writes.delay)
+        return JSONResponse({"run": len(Writes.runs), "size": size})
+
+    app = IdempotencyMiddleware(Starlette(routes=[Route("/write", write, methods=["POST"])]))
+    with TestClient(app) as test_client:
+        Writes.client = test_client
+        yield Writes
+
+
+def post(writes, headers, key, body=b"{}"):
+    return writes.client.post("/write", content=body, headers={**headers, "Idempotency-Key": key})
+
+
+def test_retry_gets_the_stored_response(writes, login):
+    headers = login()
+    first = post(writes, headers, "k1")
+    again = post(writes, headers, "k1")
+    assert again.json() == first.json() == {"run": 1, "size": 2}
+    assert again.headers["idempotent-replayed"] == "true"
+    assert len(writes.runs) == 1
+
+
+def test_same_key_different_body_is_rejected(writes, login):
+    headers = login()
+    post(writes, headers, "k1", b'{"a": 1}')
+    assert post(writes, headers, "k1", b'{"a": 2}').status_code == 422
+
+
+def test_keys_are_per_user(writes, login):
+    post(writes, login("a@example.com"), "k1")
+    assert post(writes, login("b@example.com"), "k1").json()["run"] == 2
+
+
+def test_concurrent_duplicates_run_once(writes, login):
+    headers = login()
+    writes.delay = 0.5
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(post(writes, headers, "k1"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(writes.runs) == 1
+    assert [r.status_code for r in responses] == [200] * 5
+    assert {r.json()["run"] for r in responses} == {1}
+
+
+def test_a_slow_first_request_keeps_its_key(writes, login, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 0.6)
+    headers = login()
+    writes.delay = 2.0  # Over three lock timeouts
+    first = threading.Thread(target=lambda: post(writes, headers, "k1"))
+    first.start()
+    time.sleep(1.0)
+
+    duplicate = post(writes, headers, "k1")
+    first.join()
+    assert duplicate.status_code == 200
+    assert duplicate.headers["idempotent-replayed"] == "true"
+    assert len(writes.runs) == 1
+
+
+def test_large_bodies_stream_through(writes, login):
+    headers = login()
+    body = b"x" * (8 * 1024 * 1024)
+    assert post(writes, headers, "k1", body).json() == {"run": 1, "size": len(body)}
+    assert post(writes, headers, "k1", body).headers["idempotent-replayed"] == "true"
+    assert post(writes, headers, "k1", body[:-1] + b"y").status_code == 422
+    assert len(writes.runs) == 1
+
+
+def test_endpoints_replay_through_the_app(client, login):
+    headers = {**login(), "Idempotency-Key": "create-soup"}
+    first = client.post("/api/v1/recipes/", json={"title": "Soup"}, headers=headers)
+    again = client.post("/api/v1/recipes/", json={"title": "Soup"}, headers=headers)
+    assert again.json()["id"] == first.json()["id"]
+    assert len(client.get("/api/v1/recipes/", headers=headers).json()) == 1
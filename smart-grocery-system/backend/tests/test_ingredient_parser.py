@@ -0,0 +1,27 @@
+import pytest
+from app.utils.ingredient_parser import parse_line
+
+
+@pytest.mark.parametrize("text, quantity, unit, name, note", [
+    ("2 1/2 cups all-purpose flour, sifted", "5/2", "cup", "all-purpose flour", "sifted"),
+    ("1½ tsp salt", "3/2", "tsp", "salt", None),
+    ("0.5 l milk", "1/2", "l", "milk", None),
+    ("200g butter (softened)", "200", "g", "butter", "softened"),
+    ("- 1 tbsp. olive oil", "1", "tbsp", "olive oil", None),
+    ("1-2 cloves garlic, minced", "1", "clove", "garlic", "minced"),
+    ("a pinch of nutmeg", "1", "pinch", "nutmeg", None),
+    ("3 eggs", "3", None, "eggs", None),
+    ("2 cans", "2", None, "cans", None),
+    ("salt to taste", "1", None, "salt", "to taste"),
+])
+def test_parse_line(text, quantity, unit, name, note):
+    parsed = parse_line(text)
+    assert (parsed["quantity"], parsed["unit"], parsed["name"], parsed["note"]) == (quantity, unit, name, note)
+
+
+def test_parse_endpoint_matches_the_catalog(client, login):
+    headers = login()
+    client.post("/api/v1/recipes/", json={"title": "Bread", "ingredients": [{"name": "Flour", "quantity": "500", "unit": "g"}]}, headers=headers)
+
+    parsed = client.post("/api/v1/ingredients/parse", json={"lines": ["2 cups flour, sifted", "1 tsp saffron"]}, headers=headers).json()
+    assert [(line["amount"], line["matched_name"]) for line in parsed] == [(2.0, "Flour"), (1.0, None)]
@@ -0,0 +1,88 @@
+import time
+from app.utils import ingredient_matching
+
+INGREDIENTS = "/api/v1/ingredients"
+
+
+def wait_for(client, headers, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("SUCCEEDED", "FAILED"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} still {job['status']}")
+
+
+def test_merge_folds_duplicates_into_the_target(client, login, admin):
+    headers = login()
+    recipe = client.post("/api/v1/recipes/", json={"title": "Soup", "ingredients": [
+        {"name": "Scallions", "quantity": "2"}, {"name": "Leek", "quantity": "1"},
+    ]}, headers=headers).json()
+    target_id, source_id = (line["ingredient_id"] for line in recipe["ingredients"])
+    client.post("/api/v1/inventory/", json={"ingredient_id": target_id, "quantity": "2", "unit": "whole"}, headers=headers)
+    client.post("/api/v1/inventory/", json={"ingredient_id": source_id, "quantity": "1", "unit": "dozen"}, headers=headers)
+    client.post("/api/v1/inventory/", json={"ingredient_id": source_id, "quantity": "1", "unit": "kg"}, headers=login("other@example.com"))
+
+    response = client.post(f"{INGREDIENTS}/merge", json={"target_id": target_id, "source_ids": [source_id]}, headers=admin)
+    assert response.status_code == 202
+    job = wait_for(client, admin, response.json()["id"])
+    assert job["status"] == "SUCCEEDED", job["error"]
+    assert job["result"]["merged"] == 1
+
+    lines = client.get(f"/api/v1/recipes/{recipe['id']}", headers=headers).json()["ingredients"]
+    assert [line["ingredient_id"] for line in lines] == [target_id, target_id]
+    inventory = client.get("/api/v1/inventory/", headers=headers).json()
+    assert [(i["ingredient_id"], float(i["quantity"]), i["unit"]) for i in inventory] == [(target_id, 14, "whole")]
+    assert client.get(f"{INGREDIENTS}/resolve", params={"name": "leek"}).json()["id"] == target_id
+
+
+def test_merge_reports_quantities_that_dont_convert(client, login, admin):
+    headers = login()
+    recipe = client.post("/api/v1/recipes/", json={"title": "Pasta", "ingredients": [
+        {"name": "Tomato paste", "quantity": "100", "unit": "g"}, {"name": "Passata", "quantity": "1", "unit": "jar"},
+    ]}, headers=headers).json()
+    target_id, source_id = (line["ingredient_id"] for line in recipe["ingredients"])
+    client.post("/api/v1/inventory/", json={"ingredient_id": target_id, "quantity": "100", "unit": "g"}, headers=headers)
+    client.post("/api/v1/inventory/", json={"ingredient_id": source_id, "quantity": "2", "unit": "jar"}, headers=headers)
+
+    response = client.post(f"{INGREDIENTS}/merge", json={"target_id": target_id, "source_ids": [source_id]}, headers=admin)
+    job = wait_for(client, admin, response.json()["id"])
+    assert job["status"] == "SUCCEEDED", job["error"]
+    assert [(d["quantity"], d["unit"]) for d in job["result"]["dropped"]] == [("2", "jar")]
+
+    inventory = client.get("/api/v1/inventory/", headers=headers).json()
+    assert [(i["ingredient_id"], i["quantity"], i["unit"]) for i in inventory] == [(target_id, "100", "g")]
+
+
+def test_merge_needs_an_admin(client, login):
+    headers = login()
+    recipe = client.post("/api/v1/recipes/", json={"title": "Soup", "ingredients": [
+        {"name": "Scallions", "quantity": "2"}, {"name": "Leek", "quantity": "1"},
+    ]}, headers=headers).json()
+    target_id, source_id = (line["ingredient_id"] for line in recipe["ingredients"])
+
+    response = client.post(f"{INGREDIENTS}/merge", json={"target_id": target_id, "source_ids": [source_id]}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_an_index_built_before_catalog_writes_is_rebuilt(client, login, admin):
+    """Merge (one ingredient fewer, one alias more), alias removed, one ingredient added: same sizes as before."""
+    headers = login()
+    recipe = client.post("/api/v1/recipes/", json={"title": "Soup", "ingredients": [
+        {"name": "Scallions", "quantity": "2"}, {"name": "Leek", "quantity": "1"},
+    ]}, headers=headers).json()
+    target_id, source_id = (line["ingredient_id"] for line in recipe["ingredients"])
+    assert client.get(f"{INGREDIENTS}/resolve", params={"name": "leek"}).json()["id"] == source_id
+    stale = ingredient_matching._index  # what another process would still hold
+
+    job = wait_for(client, admin, client.post(f"{INGREDIENTS}/merge", json={"target_id": target_id, "source_ids": [source_id]}, headers=admin).json()["id"])
+    assert job["status"] == "SUCCEEDED", job["error"]
+    alias = client.get(f"{INGREDIENTS}/{target_id}/aliases").json()[0]
+    assert client.delete(f"{INGREDIENTS}/{target_id}/aliases/{alias['id']}", headers=admin).status_code == 204
+    chives = client.post("/api/v1/recipes/", json={"title": "Omelette", "ingredients": [
+        {"name": "Chives", "quantity": "1"},
+    ]}, headers=headers).json()["ingredients"][0]["ingredient_id"]
+
+    ingredient_matching._index = stale
+    assert client.get(f"{INGREDIENTS}/resolve", params={"name": "chives"}).json()["id"] == chives
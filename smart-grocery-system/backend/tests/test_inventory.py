@@ -0,0 +1,31 @@
+INVENTORY = "/api/v1/inventory"
+
+
+def add_flour(client, headers):
+    recipe = client.post("/api/v1/recipes/", json={
+        "title": "Bread", "ingredients": [{"name": "Flour", "quantity": "500", "unit": "g"}]
+    }, headers=headers).json()
+    response = client.post(f"{INVENTORY}/", json={"ingredient_id": recipe["ingredients"][0]["ingredient_id"], "quantity": "1", "unit": "kg"}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_update_with_stale_version_is_rejected(client, login):
+    headers = login()
+    item = add_flour(client, headers)
+    assert item["version"] == 1
+
+    first = client.put(f"{INVENTORY}/{item['id']}", json={"quantity": "2", "unit": "kg", "version": 1}, headers=headers)
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+
+    stale = client.put(f"{INVENTORY}/{item['id']}", json={"quantity": "3", "unit": "kg", "version": 1}, headers=headers)
+    assert stale.status_code == 409
+    assert (stale.json()["detail"]["current"]["quantity"], stale.json()["detail"]["current"]["version"]) == ("2", 2)
+    assert [i["quantity"] for i in client.get(f"{INVENTORY}/", headers=headers).json()] == ["2"]
+
+
+def test_update_someone_elses_item(client, login):
+    item = add_flour(client, login("owner@example.com"))
+    response = client.put(f"{INVENTORY}/{item['id']}", json={"quantity": "2", "unit": "kg", "version": 1}, headers=login("other@example.com"))
+    assert response.status_code == 404
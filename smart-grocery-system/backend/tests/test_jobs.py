@@ -0,0 +1,74 @@
+import threading
+import time
+import pytest
+from app.core import jobs
+from app.core.config import settings
+
+JOBS = "/api/v1/jobs"
+
+
+def wait_for(client, headers, job_id, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"{JOBS}/{job_id}", headers=headers).json()
+        if job["status"] in ("SUCCEEDED", "FAILED"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} still {job['status']}")
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """handler(kind, fn) registers a job kind for this test only; fn(calls) runs on each attempt."""
+    def register(kind, fn):
+        calls = []
+        def run(db, user_id, params):
+            calls.append(time.monotonic())
+            return fn(len(calls))
+        monkeypatch.setitem(jobs._handlers, kind, run)
+        return calls
+    return register
+
+
+def test_admin_only_kinds_are_refused_at_enqueue(client, login, admin):
+    response = client.post(f"{JOBS}/", json={"kind": "ingredient_merge", "params": {}}, headers=login())
+    assert response.status_code == 403
+    assert client.get(f"{JOBS}/", headers=login()).json() == []
+
+
+def test_permanent_errors_are_not_retried(client, login, handler):
+    def fail(attempt):
+        raise PermissionError("not yours")
+    calls = handler("test_forbidden", fail)
+    headers = login()
+
+    job = wait_for(client, headers, client.post(f"{JOBS}/", json={"kind": "test_forbidden"}, headers=headers).json()["id"])
+    assert (job["status"], job["error"], job["attempts"]) == ("FAILED", "not yours", 1)
+    assert len(calls) == 1
+
+
+def test_transient_errors_are_retried(client, login, handler):
+    def flaky(attempt):
+        if attempt == 1:
+            raise RuntimeError("database went away")
+        return {"attempt": attempt}
+    handler("test_flaky", flaky)
+    headers = login()
+
+    job = wait_for(client, headers, client.post(f"{JOBS}/", json={"kind": "test_flaky"}, headers=headers).json()["id"])
+    assert (job["status"], job["result"], job["attempts"]) == ("SUCCEEDED", {"attempt": 2}, 2)
+
+
+def test_a_job_running_past_its_lease_keeps_it(client, login, handler, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.6)
+    running = threading.Event()
+    def slow(attempt):
+        running.set()
+        time.sleep(3)  # Five leases; the poller looks for expired ones every JOB_POLL_SECONDS
+        return {"attempt": attempt}
+    calls = handler("test_slow", slow)
+    headers = login()
+
+    job = wait_for(client, headers, client.post(f"{JOBS}/", json={"kind": "test_slow"}, headers=headers).json()["id"])
+    assert (job["status"], job["attempts"]) == ("SUCCEEDED", 1)
+    assert len(calls) == 1
@@ -0,0 +1,35 @@
+import uuid
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.security import create_access_token
+from app.db import session
+from app.db.base import Base
+
+
+@pytest.fixture
+def lagging_replica(client, monkeypatch):
+    """A replica that never replays anything: its own empty database."""
+    replica = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(replica)
+    monkeypatch.setattr(session, "replica_engines", [replica])
+    monkeypatch.setattr(session, "ReplicaSessionLocals", [sessionmaker(autocommit=False, autoflush=False, bind=replica)])
+    monkeypatch.setattr(session, "_sticky_until", {})
+    yield
+    replica.dispose()
+
+
+def test_new_account_reads_before_the_replica_has_it(client, login, lagging_replica):
+    headers = login()
+    # Another worker: nothing here says this user just wrote
+    session._sticky_until.clear()
+
+    response = client.get("/api/v1/inventory/", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_unknown_account_is_still_refused(client, lagging_replica):
+    headers = {"Authorization": f"Bearer {create_access_token(uuid.uuid4())}"}
+    assert client.get("/api/v1/inventory/", headers=headers).status_code == 401
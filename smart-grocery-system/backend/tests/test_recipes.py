@@ -0,0 +1,95 @@
+import uuid
+
+RECIPES = "/api/v1/recipes"
+
+
+def create_recipe(client, headers, title="Pancakes", ingredients=None):
+    response = client.post(f"{RECIPES}/", json={
+        "title": title, "servings": 4,
+        "ingredients": ingredients or [{"name": "Flour", "quantity": "500", "unit": "g"}]
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+# --- Conditional updates ---
+
+def test_update_with_stale_version_is_rejected(client, login):
+    headers = login()
+    recipe = create_recipe(client, headers)
+    assert recipe["version"] == 1
+
+    first = client.put(f"{RECIPES}/{recipe['id']}", json={"title": "Crepes", "version": 1}, headers=headers)
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+
+    stale = client.put(f"{RECIPES}/{recipe['id']}", json={"title": "Waffles", "version": 1}, headers=headers)
+    assert stale.status_code == 409
+    assert stale.json()["detail"]["current"]["title"] == "Crepes"
+    assert stale.json()["detail"]["current"]["version"] == 2
+    assert client.get(f"{RECIPES}/{recipe['id']}", headers=headers).json()["title"] == "Crepes"
+
+
+def test_update_without_version_overwrites(client, login):
+    headers = login()
+    recipe = create_recipe(client, headers)
+    client.put(f"{RECIPES}/{recipe['id']}", json={"title": "Crepes"}, headers=headers)
+
+    response = client.put(f"{RECIPES}/{recipe['id']}", json={"title": "Waffles"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["version"] == 3
+
+
+# --- Cooking ---
+
+def test_cook_deducts_inventory_and_reports_shortfalls(client, login):
+    headers = login()
+    recipe = create_recipe(client, headers, ingredients=[
+        {"name": "Flour", "quantity": "500", "unit": "g"},
+        {"name": "Milk", "quantity": "1", "unit": "l"},
+    ])
+    flour_id = recipe["ingredients"][0]["ingredient_id"]
+    client.post("/api/v1/inventory/", json={"ingredient_id": flour_id, "quantity": "1", "unit": "kg"}, headers=headers)
+
+    cooked = client.post(f"{RECIPES}/{recipe['id']}/cook", headers=headers)
+    assert cooked.status_code == 200
+    body = cooked.json()
+    assert [(i["ingredient_id"], float(i["quantity"]), i["unit"]) for i in body["inventory"]] == [(flour_id, 0.5, "kg")]
+    assert [m["name"] for m in body["missing_ingredients"]] == ["Milk"]
+
+    # Half a recipe more uses up the rest of the flour: the item goes
+    cooked = client.post(f"{RECIPES}/{recipe['id']}/cook", params={"servings": 4}, headers=headers)
+    assert cooked.json()["inventory"] == []
+    assert client.get("/api/v1/inventory/", headers=headers).json() == []
+
+
+def test_cook_someone_elses_recipe(client, login):
+    recipe = create_recipe(client, login("owner@example.com"))
+    response = client.post(f"{RECIPES}/{recipe['id']}/cook", headers=login("other@example.com"))
+    assert response.status_code == 404
+
+
+# --- Batch reads ---
+
+def test_batch_keeps_the_order_asked_for_and_lists_missing(client, login):
+    headers = login()
+    soup = create_recipe(client, headers, "Soup")
+    salad = create_recipe(client, headers, "Salad")
+    theirs = create_recipe(client, login("other@example.com"), "Stew")
+    unknown = str(uuid.uuid4())
+
+    response = client.get(f"{RECIPES}/batch", params={"ids": f"{salad['id']},{unknown},{soup['id']},{theirs['id']}"}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["recipes"]) == [salad["id"], soup["id"]]
+    assert body["recipes"][soup["id"]]["title"] == "Soup"
+    assert set(body["missing"]) == {unknown, theirs["id"]}
+
+    posted = client.post(f"{RECIPES}/batch", json={"ids": [soup["id"], salad["id"]]}, headers=headers)
+    assert list(posted.json()["recipes"]) == [soup["id"], salad["id"]]
+
+
+def test_batch_rejects_bad_ids(client, login):
+    headers = login()
+    assert client.get(f"{RECIPES}/batch", params={"ids": "not-a-uuid"}, headers=headers).status_code == 422
+    assert client.post(f"{RECIPES}/batch", json={"ids": []}, headers=headers).status_code == 422
@@ -0,0 +1,81 @@
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.change_log import ChangeLog
+from app.utils import sync_logic
+
+SYNC = "/api/v1/sync/"
+
+
+def stock(client, headers, quantity="1", unit="kg"):
+    recipe = client.post("/api/v1/recipes/", json={
+        "title": "Bread", "ingredients": [{"name": "Flour", "quantity": "500", "unit": "g"}]
+    }, headers=headers).json()
+    flour_id = recipe["ingredients"][0]["ingredient_id"]
+    item = client.post("/api/v1/inventory/", json={"ingredient_id": flour_id, "quantity": quantity, "unit": unit}, headers=headers)
+    return recipe, item.json()
+
+
+def test_pull_from_zero_is_everything(client, login):
+    headers = login()
+    recipe, item = stock(client, headers)
+
+    pulled = client.get(SYNC, headers=headers).json()
+    assert pulled["full"] is True
+    assert [r["id"] for r in pulled["recipes"]] == [recipe["id"]]
+    assert [i["id"] for i in pulled["inventory"]] == [item["id"]]
+
+    assert client.get(SYNC, params={"since": pulled["cursor"]}, headers=headers).json()["recipes"] == []
+
+
+def test_push_based_on_the_current_version_applies(client, login):
+    headers = login()
+    recipe, item = stock(client, headers)
+    cursor = client.get(SYNC, headers=headers).json()["cursor"]
+
+    pushed = client.post(SYNC, json={"since": cursor, "inventory": [
+        {"ingredient_id": item["ingredient_id"], "quantity": "2", "unit": "kg", "version": item["version"]}
+    ]}, headers=headers)
+    assert pushed.status_code == 200
+    assert [(i["quantity"], i["version"]) for i in pushed.json()["inventory"]] == [("2", item["version"] + 1)]
+
+
+def test_conflicting_push_changes_nothing(client, login):
+    headers = login()
+    recipe, item = stock(client, headers)
+    cursor = client.get(SYNC, headers=headers).json()["cursor"]
+    # Another device edits the item after this one last synced
+    client.put(f"/api/v1/inventory/{item['id']}", json={"quantity": "3", "unit": "kg"}, headers=headers)
+
+    pushed = client.post(SYNC, json={"since": cursor, "recipes": [
+        {"id": recipe["id"], "title": "Sourdough", "ingredients": [], "version": recipe["version"]}
+    ], "inventory": [
+        {"ingredient_id": item["ingredient_id"], "quantity": "2", "unit": "kg", "version": item["version"]}
+    ]}, headers=headers)
+    assert pushed.status_code == 409
+    current = pushed.json()["detail"]["current"]
+    assert [(i["id"], i["quantity"]) for i in current["inventory"]] == [(item["id"], "3")]
+
+    # All or nothing: the recipe edit in the same batch wasn't applied either
+    assert client.get(f"/api/v1/recipes/{recipe['id']}", headers=headers).json()["title"] == "Bread"
+
+
+def test_cursor_older_than_the_retained_log_gets_everything(client, login, monkeypatch):
+    monkeypatch.setattr(settings, "CHANGE_LOG_KEEP_VERSIONS", 3)
+    monkeypatch.setattr(sync_logic, "PRUNE_EVERY", 1)
+    headers = login()
+    recipe, item = stock(client, headers)
+    old = client.get(SYNC, headers=headers).json()["cursor"]
+    for quantity in ("2", "3", "4", "5"):
+        client.put(f"/api/v1/inventory/{item['id']}", json={"quantity": quantity, "unit": "kg"}, headers=headers)
+    cursor = client.get(SYNC, headers=headers).json()["cursor"]
+
+    with SessionLocal() as db:
+        assert {version for (version,) in db.query(ChangeLog.version)} == {cursor - 2, cursor - 1, cursor}
+
+    pulled = client.get(SYNC, params={"since": old}, headers=headers).json()
+    assert pulled["full"] is True
+    assert [r["id"] for r in pulled["recipes"]] == [recipe["id"]]
+
+    recent = client.get(SYNC, params={"since": cursor - 3}, headers=headers).json()
+    assert recent["full"] is False
+    assert [i["quantity"] for i in recent["inventory"]] == ["5"]
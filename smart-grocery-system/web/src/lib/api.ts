@@ -8,6 +8,9 @@ const api = axios.create({
   },
 });
 
+// Marker from our last write; sent back so reads don't come from a replica that hasn't seen it yet
+let readAfter: string | null = null;
+
 // Request Interceptor: Attach Token
 api.interceptors.request.use(
   (config) => {
@@ -15,6 +18,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (readAfter) {
+      config.headers['X-Read-After'] = readAfter;
+    }
     return config;
   },
   (error) => Promise.reject(error)
@@ -22,7 +28,13 @@ api.interceptors.request.use(
 
 // Response Interceptor: Handle 401 (Unauthorized)
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const marker = response.headers['x-read-after'];
+    if (marker) {
+      readAfter = marker;
+    }
+    return response;
+  },
   (error) => {
     if (error.response?.status === 401) {
       // Token expired or invalid